@@ -1,48 +1,66 @@
-from src.monitor import RegistrationMonitor
-from src.utils.telegram_utils import TelegramNotifier
-import time
+from src.utils.config_utils import DEFAULT_ACCOUNTS_FILE
+from src.utils.log_utils import configure_logging
+from src.utils.metrics import METRICS
+import argparse
+import os
+import sys
+
+
+def check():
+    """Dry run: validate config, watchlists and saved state without a browser or Telegram."""
+    from src.preflight import run_checks
+    results = run_checks()
+    for ok, message in results:
+        print(f"{'ok  ' if ok else 'FAIL'} {message}")
+    return 0 if all(ok for ok, _ in results) else 1
 
 
 def main():
-    monitor = None
+    parser = argparse.ArgumentParser(description="Monitor Mohawk College course registration.")
+    parser.add_argument('--check', '--dry-run', action='store_true',
+                        help="validate configuration and saved state, then exit")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(check())
+
+    configure_logging()
+    METRICS.configure_from_env()
+
+    # Several accounts/terms configured: hand them to the shared worker pool
+    accounts_file = os.environ.get('ACCOUNTS_FILE', DEFAULT_ACCOUNTS_FILE)
+    if os.path.exists(accounts_file):
+        from src.scheduler import MonitorScheduler
+        try:
+            MonitorScheduler.from_config(accounts_file).run()
+        except KeyboardInterrupt:
+            print("\nProgram terminated by user")
+        return
+
+    from src.monitor import RegistrationMonitor
+    from src.supervisor import MonitorSupervisor
+    from src.utils.polling_utils import AdaptivePollingPolicy
+    from src.utils.telegram_utils import TelegramNotifier
     notifier = TelegramNotifier()
-    max_retries = 3
-    retry_count = 0
 
+    def create_monitor():
+        policy = AdaptivePollingPolicy.from_env() if os.environ.get('ADAPTIVE_POLLING') else None
+        shards = [subject.strip() for subject in os.environ.get('SHARDS', '').split(',') if subject.strip()]
+        return RegistrationMonitor(polling_policy=policy, notifier=notifier, shards=shards or None,
+                                   shard_workers=int(os.environ.get('SHARD_WORKERS', 0)) or None)
+
+    # Retries forever with backoff; the monitor (and its parsed state) survives failed polls
+    supervisor = MonitorSupervisor.from_env(create_monitor, notifier)
     try:
-        while retry_count < max_retries:
-            try:
-                # Initialize monitor if not exists
-                if not monitor:
-                    monitor = RegistrationMonitor()
-
-                # Start monitoring
-                monitor.monitor_courses()
-                break  # Exit loop if monitoring completes successfully
-
-            except Exception as e:
-                retry_count += 1
-                print(f"Attempt {retry_count}/{max_retries} failed: {str(e)}")
-
-                if retry_count < max_retries:
-                    print("Retrying in 60 seconds...")
-                    time.sleep(60)
-                else:
-                    print("Maximum retry attempts reached. Exiting...")
-                    notifier.send_message("⚠️ Course monitor stopped after maximum retries")
-
-                # Clean up failed monitor instance
-                if monitor:
-                    monitor.close()
-                    monitor = None
+        supervisor.run(async_pipeline=bool(os.environ.get('ASYNC_MONITOR')))
 
     except KeyboardInterrupt:
         print("\nProgram terminated by user")
         notifier.send_message("ℹ️ Course monitor stopped by user")
 
     finally:
-        if monitor:
-            monitor.close()
+        supervisor.close()
+        # Give queued alerts a chance to go out; anything left is resent on next start
+        notifier.close()
 
 
 if __name__ == "__main__":
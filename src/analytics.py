@@ -0,0 +1,118 @@
+import argparse
+import random
+import time
+from datetime import datetime
+from src.models.course import Course
+from src.utils.state_store import INSERT_COURSE, StateStore
+
+# Relative chance of an opening by hour of day, peaking through business hours and at midnight
+HOUR_WEIGHTS = [3, 1, 1, 1, 1, 1, 1, 2, 4, 6, 6, 5, 5, 5, 5, 5, 4, 3, 3, 2, 2, 2, 2, 2]
+
+
+def generate_history(store, sections=2000, days=105, openings_per_day=0.5, poll_interval=60, seed=0):
+    """
+    Fill `store` with a synthetic semester of 1-minute polls: each section opens a few times a
+    week, mostly during the day, and fills again minutes to hours later. Returns rows written.
+    """
+    rng = random.Random(seed)
+    start = time.time() - days * 86400
+    start -= start % poll_interval
+    courses, history = [], []
+    for index in range(sections):
+        course = Course.create(f"SUBJ{index // 4 % 40}", str(10000 + index // 4), f"Course {index // 4}",
+                               str(20000 + index), 'Full', 'Staff', 'Main', '')
+        courses.append(course)
+        history.append((course.crn, None, 'Full', start))
+        for day in range(days):
+            for _ in range(sum(rng.random() < openings_per_day / 3 for _ in range(3))):
+                hour = rng.choices(range(24), HOUR_WEIGHTS)[0]
+                opened = start + day * 86400 + hour * 3600 + rng.randrange(0, 3600, poll_interval)
+                lasted = poll_interval * max(1, int(rng.expovariate(1 / 30)))
+                history.append((course.crn, 'Full', 'Available', opened))
+                history.append((course.crn, 'Available', 'Full', opened + lasted))
+
+    with store.conn:
+        store.conn.executemany(INSERT_COURSE, [course + (start,) for course in courses])
+        store.conn.executemany(
+            "INSERT INTO status_history (crn, old_status, new_status, observed_at) VALUES (?, ?, ?, ?)",
+            history
+        )
+    store.analytics.rebuild()
+    return len(history)
+
+
+def format_duration(seconds):
+    return f"{seconds / 3600:.1f}h" if seconds >= 3600 else f"{seconds / 60:.0f}m"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query seat-availability history and its rollups.")
+    parser.add_argument('--db', help="state database written by the monitor (default course_states.db)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    hours = commands.add_parser('hours', help="openings per hour of day")
+    availability = commands.add_parser('availability', help="mean time sections stay Available")
+    for command in (hours, availability):
+        command.add_argument('--crn')
+        command.add_argument('--subject')
+        command.add_argument('--course', help="course number, e.g. 10279")
+    availability.add_argument('--limit', type=int, default=20)
+
+    churn = commands.add_parser('churn', help="courses with the most status transitions")
+    churn.add_argument('--subject')
+    churn.add_argument('--limit', type=int, default=20)
+
+    history = commands.add_parser('history', help="raw transitions of one CRN")
+    history.add_argument('crn')
+    history.add_argument('--days', type=float, help="only the last N days")
+
+    windows = commands.add_parser('windows', help="suggest POLL_WINDOWS from openings per hour")
+    windows.add_argument('--fast', type=int, default=120, help="interval for busy hours (s)")
+    windows.add_argument('--slow', type=int, default=1800, help="interval for hours with no openings (s)")
+
+    commands.add_parser('rebuild', help="recompute the rollups from the raw history")
+
+    synthetic = commands.add_parser('synthetic', help="fill a new --db with a synthetic semester, for benchmarking")
+    synthetic.add_argument('--sections', type=int, default=2000)
+    synthetic.add_argument('--days', type=int, default=105)
+    synthetic.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    if args.command == 'synthetic' and not args.db:
+        parser.error("synthetic needs an explicit --db, so it never writes into the live database")
+    args.db = args.db or "course_states.db"
+
+    store = StateStore(args.db)
+    analytics = store.analytics
+    started = time.perf_counter()
+    try:
+        if args.command == 'hours':
+            counts = analytics.openings_by_hour(args.crn, args.subject, args.course)
+            peak = max(counts.values()) or 1
+            for hour, count in counts.items():
+                print(f"{hour:02d}:00 {count:>7} {'#' * round(40 * count / peak)}")
+        elif args.command == 'availability':
+            for crn, subject, course_num, openings, mean in analytics.availability(
+                    args.crn, args.subject, args.course, args.limit):
+                print(f"{crn:>6} {subject} {course_num:<8} {openings:>5} openings, Available for {format_duration(mean)} on average")
+        elif args.command == 'churn':
+            for subject, course_num, sections, transitions, openings in analytics.churn(args.subject, args.limit):
+                print(f"{subject} {course_num:<8} {sections:>3} sections {transitions:>6} transitions {openings:>5} openings")
+        elif args.command == 'history':
+            since = time.time() - args.days * 86400 if args.days else None
+            for old_status, new_status, observed_at in store.history(args.crn, since):
+                print(f"{datetime.fromtimestamp(observed_at):%Y-%m-%d %H:%M} {old_status or '-'} -> {new_status}")
+        elif args.command == 'windows':
+            print(analytics.suggest_windows(args.fast, args.slow) or "No openings recorded yet.")
+        elif args.command == 'rebuild':
+            print(f"Rebuilt rollups for {analytics.rebuild()} sections.")
+        elif args.command == 'synthetic':
+            if store.conn.execute("SELECT 1 FROM courses LIMIT 1").fetchone():
+                parser.error(f"{args.db} already holds course data; pass --db with a new file")
+            print(f"Wrote {generate_history(store, args.sections, args.days, seed=args.seed)} transitions to {args.db}.")
+        print(f"({(time.perf_counter() - started) * 1000:.1f} ms)")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from datetime import datetime
+from src.utils.log_utils import get_logger
+from src.utils.metrics import METRICS
+from src.utils.telegram_utils import AsyncTelegramNotifier
+
+logger = get_logger('async_monitor')
+
+
+class AsyncRegistrationMonitor:
+    """
+    Runs a RegistrationMonitor as an asyncio pipeline: fetch -> parse -> diff -> notify/persist.
+
+    Stages are connected by bounded queues, so a slow Telegram call or disk write never holds up
+    the next fetch. A lagging persist stage only keeps the latest snapshot; a lagging notify
+    stage gets the waiting changes merged into one batch, so no alert is lost. Blocking work
+    (HTTP/WebDriver fetches, parsing, JSON writes) runs in the default executor. With SHARDS the
+    fetch stage only schedules each poll, and the parse stage fetches and parses every shard in
+    the monitor's worker processes.
+    """
+
+    def __init__(self, monitor, notifier=None, interval=600, queue_size=4):
+        self.monitor = monitor
+        # Alerts share the monitor's notifier, so both loops use one outbox and one gate
+        self.notifier = notifier or AsyncTelegramNotifier(notifier=monitor.notifier)
+        self.interval = interval
+        self.queue_size = queue_size
+        # Created in run(): before Python 3.10 a queue binds to the loop current at construction
+        self.page_queue = self.state_queue = self.notify_queue = self.persist_queue = None
+        self.poll_count = 0
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    @staticmethod
+    def _put_latest(queue, item):
+        """Enqueue without blocking, dropping the oldest entry when the consumer falls behind."""
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+
+    @staticmethod
+    def _put_merged(queue, changes):
+        """Enqueue without blocking, merging the waiting change lists into one batch when the consumer falls behind."""
+        try:
+            queue.put_nowait(changes)
+        except asyncio.QueueFull:
+            merged = []
+            while not queue.empty():
+                merged.extend(queue.get_nowait())
+                queue.task_done()
+            queue.put_nowait(merged + list(changes))
+
+    async def fetch_stage(self, max_polls=None):
+        """Fetch the results page every `interval` seconds."""
+        while max_polls is None or self.poll_count < max_polls:
+            started = time.monotonic()
+            logger.info(f"Checking courses at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}...")
+            METRICS.polls.inc()
+            try:
+                page = None
+                if not self.monitor.shard_pool:
+                    page = await self._run_blocking(self.monitor.fetch_page_source)
+                await self.page_queue.put(page)
+            except Exception as e:
+                logger.error(f"Error fetching registration page: {str(e)}")
+            self.poll_count += 1
+            await self._run_blocking(METRICS.write_textfile)
+
+            # Keep the cadence measured from the start of the fetch
+            interval = self.interval
+            if self.monitor.polling_policy:
+                interval = self.monitor.polling_policy.next_interval()
+            await asyncio.sleep(max(0, interval - (time.monotonic() - started)))
+
+    async def parse_stage(self):
+        while True:
+            page = await self.page_queue.get()
+            try:
+                current_states = await self._run_blocking(self.monitor.parse_course_info, page)
+                if current_states:
+                    await self.state_queue.put(current_states)
+                elif current_states is None and self.notify_queue.empty():
+                    # Unchanged page: still let the notifier release held changes and digests
+                    self._put_merged(self.notify_queue, [])
+            finally:
+                self.page_queue.task_done()
+
+    async def diff_stage(self):
+        while True:
+            current_states = await self.state_queue.get()
+            try:
+                # Compare the loaded states with the current states
+                if self.monitor.previous_states:
+                    changes = self.monitor.check_for_changes(current_states)
+                    if self.monitor.polling_policy:
+                        self.monitor.polling_policy.record_changes(changes)
+                    if changes:
+                        logger.info(f"Detected {len(changes)} changes")
+                        logger.debug(f"Detected changes: {changes}")
+                    if changes or self.notify_queue.empty():
+                        # Empty polls still let the notifier release held changes and digests
+                        self._put_merged(self.notify_queue, changes)
+                else:
+                    logger.info("No previous states available for comparison.")
+
+                self.monitor.previous_states = current_states
+                self._put_latest(self.persist_queue, current_states)
+            finally:
+                self.state_queue.task_done()
+
+    async def notify_stage(self):
+        while True:
+            changes = await self.notify_queue.get()
+            try:
+                with METRICS.time('notify'):
+                    await self.notifier.alert_changes(changes)
+            finally:
+                self.notify_queue.task_done()
+
+    async def persist_stage(self):
+        while True:
+            current_states = await self.persist_queue.get()
+            try:
+                await self._run_blocking(self.monitor.save_current_states, current_states)
+            finally:
+                self.persist_queue.task_done()
+
+    async def run(self, max_polls=None):
+        """Run every stage until cancelled, or until `max_polls` fetches have been processed."""
+        self.page_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.state_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.notify_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.persist_queue = asyncio.Queue(maxsize=self.queue_size)
+        await self._run_blocking(self.monitor.initialize)
+        workers = [
+            asyncio.create_task(self.parse_stage()),
+            asyncio.create_task(self.diff_stage()),
+            asyncio.create_task(self.notify_stage()),
+            asyncio.create_task(self.persist_stage())
+        ]
+        try:
+            await self.fetch_stage(max_polls)
+            for queue in (self.page_queue, self.state_queue, self.notify_queue, self.persist_queue):
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await self.notifier.close()
@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class MonitorTarget:
+    account: str
+    email: str
+    password: str
+    term: str
+    telegram_chat_id: Optional[str] = None
+    telegram_token: Optional[str] = None
+    watchlist: List[str] = field(default_factory=list)
+
+    @property
+    def key(self):
+        return f"{self.account}_{self.term}"
@@ -0,0 +1,40 @@
+from typing import NamedTuple
+from src.models.course import Course
+
+class ChangeEvent(NamedTuple):
+    kind: str  # 'added', 'removed', 'status', 'instructor' or 'campus'
+    course: Course  # Current record, or the last known one for 'removed'
+    old_value: str
+    new_value: str
+
+    @property
+    def crn(self):
+        return self.course.crn
+
+    @property
+    def subject(self):
+        return self.course.subject
+
+    @property
+    def course_num(self):
+        return self.course.course_num
+
+    @property
+    def title(self):
+        return self.course.title
+
+    @property
+    def instructor(self):
+        return self.course.instructor
+
+    @property
+    def old_status(self):
+        if self.kind == 'added':
+            return 'Not tracked'
+        return self.old_value if self.kind == 'status' else self.course.status
+
+    @property
+    def new_status(self):
+        if self.kind == 'removed':
+            return 'Removed'
+        return self.new_value if self.kind == 'status' else self.course.status
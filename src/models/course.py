@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+import sys
+from typing import NamedTuple
 
-@dataclass
-class Course:
+class Course(NamedTuple):
     subject: str
     course_num: str
     title: str
@@ -10,3 +10,14 @@ class Course:
     instructor: str
     campus: str
     dates: str
+
+    @classmethod
+    def create(cls, subject, course_num, title, crn, status, instructor, campus, dates):
+        """Build a Course, interning the fields that repeat across thousands of sections."""
+        intern = sys.intern
+        return cls(intern(subject), intern(course_num), intern(title), crn, intern(status),
+                   intern(instructor), intern(campus), intern(dates))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.create(**{field: data.get(field, '') for field in cls._fields})
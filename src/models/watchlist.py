@@ -0,0 +1,46 @@
+import os
+
+
+class Watchlist:
+    """CRNs, subjects ("COMP") and courses ("COMP 10279") the monitor should care about."""
+
+    def __init__(self, entries=None):
+        self.crns = set()
+        self.subjects = set()
+        self.courses = set()
+        for entry in entries or []:
+            entry = ' '.join(str(entry).upper().split())
+            if not entry:
+                continue
+            if entry.isdigit():
+                self.crns.add(entry)
+            elif ' ' in entry:
+                self.courses.add(entry)
+            else:
+                self.subjects.add(entry)
+
+    @classmethod
+    def from_string(cls, spec):
+        """Parse a comma-separated watchlist such as "27446, COMP 10279, MATH"."""
+        return cls((spec or "").split(','))
+
+    @classmethod
+    def from_env(cls):
+        return cls.from_string(os.environ.get('WATCHLIST'))
+
+    def __bool__(self):
+        return bool(self.crns or self.subjects or self.courses)
+
+    @property
+    def crn_only(self):
+        """True when rows can be accepted or rejected from the CRN cell alone."""
+        return not (self.subjects or self.courses)
+
+    def matches(self, crn, subject=None, course_num=None):
+        """Return True when the section is watched."""
+        if crn in self.crns:
+            return True
+        if subject is None:
+            return False
+        subject = subject.upper()
+        return subject in self.subjects or f"{subject} {course_num}" in self.courses
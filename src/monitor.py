@@ -1,42 +1,283 @@
+import logging
 import sys
+import threading
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime
 import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from src.models.course import Course
-from src.utils.browser_utils import get_text_from_cell, determine_status
-from src.utils.telegram_utils import TelegramNotifier
+from src.models.watchlist import Watchlist
+from src.parsing.course_table import IncrementalPageParser
+from src.utils.browser_utils import (get_text_from_cell, determine_status, initialize_driver, kill_driver_processes,
+                                     report_navigation)
+from src.utils.diff_utils import ChangeDetector
+from src.utils.navigation import (STEP_TIMEOUTS, FULL_NAVIGATION_ROUND_TRIPS, SUBMIT_FORM_SCRIPT, StepTimer,
+                                  close_extra_windows, race, wait_until)
+from src.utils.log_utils import get_logger
+from src.utils.metrics import METRICS
+from src.utils.http_utils import HttpPoller, RecordingPoller, SessionExpired, CAPTURE_FORM_SCRIPT
+from src.utils.session_store import SessionStore
+from src.sharding import ShardPool
+from src.utils.state_store import StateStore
 from dotenv import load_dotenv
-import json
+
+logger = get_logger('monitor')
+
 
 class RegistrationMonitor:
-    def __init__(self):
+    def __init__(self, snapshot_parsing=True, http_polling=True, release_browser=False,
+                 email=None, password=None, term='559', json_file="course_states.json",
+                 state_db="course_states.db", session_file="session_cache.json", notifier=None, name=None, polling_policy=None,
+                 watchlist=None, low_footprint_browser=True, poller=None, shards=None, shard_workers=None,
+                 login_lock=None):
         load_dotenv()
 
-        # Configure Chrome options for headless operation
-        chrome_options = Options()
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
+        # Account and term this monitor watches
+        self.name = name
+        self.email = email or os.environ.get('MOHAWK_EMAIL')
+        self.password = password or os.environ.get('MOHAWK_PASSWORD')
+        self.term = term
 
         # Initialize the webdriver and previous state
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 120)  # 120 second timeout
-        self.json_file = "course_states.json"
-        self.previous_states = self.load_previous_states()  # Load state from JSON
+        self.driver = None
+        self.wait = None
+        self.low_footprint_browser = low_footprint_browser
+        self.navigation_reports = deque(maxlen=50)  # (label, page load ms, browser RSS bytes)
+        self.step_timeouts = dict(STEP_TIMEOUTS)
+        self.step_timer = StepTimer()  # Per-step login/navigation durations
+        self.main_window = None  # Portal tab the timetable tab is opened from
+        self.results_fresh = False  # Results page was just loaded and needs no refresh
+        self.navigation_counts = {'http': 0, 'refresh': 0, 'full': 0, 'login': 0}
+        self.last_poll_navigations = {}
+        self.json_file = json_file  # Legacy state file, imported into the store once
+        self.state_store = StateStore(state_db, legacy_json=json_file)
 
         # Initialize Telegram notifier
-        self.notifier = TelegramNotifier()
+        if notifier is None:
+            from src.utils.telegram_utils import TelegramNotifier
+            notifier = TelegramNotifier()
+        self.notifier = notifier
 
         # Add flag to track initial setup
         self.is_initialized = False
 
+        # Outcome of the latest poll, for the supervisor's health checks
+        self.last_poll_error = None
+        self.last_success = None
+
+        # Optional AdaptivePollingPolicy; a fixed interval is used without one
+        self.polling_policy = polling_policy
+        if polling_policy:
+            polling_policy.seed_history(
+                self.state_store.recent_changes(time.time() - polling_policy.history_window)
+            )
+
+        # Only watched sections are parsed, diffed and alerted on (everything if empty)
+        self.watchlist = watchlist if watchlist is not None else Watchlist.from_env()
+        pruned = self.state_store.prune(self.watchlist)
+        if pruned:
+            logger.info(f"Dropped {pruned} unwatched sections from {self.state_store.path}.")
+        self.previous_states = self.load_previous_states()  # Lazily loaded from the store
+        self.change_detector = ChangeDetector(self.watchlist)
+        self.parse_stats = {'polls': 0, 'rows': 0, 'skipped': 0, 'parsed': 0}
+        self.last_parse_stats = {}
+
+        # Content-hash cache: unchanged pages skip parse/diff/save, changed pages re-parse only changed rows
+        self.page_parser = IncrementalPageParser(self.watchlist)
+
+        # Optionally split the results page into per-subject searches fetched by worker processes
+        self.shard_pool = ShardPool(shards, shard_workers, watchlist=self.watchlist) if shards else None
+
+        # Parse from a single page_source snapshot instead of per-cell WebDriver calls
+        self.snapshot_parsing = snapshot_parsing
+
+        # Poll the results page over HTTP with the browser's cookies once logged in
+        self.http_polling = http_polling
+        self.release_browser = release_browser
+        self.poller = poller  # Injected pollers (e.g. src.replay) skip the login entirely
+        self.term_form = None
+        self.session_store = SessionStore(session_file)
+        self.watchdog = None  # Set by MonitorSupervisor while it watches polls
+        # Held for every interactive login; the scheduler shares one so 2FA prompts never interleave
+        self.login_lock = login_lock or threading.Lock()
+
+        # Resume a saved session when possible, skipping Chrome and the 2FA login entirely.
+        # Otherwise Chrome is only launched once initialize() actually needs to log in.
+        if self.poller:
+            self.is_initialized = True
+        else:
+            self.resume_saved_session()
+
+    def resume_saved_session(self):
+        """Build the HTTP poller from a still-valid cached session."""
+        if not self.http_polling:
+            return False
+        session = self.session_store.load()
+        if not session:
+            return False
+        self.poller = self.record_pages(HttpPoller.from_session(session))
+        self.is_initialized = True
+        logger.info(f"Resumed saved session for {self.poller.url}")
+        return True
+
+    def start_browser(self):
+        """Launch headless Chrome through the shared driver factory."""
+        self.driver, self.wait = initialize_driver(low_footprint=self.low_footprint_browser)
+
+    def browser_alive(self):
+        """True while chromedriver is still running, checked without a WebDriver round trip."""
+        try:
+            return self.driver.service.process.poll() is None
+        except AttributeError:
+            return self.driver is not None
+
+    def restart_browser(self):
+        """Replace a dead or hung Chrome with a fresh login, keeping parsed state and the notifier."""
+        if self.poller:
+            self.poller.close()
+            self.poller = None
+        if self.driver is not None:
+            kill_driver_processes(self.driver)
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+            self.wait = None
+        self.is_initialized = False
+        self.start_browser()
+        self.initialize()
+
+    def log_navigation(self, label):
+        """Record page-load time and browser RSS for the page just reached."""
+        load_ms, rss = report_navigation(self.driver, label)
+        self.navigation_reports.append((label, load_ms, rss))
+
+    def count_navigation(self, kind):
+        """Count one results-page load by how it was reached."""
+        self.navigation_counts[kind] += 1
+        METRICS.navigations.inc(kind=kind)
+
+    def round_trips_saved(self, counts=None):
+        """Page loads avoided by refreshing in place instead of re-running the full click chain."""
+        counts = counts or self.navigation_counts
+        return (counts.get('http', 0) + counts.get('refresh', 0)) * (FULL_NAVIGATION_ROUND_TRIPS - 1)
+
+    @staticmethod
+    def record_pages(poller):
+        """Save every fetched page to RECORD_PAGES_DIR, when set, for `python -m src.replay --pages`."""
+        directory = os.environ.get('RECORD_PAGES_DIR')
+        if not directory:
+            return poller
+        return RecordingPoller(poller, directory)
+
+    def start_http_polling(self):
+        """Export the browser session cookies into a pooled HTTP poller."""
+        if not self.http_polling:
+            return
+        if self.poller:
+            self.poller.close()
+        self.poller = self.record_pages(HttpPoller.from_driver(self.driver, self.term_form))
+        logger.info(f"HTTP polling enabled for {self.poller.url}")
+        self.session_store.save(self.driver.get_cookies(), self.poller.url, self.poller.method,
+                                self.poller.form_data, self.poller.user_agent)
+
+        if self.release_browser:
+            # The browser is only needed again if the session expires
+            logger.info("Releasing browser until the session expires...")
+            self.driver.quit()
+            self.driver = None
+            self.wait = None
+
+    def recover_browser_session(self):
+        """Fall back to the browser to re-establish the session, then resume HTTP polling."""
+        if self.driver is None:
+            # The login waits on the user for 2FA, so a supervising watchdog must not count it as a hang
+            with self.watchdog.paused() if self.watchdog else nullcontext(), self.login_lock:
+                self.start_browser()
+                self.count_navigation('login')
+                if not self.start_login_process() or not self.navigate_to_registration():
+                    raise Exception("Failed to re-establish session")
+        else:
+            self.navigate_to_home_and_restart()
+        self.start_http_polling()
+
+    @METRICS.timed('fetch')
+    def fetch_page_source(self):
+        """Return the registration results page, over HTTP when a poller is active."""
+        if self.poller:
+            try:
+                page = self.poller.fetch()
+                self.count_navigation('http')
+                return page
+            except SessionExpired as e:
+                logger.warning(f"HTTP session expired ({e}), falling back to the browser...")
+                self.session_store.clear()
+                self.poller.close()
+                self.poller = None
+                self.recover_browser_session()
+                if self.poller:
+                    page = self.poller.fetch()
+                    self.count_navigation('http')
+                    return page
+        self.refresh_browser_page()
+        return self.driver.page_source
+
+    @METRICS.timed('fetch')
+    def fetch_shards(self, stats):
+        """Fetch and parse every subject shard in the worker pool; None when no shard changed."""
+        for attempt in range(2):
+            if self.shard_pool.poller is not self.poller:
+                self.shard_pool.bind(self.poller)
+            try:
+                courses = self.shard_pool.fetch_all(stats)
+                break
+            except SessionExpired as e:
+                if attempt:
+                    raise
+                logger.warning(f"HTTP session expired ({e}), falling back to the browser...")
+                self.session_store.clear()
+                self.poller.close()
+                self.poller = None
+                self.recover_browser_session()
+        self.count_navigation('http')
+        for seconds in self.shard_pool.parse_seconds:
+            METRICS.stage_seconds.observe(seconds, stage='parse')
+        return courses
+
+    @METRICS.timed('navigation')
+    def refresh_results_page(self):
+        """Reload the results page in place by re-submitting the term form, or re-GETting its URL."""
+        from selenium.webdriver.support import expected_conditions as EC  # Heavy; only needed with a browser
+        old_page = self.driver.find_element(By.TAG_NAME, 'html')
+        if self.term_form:
+            self.driver.execute_script(SUBMIT_FORM_SCRIPT, self.term_form)
+        else:
+            self.driver.get(self.driver.current_url)
+        wait_until(self.driver, EC.staleness_of(old_page), self.step_timeouts['page'])
+        wait_until(self.driver, EC.presence_of_element_located((
+            By.XPATH, "//tr[contains(@class, 'RegPageHeader')]"
+        )), self.step_timeouts['page'])
+        self.count_navigation('refresh')
+
+    def refresh_browser_page(self):
+        """Bring the browser's results page up to date, escalating to the full click chain on failure."""
+        if self.results_fresh:
+            # Just navigated here, the DOM is already current
+            self.results_fresh = False
+            return
+        try:
+            self.refresh_results_page()
+        except Exception as e:
+            if isinstance(e, TimeoutException):
+                METRICS.timeouts.inc(stage='navigation')
+            logger.warning(f"In-place refresh failed ({str(e)}), re-running the full navigation...")
+            self.navigate_to_home_and_restart()
+            self.results_fresh = False
+
     @staticmethod
     def unified_input(prompt):
         """
@@ -55,386 +296,512 @@ class RegistrationMonitor:
 
 
     def load_previous_states(self):
-        """Load previous course states from a JSON file."""
-        if os.path.exists(self.json_file):
-            with open(self.json_file, 'r') as f:
-                try:
-                    data = json.load(f)
-                    print(f"Loaded previous states from {self.json_file}: {data}")
-                    return data
-                except json.JSONDecodeError:
-                    print("Error decoding JSON file. Starting with empty state.")
-                    return {}
-        print("No existing JSON file found. Starting with empty state.")
-        return {}
+        """Return the stored course states; rows are read from the state store on first access."""
+        return self.state_store.states()
 
+    @METRICS.timed('persist')
     def save_current_states(self, current_states):
-        """Save current course states to a JSON file."""
+        """Persist only the courses that changed since the last save."""
         try:
-            with open(self.json_file, 'w') as f:
-                json.dump(current_states, f, indent=4)
-            print(f"Successfully saved current states to {self.json_file}.")
+            written = self.state_store.save(current_states)
+            logger.debug(f"Saved {written} changed courses to {self.state_store.path}.")
         except Exception as e:
-            print(f"Error saving JSON file: {e}")
+            logger.error(f"Error saving course states: {e}")
 
     def check_for_changes(self, current_states):
-        """Compare current states with previous states and detect changes."""
-        changes = []
-
-        for crn, current in current_states.items():
-            if crn in self.previous_states:
-                # Compare the status of the current course with the previous state
-                previous = self.previous_states[crn]
-                if current['status'] != previous['status']:
-                    changes.append({
-                        'crn': crn,
-                        'subject': current['subject'],
-                        'course_num': current['course_num'],
-                        'title': current['title'],
-                        'instructor': current['instructor'],
-                        'old_status': previous['status'],
-                        'new_status': current['status']
-                    })
-            else:
-                # New course detected
-                changes.append({
-                    'crn': crn,
-                    'subject': current['subject'],
-                    'course_num': current['course_num'],
-                    'title': current['title'],
-                    'instructor': current['instructor'],
-                    'old_status': 'Not tracked',
-                    'new_status': current['status']
-                })
-
+        """Compare current states with previous states and return typed change events."""
+        with METRICS.time('diff'):
+            changes = self.change_detector.diff(self.previous_states, current_states)
+        for change in changes:
+            METRICS.changes_detected.inc(kind=change.kind)
         return changes
 
+    @METRICS.timed('login')
     def start_login_process(self):
         """Navigate directly to MyMohawk and handle Microsoft login with 2FA"""
+        from selenium.webdriver.support import expected_conditions as EC  # Heavy; only needed with a browser
+        timeouts = self.step_timeouts
+        self.step_timer.reset()
         try:
             # Configure Chrome to handle POST requests properly
             self.driver.execute_cdp_cmd('Network.enable', {})
 
             # Go directly to MyMohawk
-            print("Step 1: Navigating to MyMohawk login page...")
-            self.driver.get("https://mymohawk.mohawkcollege.ca/")
+            logger.info("Step 1: Navigating to MyMohawk login page...")
+            with self.step_timer.step("open login page"):
+                self.driver.get("https://mymohawk.mohawkcollege.ca/")
 
             # Wait for email input
-            print("Step 2: Entering email...")
-            email_input = self.wait.until(
-                EC.presence_of_element_located((
+            logger.info("Step 2: Entering email...")
+            with self.step_timer.step("email"):
+                email_input = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='email'] | //input[@name='loginfmt']"
-                ))
-            )
-            email_input.clear()
-            email_input.send_keys(os.environ.get('MOHAWK_EMAIL'))
+                )), timeouts['page'])
+                email_input.clear()
+                email_input.send_keys(self.email)
 
-            # Click Next
-            next_button = self.wait.until(
-                EC.element_to_be_clickable((
+                # Click Next
+                next_button = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='submit'] | //input[@id='idSIButton9']"
-                ))
-            )
-            next_button.click()
-            time.sleep(2)  # Allow for transition
+                )), timeouts['field'])
+                next_button.click()
 
-            # Wait for password field
-            print("Step 3: Entering password...")
-            password_input = self.wait.until(
-                EC.presence_of_element_located((
+            # Wait for password field; it only becomes visible once the email step is done
+            logger.info("Step 3: Entering password...")
+            with self.step_timer.step("password"):
+                password_input = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='password'] | //input[@name='passwd']"
-                ))
-            )
-            password_input.clear()
-            password_input.send_keys(os.environ.get('MOHAWK_PASSWORD'))
+                )), timeouts['transition'])
+                password_input.clear()
+                password_input.send_keys(self.password)
 
-            # Click Sign in
-            signin_button = self.wait.until(
-                EC.element_to_be_clickable((
+                # Click Sign in
+                signin_button = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='submit'] | //input[@id='idSIButton9']"
-                ))
+                )), timeouts['field'])
+                signin_button.click()
+
+            # Handle 2FA method selection: the picker and the code entry are alternative outcomes
+            logger.info("Step 4: Handling 2FA method selection...")
+            code_input_locator = (
+                By.XPATH,
+                "//input[@name='otc'] | //input[contains(@aria-label, 'Enter code')]"
             )
-            signin_button.click()
-            time.sleep(2)  # Allow for transition
-
-            # Handle 2FA method selection
-            print("Step 4: Handling 2FA method selection...")
-            try:
-                # Look for and click the text verification option
-                text_option = self.wait.until(
-                    EC.presence_of_element_located((
+            with self.step_timer.step("2fa method"):
+                outcome, element = race(self.driver, {
+                    'code': EC.visibility_of_element_located(code_input_locator),
+                    'picker': EC.element_to_be_clickable((
                         By.XPATH,
                         "//div[contains(text(), 'Text')] | //button[contains(text(), 'Text')]"
                     ))
-                )
-                text_option.click()
-                print("Selected text verification option")
-
-            except:
-                print("No 2FA method selection found, continuing to code entry...")
+                }, timeouts['transition'])
+                if outcome == 'picker':
+                    element.click()
+                    logger.info("Selected text verification option")
+                else:
+                    logger.info("No 2FA method selection found, continuing to code entry...")
 
             # Wait for verification code input
-            print("Step 5: Entering 2FA code...")
-            code_input = self.wait.until(
-                EC.presence_of_element_located((
-                    By.XPATH,
-                    "//input[@name='otc'] | //input[contains(@aria-label, 'Enter code')]"
-                ))
-            )
+            logger.info("Step 5: Entering 2FA code...")
+            with self.step_timer.step("2fa code page"):
+                code_input = wait_until(self.driver, EC.visibility_of_element_located(code_input_locator),
+                                        timeouts['transition'])
 
             # Get verification code from user
-            verification_code = self.unified_input("Enter the 2FA code sent to your phone: ")
-            code_input.clear()
-            code_input.send_keys(verification_code)
+            prompt = f"[{self.name}] " if self.name else ""
+            verification_code = self.unified_input(f"{prompt}Enter the 2FA code sent to your phone: ")
+
+            with self.step_timer.step("2fa verify"):
+                code_input.clear()
+                code_input.send_keys(verification_code)
 
-            # Click Verify
-            verify_button = self.wait.until(
-                EC.element_to_be_clickable((
+                # Click Verify
+                verify_button = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='submit'] | //button[contains(text(), 'Verify')] | //input[@id='idSubmit_SAOTCC_Continue']"
-                ))
-            )
-            verify_button.click()
+                )), timeouts['field'])
+                verify_button.click()
 
-            # Handle "Stay signed in?" prompt
-            print("Step 6: Handling 'Stay signed in' prompt...")
-            try:
-                stay_signed_in = self.wait.until(
-                    EC.element_to_be_clickable((
-                        By.XPATH,
-                        "//input[@id='idSIButton9'] | //input[@value='Yes']"
-                    ))
-                )
-                stay_signed_in.click()
-            except:
-                print("No 'Stay signed in' prompt found, continuing...")
+            # Handle "Stay signed in?" prompt, or go straight on if the portal is already loading
+            logger.info("Step 6: Handling 'Stay signed in' prompt...")
+            with self.step_timer.step("stay signed in"):
+                try:
+                    wait_until(self.driver, EC.staleness_of(verify_button), timeouts['optional'])
+                except TimeoutException:
+                    pass
+                try:
+                    outcome, element = race(self.driver, {
+                        'home': EC.url_contains("mymohawk.mohawkcollege.ca/mymohawk-college/Home"),
+                        'prompt': EC.element_to_be_clickable((
+                            By.XPATH,
+                            "//input[@id='idSIButton9'] | //input[@value='Yes']"
+                        ))
+                    }, timeouts['transition'])
+                    if outcome == 'prompt':
+                        element.click()
+                    else:
+                        logger.info("No 'Stay signed in' prompt found, continuing...")
+                except TimeoutException:
+                    logger.info("No 'Stay signed in' prompt found, continuing...")
 
             # Wait for successful redirect
-            print("Step 7: Waiting for successful login redirect...")
-            self.wait.until(
-                lambda driver: "mymohawk.mohawkcollege.ca/mymohawk-college/Home" in driver.current_url
-            )
-            print("Successfully logged in!")
+            logger.info("Step 7: Waiting for successful login redirect...")
+            with self.step_timer.step("redirect home"):
+                wait_until(
+                    self.driver,
+                    lambda driver: "mymohawk.mohawkcollege.ca/mymohawk-college/Home" in driver.current_url,
+                    timeouts['page']
+                )
+            logger.info("Successfully logged in!")
+            logger.info(f"Login step timings: {self.step_timer.summary()}")
+            self.log_navigation("login")
             return True
 
         except TimeoutException as e:
-            print(f"Timeout during login process: {str(e)}")
+            METRICS.timeouts.inc(stage='login')
+            logger.warning(f"Timeout during login process: {str(e)}")
+            logger.info(f"Login step timings: {self.step_timer.summary()}")
             self.driver.save_screenshot('timeout_error.png')
             self.notifier.send_message(f"⚠️ Login timeout error: {str(e)}")
             return False
         except Exception as e:
-            print(f"Error during login process: {str(e)}")
+            logger.error(f"Error during login process: {str(e)}")
             self.driver.save_screenshot('general_error.png')
             self.notifier.send_message(f"⚠️ Login error: {str(e)}")
             return False
 
-    def monitor_courses(self, interval=600):
-        """Main monitoring loop."""
-        try:
-            print("\nStarting course monitoring...")
-            print("Press Ctrl+C to stop monitoring")
-
-            # Perform initial setup if not done
-            if not self.is_initialized:
+    def initialize(self):
+        """Log in and reach the registration page unless a session is already active."""
+        if not self.is_initialized:
+            with self.login_lock:
+                if self.driver is None:
+                    self.start_browser()
                 if not self.start_login_process() or not self.navigate_to_registration():
                     raise Exception("Failed to initialize monitoring")
-                self.is_initialized = True
+            self.is_initialized = True
+            self.start_http_polling()
 
-            # Load previously saved states from JSON on startup
-            self.previous_states = self.load_previous_states()
-            print(f"Loaded previous states on startup: {self.previous_states}")
+    def poll_once(self):
+        """Fetch, diff, alert and save once. Returns the detected changes."""
+        logger.info(f"Checking courses at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}...")
 
-            while True:
-                try:
-                    print(f"\nChecking courses at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}...")
-                    self.notifier.send_message("Course Monitoring Started Successfully")
-
-                    # Parse current course information
-                    current_states = self.parse_course_info()
-
-                    # Compare the loaded states with the current states
-                    if self.previous_states:
-                        changes = self.check_for_changes(current_states)
-                        if changes:
-                            print(f"Detected changes: {changes}")
-                            self.notifier.alert_changes(changes)
-                    else:
-                        print("No previous states available for comparison.")
+        # Parse current course information
+        METRICS.polls.inc()
+        self.last_poll_error = None
+        counts_before = dict(self.navigation_counts)
+        try:
+            current_states = self.parse_course_info()
+        finally:
+            self.record_poll_navigations(counts_before)
+            METRICS.write_textfile()
+        if current_states is None:
+            self.last_success = time.time()
+            # Nothing changed, but held changes and digests may have come due
+            with METRICS.time('notify'):
+                self.notifier.alert_changes([])
+            return []
+        if not current_states:
+            # An empty parse is a failed fetch, not every section disappearing
+            logger.info("No courses parsed, keeping previous states.")
+            return []
+        self.last_success = time.time()
+
+        # Compare the loaded states with the current states
+        changes = []
+        if self.previous_states:
+            changes = self.check_for_changes(current_states)
+            if changes:
+                logger.info(f"Detected {len(changes)} changes")
+                logger.debug(f"Detected changes: {changes}")
+            # Called every poll so the notifier can release held changes and digests
+            with METRICS.time('notify'):
+                self.notifier.alert_changes(changes)
+        else:
+            logger.info("No previous states available for comparison.")
+
+        # Save current states to JSON
+        self.save_current_states(current_states)
+
+        # Update the previous states for the next iteration
+        self.previous_states = current_states
+        return changes
+
+    def record_poll_navigations(self, counts_before):
+        """Report how the results page was reached this poll and the round trips that saved."""
+        self.last_poll_navigations = {
+            kind: count - counts_before.get(kind, 0) for kind, count in self.navigation_counts.items()
+        }
+        saved = self.round_trips_saved(self.last_poll_navigations)
+        METRICS.round_trips_saved.inc(saved)
+        used = ", ".join(f"{kind} {count}" for kind, count in self.last_poll_navigations.items() if count)
+        logger.info(f"Navigations this poll: {used or 'none'} "
+                    f"(saved {saved} round trips, {self.round_trips_saved()} in total)")
+
+    def monitor_courses(self, interval=600, max_polls=None):
+        """Main monitoring loop. Runs until interrupted, or for `max_polls` polls when given."""
+        try:
+            logger.info("Starting course monitoring... Press Ctrl+C to stop monitoring")
+
+            # Perform initial setup if not done
+            self.initialize()
 
-                    # Save current states to JSON
-                    self.save_current_states(current_states)
+            self.notifier.send_message("Course Monitoring Started Successfully")
 
-                    # Update the previous states for the next iteration
-                    self.previous_states = current_states
+            polls = 0
+            while max_polls is None or polls < max_polls:
+                polls += 1
+                try:
+                    changes = self.poll_once()
 
                     # Wait before the next check
-                    print(f"Waiting {interval} seconds before next check...")
-                    time.sleep(interval)
+                    delay = interval
+                    if self.polling_policy:
+                        self.polling_policy.record_changes(changes)
+                        delay = self.polling_policy.next_interval()
+                    logger.info(f"Waiting {delay:.0f} seconds before next check...")
+                    time.sleep(delay)
 
                 except TimeoutException:
-                    print("Page refresh timeout, attempting to reinitialize navigation...")
+                    METRICS.timeouts.inc(stage='poll')
+                    logger.warning("Page refresh timeout, attempting to reinitialize navigation...")
+                    if self.polling_policy:
+                        self.polling_policy.record_timeout()
                     self.navigate_to_home_and_restart()
 
         except KeyboardInterrupt:
-            print("\nStopping course monitor...")
+            logger.info("Stopping course monitor...")
             self.notifier.send_message("ℹ️ Course monitor stopped by user")
 
         except Exception as e:
-            print(f"An error occurred in monitoring loop: {str(e)}")
+            logger.error(f"An error occurred in monitoring loop: {str(e)}")
             self.notifier.send_message(f"⚠️ Error in course monitor: {str(e)}")
             raise
 
         finally:
             self.close()
 
+    @METRICS.timed('navigation')
     def navigate_to_registration(self):
         """Navigate to the registration page after successful login"""
+        from selenium.webdriver.support import expected_conditions as EC  # Heavy; only needed with a browser
+        timeouts = self.step_timeouts
+        timer = StepTimer()
         try:
+            # Keep a single results tab: close the ones earlier navigations opened
+            if self.main_window in self.driver.window_handles:
+                closed = close_extra_windows(self.driver, self.main_window)
+                if closed:
+                    logger.info(f"Closed {closed} stale tabs")
+            self.main_window = self.driver.current_window_handle
+
             # Navigate to the registration tab
-            self.driver.get("https://mymohawk.mohawkcollege.ca/mymohawk-college/Registration")
+            with timer.step("registration tab"):
+                self.driver.get("https://mymohawk.mohawkcollege.ca/mymohawk-college/Registration")
 
-            # Wait for the "Choose or change my timetable" link and click it
-            timetable_link = self.wait.until(
-                EC.presence_of_element_located((
+                # Wait for the "Choose or change my timetable" link and click it
+                timetable_link = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//a[contains(@href, 'wwskregs.P_WebRegs')]"
-                ))
-            )
-            timetable_link.click()
+                )), timeouts['page'])
+                handles_before = len(self.driver.window_handles)
+                timetable_link.click()
 
             # Wait for new tab to open and switch to it
-            self.wait.until(lambda driver: len(driver.window_handles) > 1)
-            self.driver.switch_to.window(self.driver.window_handles[-1])
+            with timer.step("timetable tab"):
+                wait_until(self.driver, lambda driver: len(driver.window_handles) > handles_before,
+                           timeouts['new_tab'])
+                self.driver.switch_to.window(self.driver.window_handles[-1])
 
             # Wait for and click the "Submit to Confirm" button
-            submit_button = self.wait.until(
-                EC.element_to_be_clickable((
+            with timer.step("confirm"):
+                submit_button = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='submit'][@value='Submit to Confirm']"
-                ))
-            )
-            submit_button.click()
+                )), timeouts['page'])
+                submit_button.click()
 
-            # Wait for and click the "559" span
-            span_559 = self.wait.until(
-                EC.element_to_be_clickable((
+            # Wait for and click the term span (e.g. "559")
+            with timer.step("term"):
+                term_span = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
-                    "//span[@class='textLargeCentered'][text()='559']"
-                ))
-            )
-            span_559.click()
+                    f"//span[@class='textLargeCentered'][text()='{self.term}']"
+                )), timeouts['page'])
+                term_span.click()
 
             # Wait for and click the "CONTINUE" button
-            continue_button = self.wait.until(
-                EC.element_to_be_clickable((
+            with timer.step("continue"):
+                continue_button = wait_until(self.driver, EC.element_to_be_clickable((
                     By.XPATH,
                     "//input[@type='submit'][@value='CONTINUE']"
-                ))
-            )
-            continue_button.click()
+                )), timeouts['field'])
 
-            print("Successfully navigated through all registration steps!")
+                # Remember the term form so the results page can be re-requested over HTTP
+                try:
+                    self.term_form = self.driver.execute_script(CAPTURE_FORM_SCRIPT, continue_button)
+                except Exception as e:
+                    logger.warning(f"Could not capture term form, HTTP polling will re-GET the page: {str(e)}")
+                    self.term_form = None
+                continue_button.click()
+
+                # The results page is ready once the old form is gone and course rows are present
+                wait_until(self.driver, EC.staleness_of(continue_button), timeouts['page'])
+                wait_until(self.driver, EC.presence_of_element_located((
+                    By.XPATH, "//tr[contains(@class, 'RegPageHeader')]"
+                )), timeouts['page'])
+
+            logger.info("Successfully navigated through all registration steps!")
+            logger.info(f"Registration step timings: {timer.summary()}")
+            self.step_timer.timings.extend(timer.timings)
+            self.results_fresh = True
+            self.log_navigation("registration")
             return True
 
         except TimeoutException:
-            print("Timeout waiting for one of the navigation elements.")
+            METRICS.timeouts.inc(stage='navigation')
+            logger.warning("Timeout waiting for one of the navigation elements.")
+            logger.info(f"Registration step timings: {timer.summary()}")
             return False
         except Exception as e:
-            print(f"Error navigating to registration: {str(e)}")
+            logger.error(f"Error navigating to registration: {str(e)}")
             return False
 
     def navigate_to_home_and_restart(self):
         """Navigate back to the /home page and restart navigation to registration"""
+        from selenium.webdriver.support import expected_conditions as EC  # Heavy; only needed with a browser
         try:
             # Navigate to the home page
-            print("Navigating back to the /home page...")
+            logger.info("Navigating back to the /home page...")
+            self.count_navigation('full')
+            if self.main_window in self.driver.window_handles:
+                self.driver.switch_to.window(self.main_window)
             self.driver.get("https://mymohawk.mohawkcollege.ca/mymohawk-college/Home")
 
             # Wait for the home page to load
-            self.wait.until(EC.presence_of_element_located((By.XPATH, "//a[contains(text(), 'Registration')]")))
+            wait_until(self.driver, EC.presence_of_element_located((
+                By.XPATH, "//a[contains(text(), 'Registration')]"
+            )), self.step_timeouts['page'])
 
             # Reinitialize navigation to the registration page
-            print("Reinitializing navigation to the registration page...")
+            logger.info("Reinitializing navigation to the registration page...")
             if not self.navigate_to_registration():
                 raise Exception("Failed to navigate to the registration page")
         except Exception as e:
-            print(f"Error during navigation reset: {str(e)}")
+            logger.error(f"Error during navigation reset: {str(e)}")
             self.notifier.send_message(f"⚠️ Error during navigation reset: {str(e)}")
             raise
 
 
-    def parse_course_info(self):
-        """Parse course information using the more robust parsing logic."""
-        courses = []
+    def parse_course_info(self, page=None):
+        """
+        Parse course information using the more robust parsing logic, from `page` if given.
+
+        Returns None when the course table is byte-for-byte unchanged since the previous poll.
+        """
         try:
-            # Find all course rows
-            rows = self.driver.find_elements(By.XPATH,
-                                             "//tr[contains(@class, 'RegPageHeader') or contains(@class, 'RegPageHeaderWhite')]")
-            print(f"\nProcessing {len(rows)} rows...")
+            if page is None and self.shard_pool and self.poller:
+                stats = {}
+                parsed = self.fetch_shards(stats)
+                if parsed is None:
+                    logger.info("No shard's course table changed, skipping diff/save")
+                    return None
+            elif page is not None or self.poller or self.snapshot_parsing:
+                # One round trip for the whole page, then parse offline
+                if page is None:
+                    page = self.fetch_page_source()
+                stats = {}
+                cache_before = dict(self.page_parser.stats)
+                with METRICS.time('parse'):
+                    parsed = self.page_parser.parse(page, stats)
+                self.record_page_cache(cache_before)
+                if parsed is None:
+                    cache = self.page_parser
+                    logger.info(f"Course table unchanged, skipping parse/diff/save "
+                          f"(hit rate {cache.hit_rate():.0%}, saved {cache.last_time_saved * 1000:.0f} ms)")
+                    return None
+            else:
+                stats = {}
+                self.refresh_browser_page()
+                with METRICS.time('parse'):
+                    parsed = self.parse_course_rows_live(stats)
+            self.record_parse_stats(stats)
+
+            # Per-course dump only at DEBUG; formatting ~every row each poll is a real cost
+            if logger.isEnabledFor(logging.DEBUG):
+                for course in parsed:
+                    logger.debug(f"{course.subject} {course.course_num}: {course.title} | CRN: {course.crn} | "
+                                 f"Status: {course.status} | Instructor: {course.instructor} | "
+                                 f"Campus: {course.campus} | Dates: {course.dates}")
+
+            # Key the Course records by CRN for easier comparison
+            return {course.crn: course for course in parsed}
 
-            for row in rows:
-                try:
-                    # Skip header rows
-                    if "CRN" in row.text:
-                        continue
+        except Exception as e:
+            logger.error(f"Error during parsing: {str(e)}")
+            self.last_poll_error = e
+            return {}
+
+    def record_page_cache(self, before):
+        """Export this poll's page/row cache hits and the parse time they saved."""
+        stats = self.page_parser.stats
+        page_hits = stats['page_hits'] - before['page_hits']
+        METRICS.page_cache.inc(page_hits, level='page', result='hit')
+        METRICS.page_cache.inc(stats['polls'] - before['polls'] - page_hits, level='page', result='miss')
+        METRICS.page_cache.inc(stats['row_hits'] - before['row_hits'], level='row', result='hit')
+        METRICS.page_cache.inc(stats['row_misses'] - before['row_misses'], level='row', result='miss')
+        METRICS.parse_seconds_saved.inc(stats['time_saved'] - before['time_saved'])
+
+    def record_parse_stats(self, stats):
+        """Accumulate per-poll row counters and report how many rows the watchlist saved."""
+        self.last_parse_stats = stats
+        METRICS.rows_parsed.inc(stats.get('parsed', 0))
+        self.parse_stats['polls'] += 1
+        for key in ('rows', 'skipped', 'parsed'):
+            self.parse_stats[key] += stats.get(key, 0)
+        if self.watchlist:
+            logger.info(f"Watchlist: parsed {stats.get('parsed', 0)} of {stats.get('rows', 0)} rows, "
+                  f"skipped {stats.get('skipped', 0)} before field extraction")
+
+    def parse_course_rows_live(self, stats=None):
+        """Parse course rows cell by cell through WebDriver (one round trip per lookup)."""
+        courses = []
+        skipped = 0
+        # Find all course rows
+        rows = self.driver.find_elements(By.XPATH,
+                                         "//tr[contains(@class, 'RegPageHeader') or contains(@class, 'RegPageHeaderWhite')]")
+        logger.info(f"Processing {len(rows)} rows...")
 
-                    # Get CRN (cell 3) and validate
-                    crn = get_text_from_cell(row, 3)
-                    if not crn or not crn.isdigit():
+        for row in rows:
+            try:
+                # Drop unwatched rows before extracting anything else
+                if self.watchlist:
+                    subject = course_num = None
+                    if not self.watchlist.crn_only:
+                        subject = get_text_from_cell(row, 4)
+                        course_num = get_text_from_cell(row, 5)
+                    if not self.watchlist.matches(get_text_from_cell(row, 3), subject, course_num):
+                        skipped += 1
                         continue
 
-                    course = Course(
-                        subject=get_text_from_cell(row, 4),
-                        course_num=get_text_from_cell(row, 5),
-                        title=get_text_from_cell(row, 6, get_link_text=True),
-                        crn=crn,
-                        status=determine_status(row),
-                        instructor=get_text_from_cell(row, 9),
-                        campus=get_text_from_cell(row, 7, get_link_text=True),
-                        dates=get_text_from_cell(row, 8, get_link_text=True)
-                    )
-
-                    # Convert Course object to dict for state tracking
-                    course_dict = {
-                        'status': course.status,
-                        'crn': course.crn,
-                        'subject': course.subject,
-                        'course_num': course.course_num,
-                        'title': course.title,
-                        'campus': course.campus,
-                        'dates': course.dates,
-                        'instructor': course.instructor
-                    }
-
-                    courses.append(course_dict)
+                # Skip header rows
+                if "CRN" in row.text:
+                    continue
 
-                except Exception as e:
-                    print(f"Error processing row: {str(e)}")
+                # Get CRN (cell 3) and validate
+                crn = get_text_from_cell(row, 3)
+                if not crn or not crn.isdigit():
                     continue
 
-            # Print parsed courses to console
-            print("\nParsed Courses:")
-            print("=" * 80)
-            for course in courses:
-                print(f"\n{course['subject']} {course['course_num']}: {course['title']}")
-                print(f"CRN: {course['crn']}")
-                print(f"Status: {course['status']}")
-                print(f"Instructor: {course['instructor']}")
-                print(f"Campus: {course['campus']}")
-                print(f"Dates: {course['dates']}")
-                print("-" * 80)
-
-            # Convert list to dictionary with CRN as key for easier comparison
-            return {course['crn']: course for course in courses}
+                courses.append(Course.create(
+                    subject=get_text_from_cell(row, 4),
+                    course_num=get_text_from_cell(row, 5),
+                    title=get_text_from_cell(row, 6, get_link_text=True),
+                    crn=crn,
+                    status=determine_status(row),
+                    instructor=get_text_from_cell(row, 9),
+                    campus=get_text_from_cell(row, 7, get_link_text=True),
+                    dates=get_text_from_cell(row, 8, get_link_text=True)
+                ))
 
-        except Exception as e:
-            print(f"Error during parsing: {str(e)}")
-            return {}
+            except Exception as e:
+                logger.error(f"Error processing row: {str(e)}")
+                continue
+
+        if stats is not None:
+            stats.update(rows=len(rows), skipped=skipped, parsed=len(courses))
+        return courses
 
     def close(self):
-        """Close the browser"""
-        self.driver.quit()
\ No newline at end of file
+        """Close the browser, any pooled HTTP connections and the state store"""
+        if self.poller:
+            self.poller.close()
+            self.poller = None
+        if self.shard_pool:
+            self.shard_pool.close()
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+        self.state_store.close()
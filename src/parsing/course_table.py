@@ -0,0 +1,379 @@
+import hashlib
+import re
+import time
+from html.parser import HTMLParser
+from src.models.course import Course
+from src.utils.log_utils import get_logger
+
+logger = get_logger('parser')
+
+# Elements that never have a closing tag
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+# Elements whose content is never rendered as visible text
+HIDDEN_TAGS = {'script', 'style', 'head', 'title', 'noscript'}
+# Elements rendered on their own lines, so WebElement.text breaks the line around them
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'body', 'caption', 'center', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li',
+    'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'tbody', 'tfoot', 'thead', 'tr', 'ul'
+}
+CELL_TAGS = {'td', 'th'}
+# Markers used while collecting text: a <br> always ends the line, block edges only end a non-empty one
+LINE_BREAK = '\x01'
+BLOCK_BREAK = '\x00'
+
+ROW_CLASS = 'RegPageHeader'
+
+TABLE_TAG_PATTERN = re.compile(r'<(/?)(table|tr)\b([^>]*)>', re.IGNORECASE)
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class Element:
+    """Minimal DOM node built from the registration page source."""
+    __slots__ = ('tag', 'attrs', 'children', 'parent')
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+
+    def iter(self, tag=None):
+        """Yield this element and all descendant elements in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(reversed([c for c in node.children if isinstance(c, Element)]))
+
+    def find(self, tag):
+        """Return the first descendant element with the given tag, or None."""
+        for node in self.iter(tag):
+            if node is not self:
+                return node
+        return None
+
+    def cells(self):
+        """Return the direct <td> children of a row."""
+        return [c for c in self.children if isinstance(c, Element) and c.tag == 'td']
+
+    @property
+    def text(self):
+        """
+        Visible text of the element like WebElement.text: a line break at <br> and around block
+        elements, a space between table cells, and whitespace collapsed and stripped per line.
+        """
+        if all(isinstance(child, str) for child in self.children):
+            # Most cells hold plain text: nothing can break the line
+            return ' '.join(''.join(self.children).split()) if self.tag not in HIDDEN_TAGS else ''
+
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag == 'br':
+                parts.append(LINE_BREAK)
+            elif node.tag not in HIDDEN_TAGS:
+                if node.tag in BLOCK_TAGS:
+                    stack.append(BLOCK_BREAK)
+                stack.extend(reversed(node.children))
+                if node.tag in BLOCK_TAGS:
+                    stack.append(BLOCK_BREAK)
+                elif node.tag in CELL_TAGS:
+                    stack.append(' ')
+
+        lines = []
+        for hard_line in ''.join(parts).split(LINE_BREAK):
+            pieces = [' '.join(piece.split()) for piece in hard_line.split(BLOCK_BREAK)]
+            lines.extend([piece for piece in pieces if piece] or [''])
+        return '\n'.join(lines).strip('\n')
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds an Element tree, closing the cells and rows Banner leaves open."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {})
+        self.stack = [self.root]
+
+    def _close_until(self, tags, boundary):
+        # Pop the innermost open element in `tags` unless a boundary element comes first
+        for i in range(len(self.stack) - 1, 0, -1):
+            tag = self.stack[i].tag
+            if tag in boundary:
+                return
+            if tag in tags:
+                del self.stack[i:]
+                return
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('td', 'th'):
+            self._close_until({'td', 'th'}, {'tr', 'table'})
+        elif tag == 'tr':
+            self._close_until({'tr'}, {'table', 'tbody', 'thead', 'tfoot'})
+        elif tag in ('tbody', 'thead', 'tfoot'):
+            self._close_until({'tbody', 'thead', 'tfoot'}, {'table'})
+
+        parent = self.stack[-1]
+        element = Element(tag, {name: (value if value is not None else '') for name, value in attrs}, parent)
+        parent.children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        parent = self.stack[-1]
+        parent.children.append(Element(tag, {name: (value if value is not None else '') for name, value in attrs}, parent))
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+
+def build_tree(html):
+    """Parse an HTML string into an Element tree."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def get_text_from_cell(row, cell_index, get_link_text=False):
+    """Extract text from a cell, optionally getting link text (offline twin of browser_utils)."""
+    cells = row.cells()
+    if cell_index < 1 or cell_index > len(cells):
+        return ""
+    cell = cells[cell_index - 1]
+    if get_link_text:
+        link = cell.find('a')
+        return link.text if link is not None else ""
+    return cell.text
+
+
+def determine_status(row):
+    """Determine the status of a course (Registered, Full, or Available)."""
+    # Check for checkbox registration
+    checkbox = next((i for i in row.iter('input') if i.attrs.get('type') == 'checkbox'), None)
+    if checkbox is not None:
+        checkbox_value = checkbox.attrs.get('value')
+        if checkbox_value and "Registered" in checkbox_value:
+            return "Registered"
+        if 'checked' in checkbox.attrs:
+            return "Registered"
+
+    # Check status cell
+    raw_status = get_text_from_cell(row, 2, get_link_text=True)
+    if "Registered" in raw_status:
+        return "Registered"
+    elif "Full" in raw_status:
+        return "Full"
+    return "Available"
+
+
+def is_watched(row, watchlist):
+    """Check a row against the watchlist using as few cells as possible."""
+    crn = get_text_from_cell(row, 3)
+    if watchlist.crn_only:
+        return watchlist.matches(crn)
+    return watchlist.matches(crn, get_text_from_cell(row, 4), get_text_from_cell(row, 5))
+
+
+def split_row_chunks(html):
+    """
+    Split the page's course tables into one chunk per course row.
+
+    A chunk runs from a RegPageHeader <tr> to the next one in the same table, or to the end of that
+    table, so tables nested inside a row stay in that row's chunk and later tables are still split.
+    """
+    chunks = []
+    row_start = row_depth = None
+    depth = 0
+    for match in TABLE_TAG_PATTERN.finditer(html):
+        closing, tag = match.group(1), match.group(2).lower()
+        if tag == 'table':
+            if not closing:
+                depth += 1
+                continue
+            if row_start is not None and depth <= row_depth:
+                # The table holding the open row ends here
+                chunks.append(html[row_start:match.start()])
+                row_start = None
+            depth = max(0, depth - 1)
+        elif not closing and ROW_CLASS in match.group(3):
+            if row_start is None:
+                row_start, row_depth = match.start(), depth
+            elif depth <= row_depth:
+                chunks.append(html[row_start:match.start()])
+                row_start, row_depth = match.start(), depth
+    if row_start is not None:
+        chunks.append(html[row_start:])
+    return chunks
+
+
+def iter_rows(html, watchlist=None, stats=None):
+    """
+    Yield candidate course rows as Elements.
+
+    For a CRN-only watchlist the raw markup is split into course rows and only chunks that mention a
+    watched CRN are handed to the HTML parser, so unwatched rows are never tokenized.
+    """
+    if not (watchlist and watchlist.crn_only):
+        yield from build_tree(html).iter('tr')
+        return
+
+    skipped = 0
+    for chunk in split_row_chunks(html):
+        if not any(crn in chunk for crn in watchlist.crns):
+            if ROW_CLASS in chunk:
+                skipped += 1
+            continue
+        yield from build_tree(chunk).iter('tr')
+
+    if stats is not None:
+        stats['rows'] = stats.get('rows', 0) + skipped
+        stats['skipped'] = stats.get('skipped', 0) + skipped
+
+
+def parse_course_rows(html, watchlist=None, stats=None):
+    """
+    Parse course rows of a registration page snapshot into Course objects.
+
+    With a non-empty `watchlist`, unwatched rows are dropped before any other field is extracted.
+    `stats`, if given, is a dict whose 'rows', 'skipped' and 'parsed' counters are incremented.
+    """
+    courses = []
+    rows = skipped = 0
+    for row in iter_rows(html, watchlist, stats):
+        if ROW_CLASS not in row.attrs.get('class', ''):
+            continue
+        rows += 1
+        try:
+            if watchlist and not is_watched(row, watchlist):
+                skipped += 1
+                continue
+
+            # Skip header rows
+            if "CRN" in row.text:
+                continue
+
+            # Get CRN (cell 3) and validate
+            crn = get_text_from_cell(row, 3)
+            if not crn or not crn.isdigit():
+                continue
+
+            courses.append(Course.create(
+                subject=get_text_from_cell(row, 4),
+                course_num=get_text_from_cell(row, 5),
+                title=get_text_from_cell(row, 6, get_link_text=True),
+                crn=crn,
+                status=determine_status(row),
+                instructor=get_text_from_cell(row, 9),
+                campus=get_text_from_cell(row, 7, get_link_text=True),
+                dates=get_text_from_cell(row, 8, get_link_text=True)
+            ))
+        except Exception as e:
+            logger.warning(f"Error processing row: {str(e)}")
+            continue
+
+    if stats is not None:
+        stats['rows'] = stats.get('rows', 0) + rows
+        stats['skipped'] = stats.get('skipped', 0) + skipped
+        stats['parsed'] = stats.get('parsed', 0) + len(courses)
+    return courses
+
+
+def decode_page(data):
+    """Decode raw page bytes using the charset declared in the page, falling back to latin-1."""
+    if isinstance(data, str):
+        return data
+    match = CHARSET_PATTERN.search(data[:2048])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return data.decode(encoding)
+    except (LookupError, UnicodeDecodeError):
+        return data.decode('latin-1')
+
+
+def parse_registration_page(data, watchlist=None, stats=None):
+    """Parse raw Banner registration page HTML (bytes or str) into Course records."""
+    return parse_course_rows(decode_page(data), watchlist, stats)
+
+
+class IncrementalPageParser:
+    """
+    Skips work on pages that have not changed since the previous poll.
+
+    The course table is fingerprinted as a whole and row by row. An identical table returns None
+    so the caller can skip diffing and saving; otherwise only rows whose markup changed are parsed
+    again and the rest are reused from the previous poll.
+    """
+
+    def __init__(self, watchlist=None):
+        self.watchlist = watchlist
+        self.page_digest = None
+        self.row_cache = {}  # row digest -> (Course records parsed from that row, its row stats)
+        self.full_parse_time = 0.0
+        self.stats = {'polls': 0, 'page_hits': 0, 'row_hits': 0, 'row_misses': 0, 'time_saved': 0.0}
+        self.last_time_saved = 0.0
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def parse(self, data, stats=None):
+        """Return the page's Course records, or None when the course table is unchanged."""
+        started = time.perf_counter()
+        html = decode_page(data)
+        chunks = split_row_chunks(html)
+        self.stats['polls'] += 1
+
+        page_digest = self._digest(''.join(chunks))
+        if page_digest == self.page_digest:
+            self.stats['page_hits'] += 1
+            self.last_time_saved = self.full_parse_time
+            self.stats['time_saved'] += self.last_time_saved
+            return None
+
+        courses, row_cache, hits = [], {}, 0
+        for chunk in chunks:
+            digest = self._digest(chunk)
+            cached = self.row_cache.get(digest)
+            if cached is None:
+                chunk_stats = {}
+                cached = (parse_course_rows(chunk, self.watchlist, chunk_stats), chunk_stats)
+            else:
+                hits += 1
+            if stats is not None:
+                # Reused rows count as if they had been parsed again
+                for key, value in cached[1].items():
+                    stats[key] = stats.get(key, 0) + value
+            row_cache[digest] = cached
+            courses.extend(cached[0])
+
+        elapsed = time.perf_counter() - started
+        if hits == 0:
+            self.full_parse_time = elapsed
+        self.last_time_saved = max(0.0, self.full_parse_time - elapsed) if hits else 0.0
+        self.stats['row_hits'] += hits
+        self.stats['row_misses'] += len(chunks) - hits
+        self.stats['time_saved'] += self.last_time_saved
+
+        # A page without course rows (an error or login page) must not count as unchanged next time
+        self.page_digest = page_digest if courses else None
+        self.row_cache = row_cache
+        return courses
+
+    def hit_rate(self):
+        """Fraction of polls whose course table was identical to the previous poll."""
+        return self.stats['page_hits'] / self.stats['polls'] if self.stats['polls'] else 0.0
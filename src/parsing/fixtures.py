@@ -0,0 +1,99 @@
+import random
+
+SUBJECTS = ['COMP', 'MATH', 'COMM', 'ELEC', 'NURS', 'BUSN', 'MECH', 'PHYS']
+CAMPUSES = ['Fennell Campus', 'Online', 'Stoney Creek Campus', 'IAHS Campus']
+DATES = ['Jan 06-Apr 20', 'Jan 06-Feb 28', 'Mar 03-Apr 20', 'May 05-Aug 15']
+INSTRUCTORS = ['J. Smith', 'A. Patel', 'M. Nguyen', 'TBA', 'R. Brown']
+
+HEADER_ROW = (
+    '<tr class="RegPageHeader"><td>Select</td><td>Status</td><td>CRN</td><td>Subj</td>'
+    '<td>Crse</td><td>Title</td><td>Campus</td><td>Dates</td><td>Instructor</td></tr>\n'
+)
+
+
+def build_course_row(crn, status, subject, course_num, title, campus, dates, instructor, css_class='RegPageHeaderWhite'):
+    """Render one Banner course row the way wwskregs.P_WebRegs lays it out."""
+    if status == 'Registered':
+        select_cell = f'<input type="checkbox" name="sel_crn" value="{crn} Registered" checked>'
+        status_cell = '<a href="#">Registered</a>'
+    elif status == 'Full':
+        select_cell = ''
+        status_cell = '<a href="#">Full</a>'
+    else:
+        select_cell = f'<input type="checkbox" name="sel_crn" value="{crn}">'
+        status_cell = '<a href="#">Available</a>'
+    return (
+        f'<tr class="{css_class}"><td>{select_cell}</td><td>{status_cell}</td><td>{crn}</td>'
+        f'<td>{subject}</td><td>{course_num}</td><td><a href="#">{title}</a></td>'
+        f'<td><a href="#">{campus}</a></td><td><a href="#">{dates}</a></td><td>{instructor}</td></tr>\n'
+    )
+
+
+def build_registration_rows(row_count, seed=0, statuses=None):
+    """
+    Return the field values of `row_count` synthetic course rows, as build_course_row keywords.
+
+    `statuses` optionally maps CRN to a forced status so consecutive pages can model changes.
+    """
+    rng = random.Random(seed)
+    statuses = statuses or {}
+    rows = []
+    for i in range(row_count):
+        crn = str(20000 + i)
+        rows.append(dict(
+            crn=crn,
+            status=statuses.get(crn) or rng.choice(['Available', 'Full', 'Full', 'Registered']),
+            subject=SUBJECTS[i % len(SUBJECTS)],
+            course_num=str(10000 + (i * 7) % 900),
+            title=f'Course Title {i % 300}',
+            campus=rng.choice(CAMPUSES),
+            dates=rng.choice(DATES),
+            instructor=rng.choice(INSTRUCTORS)
+        ))
+    return rows
+
+
+def build_registration_page(row_count, seed=0, header_every=25, statuses=None):
+    """
+    Build a synthetic registration page with `row_count` course rows.
+
+    A header row is repeated every `header_every` courses, as Banner does per subject block.
+    `statuses` optionally maps CRN to a forced status so consecutive pages can model changes.
+    """
+    parts = [
+        '<html><head><meta charset="utf-8"><title>Registration</title></head><body>\n',
+        '<table class="datadisplaytable">\n'
+    ]
+    for i, row in enumerate(build_registration_rows(row_count, seed, statuses)):
+        if header_every and i % header_every == 0:
+            parts.append(HEADER_ROW)
+        parts.append(build_course_row(**row, css_class='RegPageHeaderWhite' if i % 2 else 'RegPageHeader'))
+    parts.append('</table></body></html>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+# Standard corpus sizes used when profiling the parser
+FIXTURE_SIZES = (10, 500, 10000)
+
+
+def build_fixture_corpus(sizes=FIXTURE_SIZES, seed=0):
+    """Return {row_count: page_bytes} for each synthetic fixture size."""
+    return {size: build_registration_page(size, seed=seed) for size in sizes}
+
+
+def build_page_sequence(poll_count, row_count=500, flips_per_poll=3, seed=0):
+    """
+    Yield (page_bytes, changed_crns) for `poll_count` consecutive polls of one registration page.
+
+    Every poll flips up to `flips_per_poll` random sections between Full and Available; polls where
+    nothing flips repeat the previous page byte for byte, like a quiet stretch on the real portal.
+    """
+    rng = random.Random(seed)
+    statuses = {}
+    for _ in range(poll_count):
+        changed = set()
+        for _ in range(rng.randint(0, flips_per_poll)):
+            crn = str(20000 + rng.randrange(row_count))
+            statuses[crn] = 'Full' if statuses.get(crn) == 'Available' else 'Available'
+            changed.add(crn)
+        yield build_registration_page(row_count, seed=seed, statuses=statuses), changed
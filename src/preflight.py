@@ -0,0 +1,120 @@
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+from src.models.watchlist import Watchlist
+from src.utils.config_utils import load_accounts, DEFAULT_ACCOUNTS_FILE
+from src.utils.polling_utils import parse_windows
+from src.utils.session_store import SessionStore
+
+SUBJECT_PATTERN = re.compile(r'^[A-Z]{2,5}$')
+COURSE_PATTERN = re.compile(r'^[A-Z]{2,5} \d{4,5}$')
+CRN_PATTERN = re.compile(r'^\d{5}$')
+
+
+def check_watchlist(label, watchlist):
+    """Flag entries that do not look like a CRN, a subject or a course code."""
+    problems = (
+        [crn for crn in watchlist.crns if not CRN_PATTERN.match(crn)] +
+        [subject for subject in watchlist.subjects if not SUBJECT_PATTERN.match(subject)] +
+        [course for course in watchlist.courses if not COURSE_PATTERN.match(course)]
+    )
+    if problems:
+        return False, f"{label}: unrecognised watchlist entries {sorted(problems)}"
+    if not watchlist:
+        return True, f"{label}: no watchlist, every section is monitored"
+    return True, (f"{label}: watching {len(watchlist.crns)} CRNs, {len(watchlist.courses)} courses, "
+                  f"{len(watchlist.subjects)} subjects")
+
+
+def check_state(label, state_db, json_file=None):
+    """Report what the state store holds, opening it read-only so nothing is created or migrated."""
+    if not os.path.exists(state_db):
+        if json_file and os.path.exists(json_file):
+            return True, f"{label}: {json_file} will be migrated to {state_db} on first start"
+        return True, f"{label}: no saved state yet, the first poll will only record a baseline"
+    try:
+        conn = sqlite3.connect(f"file:{state_db}?mode=ro", uri=True)
+        try:
+            courses, updated_at = conn.execute("SELECT COUNT(*), MAX(updated_at) FROM courses").fetchone()
+            transitions = conn.execute("SELECT COUNT(*) FROM status_history").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"{label}: cannot read {state_db}: {e}"
+    age = f", last updated {(time.time() - updated_at) / 3600:.1f} h ago" if updated_at else ""
+    return True, f"{label}: {courses} courses and {transitions} status transitions in {state_db}{age}"
+
+
+def check_session(label, session_file):
+    remaining = SessionStore(session_file).remaining()
+    if remaining is None:
+        return True, f"{label}: no saved session, a browser login with 2FA will be needed"
+    if remaining <= 0:
+        return True, f"{label}: saved session has expired, a browser login with 2FA will be needed"
+    return True, f"{label}: saved session valid for another {remaining / 60:.0f} minutes, no browser needed"
+
+
+def run_checks(accounts_file=None, state_dir="."):
+    """
+    Validate configuration, watchlists and saved state without launching a browser or sending
+    anything. Returns a list of (ok, message).
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+    accounts_file = accounts_file or os.environ.get('ACCOUNTS_FILE', DEFAULT_ACCOUNTS_FILE)
+    results = []
+
+    try:
+        parse_windows(os.environ.get('POLL_WINDOWS'))
+        results.append((True, "POLL_WINDOWS parsed"))
+    except ValueError as e:
+        results.append((False, f"POLL_WINDOWS is invalid: {e}"))
+
+    if os.path.exists(accounts_file):
+        try:
+            config = load_accounts(accounts_file)
+        except (OSError, ValueError, KeyError) as e:
+            return results + [(False, f"{accounts_file}: {e}")]
+        results.append((True, f"{accounts_file}: {len(config['targets'])} targets, pool size {config['pool_size']}"))
+        for target in config['targets']:
+            results.append(check_watchlist(target.key, Watchlist(target.watchlist)))
+            results.append(check_state(target.key, os.path.join(state_dir, f"course_states_{target.key}.db"),
+                                       os.path.join(state_dir, f"course_states_{target.key}.json")))
+            results.append(check_session(target.key, os.path.join(state_dir, f"session_cache_{target.key}.json")))
+        return results
+
+    for variable in ('MOHAWK_EMAIL', 'MOHAWK_PASSWORD', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID'):
+        results.append((bool(os.environ.get(variable)), f"{variable} {'is set' if os.environ.get(variable) else 'is missing'}"))
+    results.append(check_watchlist("WATCHLIST", Watchlist.from_env()))
+    results.append(check_state("state", "course_states.db", "course_states.json"))
+    results.append(check_session("session", "session_cache.json"))
+    return results
+
+
+def measure_startup(runs=5):
+    """
+    Time cold imports of the entry point and a full `main.py --check` in fresh interpreters.
+    Returns {name: best wall-clock seconds}.
+    """
+    commands = {
+        'import src.monitor': [sys.executable, '-c', 'import src.monitor'],
+        'import main': [sys.executable, '-c', 'import main'],
+        'main.py --check': [sys.executable, 'main.py', '--check']
+    }
+    results = {}
+    for name, command in commands.items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+        results[name] = min(timings)
+    return results
+
+
+if __name__ == "__main__":
+    for name, seconds in measure_startup().items():
+        print(f"{name:>20}: {seconds * 1000:6.0f} ms")
@@ -0,0 +1,196 @@
+import argparse
+import os
+import resource
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.parsing.fixtures import build_page_sequence
+from src.utils.alert_utils import AlertGate, simulate
+from src.utils.http_utils import HttpPoller
+from src.utils.log_utils import configure_logging
+
+
+def load_recorded_pages(directory):
+    """Return the pages saved by RecordingPoller (RECORD_PAGES_DIR), in the order they were fetched."""
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.html'))
+    pages = []
+    for name in names:
+        with open(os.path.join(directory, name), 'rb') as f:
+            pages.append((f.read(), set()))
+    return pages
+
+
+class ReplayPoller:
+    """Serves a recorded page sequence through the HttpPoller interface, one page per fetch."""
+
+    def __init__(self, pages):
+        self.pages = iter(pages)
+        self.introduced = {}  # CRN -> time the page that changed it was served
+
+    def fetch(self):
+        page, changed = next(self.pages)
+        served_at = time.perf_counter()
+        for crn in changed:
+            self.introduced[crn] = served_at
+        return page
+
+    def close(self):
+        pass
+
+
+class StandInServer:
+    """Local HTTP stand-in for the portal that returns the next recorded page on every request."""
+
+    def __init__(self, replay, host='127.0.0.1'):
+        self.replay = replay
+        lock = threading.Lock()
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            def serve_next(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                with lock:
+                    page = replay.fetch()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+
+            do_GET = do_POST = serve_next
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, 0), ReplayHandler)
+        self.url = f"http://{host}:{self.server.server_port}/wwskregs.P_WebRegs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeNotifier:
+    """Collects alerts in memory instead of sending them to Telegram, optionally through a gate."""
+
+    def __init__(self, replay, gate=None):
+        self.replay = replay
+        self.gate = gate
+        self.messages = []
+        self.latencies = []
+
+    def send_message(self, message):
+        self.messages.append(message)
+
+    def alert_changes(self, changes):
+        if self.gate is not None:
+            changes = self.gate.process(changes)
+        if not changes:
+            return
+        alerted_at = time.perf_counter()
+        for change in changes:
+            served_at = self.replay.introduced.pop(change.crn, None)
+            if served_at is not None:
+                self.latencies.append(alerted_at - served_at)
+        self.send_message(f"{len(changes)} changes")
+
+    def flush(self, timeout=30):
+        return True
+
+    def close(self, timeout=30):
+        pass
+
+
+def rss_bytes():
+    """Current resident set size of this process (Linux /proc, else peak RSS)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_replay(pages, poll_count, http=False, watchlist=None, gate=None):
+    """
+    Run RegistrationMonitor.monitor_courses with interval=0 over `pages` and return throughput,
+    time-to-alert and memory figures.
+    """
+    replay = ReplayPoller(pages)
+    server = StandInServer(replay) if http else None
+    poller = HttpPoller(server.url) if http else replay
+    notifier = FakeNotifier(replay, gate)
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        monitor = RegistrationMonitor(
+            json_file=None,
+            state_db=os.path.join(state_dir, "course_states.db"),
+            session_file=os.path.join(state_dir, "session_cache.json"),
+            notifier=notifier,
+            name="replay",
+            watchlist=watchlist or Watchlist(),
+            poller=poller
+        )
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        try:
+            monitor.monitor_courses(interval=0, max_polls=poll_count)
+        finally:
+            elapsed = time.perf_counter() - started
+            if server:
+                server.close()
+
+    latencies = sorted(notifier.latencies)
+    return {
+        'polls': poll_count,
+        'seconds': elapsed,
+        'polls_per_second': poll_count / elapsed if elapsed else 0.0,
+        'alerts': len(notifier.messages) - 1,  # Minus the startup message
+        'alerted_sections': len(latencies),
+        'median_time_to_alert_ms': statistics.median(latencies) * 1000 if latencies else None,
+        'p95_time_to_alert_ms': latencies[int(len(latencies) * 0.95)] * 1000 if latencies else None,
+        'rss_before_mb': rss_before / 2 ** 20,
+        'rss_after_mb': rss_bytes() / 2 ** 20,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay registration pages through the monitor pipeline.")
+    parser.add_argument('--polls', type=int, default=2000, help="number of polls to replay")
+    parser.add_argument('--rows', type=int, default=500, help="course rows per synthetic page")
+    parser.add_argument('--flips', type=int, default=3, help="max sections that change per synthetic poll")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pages', help="directory of pages saved by RecordingPoller instead of synthetic ones")
+    parser.add_argument('--http', action='store_true', help="serve pages from a local HTTP stand-in")
+    parser.add_argument('--watchlist', help="WATCHLIST-style filter, e.g. '20001,COMP 10279'")
+    parser.add_argument('--gate', action='store_true', help="pass alerts through an AlertGate (ALERT_* settings)")
+    parser.add_argument('--flapping', type=int, metavar='SECTIONS',
+                        help="instead, replay SECTIONS seats flapping Full/Available every poll through the gate")
+    args = parser.parse_args()
+
+    configure_logging(os.environ.get('LOG_LEVEL', 'WARNING'))
+    if args.flapping:
+        sequence = {str(20000 + i): ['Full', 'Available'] * (args.polls // 2) for i in range(args.flapping)}
+        print(simulate(sequence, AlertGate.from_env()))
+        return
+    if args.pages:
+        pages = load_recorded_pages(args.pages)
+        args.polls = len(pages)
+    else:
+        pages = build_page_sequence(args.polls, args.rows, args.flips, args.seed)
+    watchlist = Watchlist.from_string(args.watchlist) if args.watchlist else None
+
+    gate = AlertGate.from_env() if args.gate else None
+    result = run_replay(pages, args.polls, http=args.http, watchlist=watchlist, gate=gate)
+    for key, value in result.items():
+        print(f"{key:>26}: {value:.2f}" if isinstance(value, float) else f"{key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.utils.config_utils import load_accounts, DEFAULT_ACCOUNTS_FILE
+from src.utils.log_utils import get_logger
+from src.utils.telegram_utils import TelegramNotifier
+
+logger = get_logger('scheduler')
+
+
+class MonitorScheduler:
+    """Multiplexes many account × term targets over a bounded pool of workers."""
+
+    def __init__(self, targets, pool_size=1, interval=600, state_dir="."):
+        self.targets = targets
+        self.pool_size = max(1, pool_size)
+        self.interval = interval
+        self.state_dir = state_dir
+        self.monitors = {}
+        self.notifiers = {}  # Kept across monitor restarts so queued alerts are not lost
+
+        # Only one 2FA prompt at a time, the code is typed in by a human; every monitor's logins take it
+        self.login_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, path=DEFAULT_ACCOUNTS_FILE, state_dir="."):
+        """Create a scheduler from an accounts configuration file."""
+        config = load_accounts(path)
+        return cls(config['targets'], pool_size=config['pool_size'],
+                   interval=config['interval'], state_dir=state_dir)
+
+    def create_monitor(self, target):
+        """Build a monitor with per-target state and session files and its own notifier."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        return RegistrationMonitor(
+            release_browser=True,  # Chrome only lives while a worker is logging in
+            email=target.email,
+            password=target.password,
+            term=target.term,
+            json_file=os.path.join(self.state_dir, f"course_states_{target.key}.json"),
+            state_db=os.path.join(self.state_dir, f"course_states_{target.key}.db"),
+            session_file=os.path.join(self.state_dir, f"session_cache_{target.key}.json"),
+            notifier=self.get_notifier(target),
+            name=target.key,
+            watchlist=Watchlist(target.watchlist),
+            login_lock=self.login_lock
+        )
+
+    def get_notifier(self, target):
+        """Return the target's notifier, creating its delivery worker on first use."""
+        if target.key not in self.notifiers:
+            self.notifiers[target.key] = TelegramNotifier(
+                target.telegram_token, target.telegram_chat_id,
+                outbox_file=os.path.join(self.state_dir, f"telegram_outbox_{target.key}.db"), scope=target.key
+            )
+        return self.notifiers[target.key]
+
+    def run_target(self, target):
+        """Poll a single target once on a worker thread."""
+        monitor = self.monitors.get(target.key)
+        try:
+            if monitor is None:
+                monitor = self.create_monitor(target)
+                self.monitors[target.key] = monitor
+            if not monitor.is_initialized:
+                monitor.initialize()  # Takes the shared login_lock, as do re-logins after a session expires
+            monitor.poll_once()
+        except Exception as e:
+            logger.error(f"[{target.key}] Error while polling: {str(e)}")
+            if monitor:
+                monitor.notifier.send_message(f"⚠️ Error in course monitor ({target.key}): {str(e)}")
+                monitor.close()
+            self.monitors.pop(target.key, None)
+
+    def run(self):
+        """Schedule every target at the configured interval until interrupted."""
+        if not self.targets:
+            logger.info("No monitoring targets configured.")
+            return
+        logger.info(f"Monitoring {len(self.targets)} targets with {self.pool_size} workers...")
+        next_due = {target.key: 0 for target in self.targets}
+        running = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                while True:
+                    now = time.time()
+                    for target in self.targets:
+                        if target.key not in running and next_due[target.key] <= now:
+                            running[target.key] = executor.submit(self.run_target, target)
+
+                    idle = [next_due[key] for key in next_due if key not in running]
+                    timeout = max(0, min(idle) - time.time()) if idle else None
+                    if not running:
+                        time.sleep(timeout)
+                        continue
+                    done, _ = wait(list(running.values()), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                    for key, future in list(running.items()):
+                        if future in done:
+                            del running[key]
+                            next_due[key] = time.time() + self.interval
+        finally:
+            self.close()
+
+    def close(self):
+        """Close every monitor's browser and HTTP sessions."""
+        for monitor in self.monitors.values():
+            monitor.close()
+        self.monitors.clear()
+        for notifier in self.notifiers.values():
+            notifier.close(timeout=5)
@@ -0,0 +1,222 @@
+import argparse
+import os
+import threading
+import time
+from typing import NamedTuple
+from src.models.course import Course
+from src.parsing.course_table import IncrementalPageParser, decode_page, parse_course_rows, split_row_chunks
+from src.parsing.fixtures import build_registration_page
+from src.utils.http_utils import HttpPoller
+
+# Banner's subject search field on the term form
+DEFAULT_SUBJECT_PARAM = 'sel_subj'
+
+
+class ShardSpec(NamedTuple):
+    """Everything a worker process needs to fetch and parse one subject search on its own."""
+    name: str
+    url: str
+    method: str
+    form_data: list
+    cookies: list
+    user_agent: str
+    watchlist: object
+    session_id: int
+
+
+# Per-process pollers, so every worker keeps its own pooled session per shard
+_worker_pollers = {}
+
+
+def fetch_shard(spec, known_digest=None):
+    """
+    Fetch and parse one shard in a worker process.
+
+    Returns (name, digest, courses, stats, parse_seconds); courses is None when the shard's course
+    table still matches `known_digest`.
+    """
+    key = (spec.name, spec.session_id)
+    poller = _worker_pollers.get(key)
+    if poller is None:
+        for stale in [k for k in _worker_pollers if k[0] == spec.name]:
+            _worker_pollers.pop(stale).close()
+        poller = HttpPoller(spec.url, method=spec.method, form_data=spec.form_data,
+                           cookies=spec.cookies, user_agent=spec.user_agent)
+        _worker_pollers[key] = poller
+
+    page = poller.fetch()
+    started = time.perf_counter()
+    table = ''.join(split_row_chunks(decode_page(page)))
+    digest = IncrementalPageParser._digest(table)
+    if digest == known_digest:
+        return spec.name, digest, None, {}, time.perf_counter() - started
+
+    stats = {}
+    courses = parse_course_rows(table, spec.watchlist, stats)
+    return spec.name, digest, courses, stats, time.perf_counter() - started
+
+
+class ShardPool:
+    """
+    Splits one term's results page into per-subject searches fetched by a ProcessPoolExecutor.
+
+    Each worker parses its shard with its own HTTP session; the coordinator merges the shard
+    snapshots into a single CRN -> Course view so diffing and alerts stay one stream.
+    """
+
+    def __init__(self, subjects, workers=None, subject_param=DEFAULT_SUBJECT_PARAM, watchlist=None):
+        self.subjects = list(subjects)
+        self.workers = workers or min(len(self.subjects), os.cpu_count() or 1)
+        self.subject_param = subject_param
+        self.watchlist = watchlist
+        from concurrent.futures import ProcessPoolExecutor
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.poller = None  # Session the shard specs were built from
+        self.session_id = 0
+        self.specs = []
+        self.digests = {}  # shard -> digest of its last parsed course table
+        self.snapshots = {}  # shard -> Course records from its last changed page
+        self.parse_seconds = []  # Worker parse time of each shard in the last poll
+
+    def bind(self, poller):
+        """Derive one search per subject from the logged-in poller's request and cookies."""
+        self.poller = poller
+        self.session_id += 1
+        base_form = [pair for pair in poller.form_data if pair[0] != self.subject_param]
+        self.specs = [
+            ShardSpec(subject, poller.url, poller.method, base_form + [[self.subject_param, subject]],
+                      poller.export_cookies(), poller.user_agent, self.watchlist, self.session_id)
+            for subject in self.subjects
+        ]
+
+    def fetch_all(self, stats=None):
+        """
+        Fetch every shard in parallel. Returns the merged Course records, or None when no shard
+        changed. A failing shard fails the whole poll, so the merged view is never half updated.
+        """
+        futures = [self.executor.submit(fetch_shard, spec, self.digests.get(spec.name)) for spec in self.specs]
+        results = [future.result() for future in futures]
+
+        # A login or error page has no course rows at all; keep that shard's last snapshot and digest
+        # instead of reporting every section in it as removed
+        empty = [name for name, _, courses, shard_stats, _ in results if courses == [] and not shard_stats.get('rows')]
+        if empty:
+            raise Exception(f"No course rows in shard(s) {', '.join(empty)}, keeping their previous snapshot")
+
+        changed = False
+        self.parse_seconds = []
+        for name, digest, courses, shard_stats, parse_seconds in results:
+            self.parse_seconds.append(parse_seconds)
+            if stats is not None:
+                for key, value in shard_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+            if courses is not None:
+                # Pickling drops interning; restore it so snapshots share strings again
+                self.snapshots[name] = [Course.create(*course) for course in courses]
+                self.digests[name] = digest
+                changed = True
+
+        if not changed:
+            return None
+        return [course for name in self.subjects for course in self.snapshots.get(name, ())]
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class SubjectStandInServer:
+    """
+    Local stand-in that answers each subject search with its own synthetic page after `latency`.
+
+    Pages alternate between two pre-built variants per subject, so every request has to be parsed
+    while the server itself spends no CPU building them.
+    """
+
+    def __init__(self, subjects, rows_per_subject=1000, latency=0.05, host='127.0.0.1'):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        pages = {
+            subject: [build_registration_page(rows_per_subject, seed=index * 2 + variant) for variant in (0, 1)]
+            for index, subject in enumerate(subjects)
+        }
+        counter = {'requests': 0}
+        lock = threading.Lock()
+
+        class SubjectHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode())
+                self.serve(form)
+
+            def do_GET(self):
+                self.serve(parse_qs(urlparse(self.path).query))
+
+            def serve(self, form):
+                subject = form.get(DEFAULT_SUBJECT_PARAM, [None])[0]
+                if subject not in pages:
+                    self.send_error(404)
+                    return
+                with lock:
+                    counter['requests'] += 1
+                    variant = counter['requests'] % 2
+                time.sleep(latency)
+                page = pages[subject][variant]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(page)))
+                self.end_headers()
+                self.wfile.write(page)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, 0), SubjectHandler)
+        self.url = f"http://{host}:{self.server.server_port}/wwskregs.P_WebRegs"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def benchmark(worker_counts, shard_count=8, rows_per_subject=1000, latency=0.05, polls=5):
+    """Return {workers: shards fetched and parsed per second} against the local stand-in."""
+    subjects = [f"SUBJ{i}" for i in range(shard_count)]
+    server = SubjectStandInServer(subjects, rows_per_subject, latency)
+    results = {}
+    try:
+        poller = HttpPoller(server.url, method='POST', form_data=[['term_in', '559']])
+        for workers in worker_counts:
+            pool = ShardPool(subjects, workers=workers)
+            pool.bind(poller)
+            pool.fetch_all()  # Warm up worker processes and their sessions
+            started = time.perf_counter()
+            for _ in range(polls):
+                pool.fetch_all()
+            results[workers] = shard_count * polls / (time.perf_counter() - started)
+            pool.close()
+    finally:
+        server.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure sharded fetch+parse throughput against a local stand-in.")
+    parser.add_argument('--workers', default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument('--shards', type=int, default=8, help="subject searches per poll")
+    parser.add_argument('--rows', type=int, default=1000, help="course rows per subject page")
+    parser.add_argument('--latency', type=float, default=0.05, help="stand-in server time per request (s)")
+    parser.add_argument('--polls', type=int, default=5)
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(',')]
+    results = benchmark(worker_counts, args.shards, args.rows, args.latency, args.polls)
+    baseline = results[worker_counts[0]]
+    print(f"{os.cpu_count()} CPUs, {args.shards} shards x {args.rows} rows, {args.latency * 1000:.0f} ms server latency")
+    for workers, rate in results.items():
+        print(f"{workers:>3} workers: {rate:7.1f} shards/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
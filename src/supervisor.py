@@ -0,0 +1,187 @@
+import os
+import threading
+import time
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from src.utils.browser_utils import kill_driver_processes
+from src.utils.log_utils import get_logger
+from src.utils.metrics import METRICS
+from src.utils.recovery_utils import Backoff, CircuitBreaker, Watchdog
+
+logger = get_logger('supervisor')
+
+
+class MonitorSupervisor:
+    """
+    Keeps a single RegistrationMonitor polling forever.
+
+    Failed polls are retried with jittered exponential backoff, and a circuit breaker pauses
+    polling after repeated failures. A watchdog kills a hung chromedriver so only the browser is
+    restarted. The monitor's parsed state and the notifier stay warm across recoveries.
+    """
+
+    def __init__(self, monitor_factory, notifier, interval=600, backoff=None, breaker=None, hang_timeout=300):
+        self.monitor_factory = monitor_factory
+        self.notifier = notifier
+        self.interval = interval
+        self.backoff = backoff or Backoff()
+        self.breaker = breaker or CircuitBreaker()
+        self.watchdog = Watchdog(hang_timeout, self.on_hang)
+        self.monitor = None
+        self.stop_event = threading.Event()
+
+        self.failures = 0
+        self.failing_since = None
+        self.browser_suspect = False  # Restart Chrome before the next attempt
+        self.recoveries = []  # Seconds from first failure to the next successful poll
+
+    @classmethod
+    def from_env(cls, monitor_factory, notifier, interval=600):
+        """Build a supervisor tuned by BACKOFF_BASE/CAP, CIRCUIT_FAILURES/RESET and WATCHDOG_TIMEOUT."""
+        env = os.environ
+        return cls(
+            monitor_factory, notifier, interval=interval,
+            backoff=Backoff(int(env.get('BACKOFF_BASE', 5)), int(env.get('BACKOFF_CAP', 600))),
+            breaker=CircuitBreaker(int(env.get('CIRCUIT_FAILURES', 5)), int(env.get('CIRCUIT_RESET', 900))),
+            hang_timeout=int(env.get('WATCHDOG_TIMEOUT', 300))
+        )
+
+    def on_hang(self):
+        """Watchdog callback: kill the stuck browser so the blocked WebDriver call fails fast."""
+        logger.warning(f"Poll has been running for {self.watchdog.busy_for():.0f}s, killing the browser...")
+        METRICS.timeouts.inc(stage='watchdog')
+        if self.monitor and self.monitor.driver is not None:
+            self.browser_suspect = True
+            kill_driver_processes(self.monitor.driver)
+
+    def ensure_ready(self):
+        """Create, log in or repair the monitor as needed before the next poll."""
+        if self.monitor is None:
+            self.monitor = self.monitor_factory()
+            self.monitor.watchdog = self.watchdog
+        if self.browser_suspect:
+            logger.info("Restarting the browser worker, keeping parsed state and the notifier...")
+            METRICS.restarts.inc(action='browser')
+            self.browser_suspect = False
+            self.monitor.restart_browser()
+        elif not self.monitor.is_initialized:
+            self.monitor.initialize()
+
+    def poll(self):
+        """Run one watched poll and return the delay before the next one."""
+        self.watchdog.start()
+        try:
+            changes = self.monitor.poll_once()
+        finally:
+            self.watchdog.finish()
+        if self.watchdog.fired:
+            raise TimeoutException(f"Poll hung for more than {self.watchdog.timeout}s")
+        if self.monitor.last_poll_error:
+            raise self.monitor.last_poll_error
+
+        policy = self.monitor.polling_policy
+        if policy:
+            policy.record_changes(changes)
+            return policy.next_interval()
+        return self.interval
+
+    def run_pipeline(self):
+        """Run the asyncio pipeline until it ends; returns None so the supervisor stops afterwards."""
+        import asyncio
+        from src.async_monitor import AsyncRegistrationMonitor
+        asyncio.run(AsyncRegistrationMonitor(self.monitor, interval=self.interval).run())
+        return None
+
+    def record_success(self):
+        if self.failing_since is not None:
+            recovered_in = time.time() - self.failing_since
+            self.recoveries.append(recovered_in)
+            METRICS.recovery_seconds.observe(recovered_in)
+            logger.info(f"Recovered after {recovered_in:.0f}s and {self.failures} failed attempts")
+            self.notifier.send_message(f"✅ Course monitor recovered after {recovered_in:.0f} seconds")
+        self.failures = 0
+        self.failing_since = None
+        self.breaker.record_success()
+
+    def record_failure(self, error):
+        """Classify a failed attempt and return how long to back off."""
+        now = time.time()
+        self.failures += 1
+        if self.failing_since is None:
+            self.failing_since = now
+            self.notifier.send_message(f"⚠️ Error in course monitor, retrying: {str(error)}")
+        logger.error(f"Attempt failed ({self.failures} in a row): {str(error)}")
+
+        monitor = self.monitor
+        if monitor and isinstance(error, TimeoutException) and monitor.polling_policy:
+            monitor.polling_policy.record_timeout()
+        if monitor and monitor.driver is not None and (
+                self.watchdog.fired or isinstance(error, WebDriverException) or not monitor.browser_alive()):
+            self.browser_suspect = True
+
+        if self.breaker.record_failure(now):
+            METRICS.restarts.inc(action='circuit_open')
+            logger.warning(f"Circuit open, pausing for {self.breaker.reset_timeout:.0f}s")
+            self.notifier.send_message(
+                f"⚠️ Course monitor paused for {self.breaker.reset_timeout // 60:.0f} minutes "
+                f"after {self.failures} consecutive failures: {str(error)}"
+            )
+            return 0  # The breaker decides when to try again
+        return self.backoff.delay(self.failures)
+
+    def run(self, async_pipeline=False):
+        """Supervise polling (or the asyncio pipeline) until stopped or interrupted."""
+        step = self.run_pipeline if async_pipeline else self.poll
+        self.serve_health()
+        self.notifier.send_message("Course Monitoring Started Successfully")
+        while not self.stop_event.is_set():
+            paused_for = self.breaker.allow()
+            if paused_for:
+                self.stop_event.wait(paused_for)
+                continue
+            try:
+                self.ensure_ready()
+                delay = step()
+            except Exception as e:
+                delay = self.record_failure(e)
+            else:
+                self.record_success()
+                if delay is None:
+                    break
+            logger.info(f"Waiting {delay:.0f} seconds before next check...")
+            self.stop_event.wait(delay)
+
+    def liveness(self):
+        """The supervisor loop is running and not stuck inside a poll."""
+        if self.stop_event.is_set() or self.watchdog.busy_for() > self.watchdog.timeout:
+            return 503, "hung\n"
+        return 200, "ok\n"
+
+    def readiness(self):
+        """Logged in, circuit closed, and a poll has succeeded recently."""
+        monitor = self.monitor
+        stale_after = 3 * max(self.interval, getattr(monitor and monitor.polling_policy, 'max_interval', 0))
+        last_success = monitor.last_success if monitor else None
+        details = (f"circuit={self.breaker.state} failures={self.failures} "
+                   f"last_success_age={time.time() - last_success:.0f}s\n" if last_success else
+                   f"circuit={self.breaker.state} failures={self.failures} last_success_age=never\n")
+        ready = (monitor is not None and monitor.is_initialized and self.breaker.state == 'closed'
+                 and last_success is not None and time.time() - last_success < stale_after)
+        return (200 if ready else 503), details
+
+    def serve_health(self):
+        """Expose /healthz and /readyz next to /metrics (METRICS_PORT), or on HEALTH_PORT."""
+        METRICS.routes['/healthz'] = self.liveness
+        METRICS.routes['/readyz'] = self.readiness
+        port = os.environ.get('HEALTH_PORT')
+        if port and METRICS.server is None:
+            METRICS.serve(int(port), os.environ.get('METRICS_HOST', '127.0.0.1'))
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        self.stop()
+        self.watchdog.stop()
+        if self.monitor:
+            self.monitor.close()
+            self.monitor = None
@@ -0,0 +1,268 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from src.models.change import ChangeEvent
+from src.models.course import Course
+from src.utils.log_utils import get_logger
+from src.utils.metrics import METRICS
+
+logger = get_logger('alerts')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_state (
+    scope TEXT NOT NULL,
+    crn TEXT NOT NULL,
+    told TEXT,
+    told_at REAL,
+    opened_at REAL,
+    pending TEXT,
+    pending_since REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (scope, crn)
+);
+CREATE TABLE IF NOT EXISTS alert_digest (
+    id INTEGER PRIMARY KEY,
+    scope TEXT NOT NULL,
+    change TEXT NOT NULL,
+    added_at REAL NOT NULL
+);
+"""
+
+
+def is_opening(change):
+    return change.new_status == 'Available' and change.old_status != 'Available'
+
+
+def encode_change(change):
+    return json.dumps([change.kind, list(change.course), change.old_value, change.new_value])
+
+
+def decode_change(text):
+    kind, course, old_value, new_value = json.loads(text)
+    return ChangeEvent(kind, Course.create(*course), old_value, new_value)
+
+
+class CrnAlert:
+    """What the user was last told about one CRN, and the change waiting to be told."""
+    __slots__ = ('told', 'told_at', 'opened_at', 'pending', 'pending_since', 'updated_at')
+
+    def __init__(self, told=None, told_at=0.0, opened_at=0.0, pending=None, pending_since=None, updated_at=0.0):
+        self.told = told
+        self.told_at = told_at or 0.0
+        self.opened_at = opened_at or 0.0
+        self.pending = pending
+        self.pending_since = pending_since
+        self.updated_at = updated_at
+
+
+class AlertGate:
+    """
+    Per-CRN alert state machine between the differ and the notifier.
+
+    A status change is held until it is due: openings go out at once unless the CRN already
+    opened within `cooldown`, other changes wait `hysteresis` seconds and `cooldown` after the
+    CRN's last alert. A change that flips back to what the user was last told is dropped. Due
+    changes collect in a digest that is sent with the next opening, or after `digest_window`.
+    State for up to `max_tracked` CRNs and the unsent digest are kept in memory and persisted to
+    SQLite, so a restart neither repeats nor loses an alert.
+    """
+
+    def __init__(self, path=None, scope='', hysteresis=120, cooldown=600, digest_window=300, max_tracked=5000):
+        self.scope = scope
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.digest_window = digest_window
+        self.max_tracked = max_tracked
+        self.entries = OrderedDict()  # CRN -> CrnAlert, least recently changed first
+        self.pending_crns = set()
+        self.digest = []  # Due changes not sent yet
+        self.digest_since = None
+        self.suppressed = 0
+        self.lock = threading.Lock()
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+            self._load()
+
+    @classmethod
+    def from_env(cls, path=None, scope=''):
+        """Build a gate tuned by ALERT_HYSTERESIS, ALERT_COOLDOWN, ALERT_DIGEST_WINDOW and ALERT_MAX_TRACKED."""
+        env = os.environ
+        return cls(
+            path, scope,
+            hysteresis=int(env.get('ALERT_HYSTERESIS', 120)),
+            cooldown=int(env.get('ALERT_COOLDOWN', 600)),
+            digest_window=int(env.get('ALERT_DIGEST_WINDOW', 300)),
+            max_tracked=int(env.get('ALERT_MAX_TRACKED', 5000))
+        )
+
+    def _load(self):
+        rows = self.conn.execute(
+            "SELECT crn, told, told_at, opened_at, pending, pending_since, updated_at FROM alert_state "
+            "WHERE scope = ? ORDER BY updated_at DESC LIMIT ?", (self.scope, self.max_tracked)
+        ).fetchall()
+        for crn, told, told_at, opened_at, pending, pending_since, updated_at in reversed(rows):
+            if pending:
+                pending = decode_change(pending)
+                self.pending_crns.add(crn)
+            self.entries[crn] = CrnAlert(told, told_at, opened_at, pending, pending_since, updated_at)
+
+        digest = self.conn.execute(
+            "SELECT change, added_at FROM alert_digest WHERE scope = ? ORDER BY id", (self.scope,)
+        ).fetchall()
+        self.digest = [decode_change(change) for change, _ in digest]
+        if digest:
+            self.digest_since = digest[0][1]
+
+    def _entry(self, crn, evicted):
+        entry = self.entries.get(crn)
+        if entry is None:
+            entry = self.entries[crn] = CrnAlert()
+            if len(self.entries) > self.max_tracked:
+                # Forget the least recently changed CRN that has nothing waiting
+                stale = next((key for key in self.entries if key not in self.pending_crns), None)
+                if stale is not None and stale != crn:
+                    del self.entries[stale]
+                    evicted.append(stale)
+        else:
+            self.entries.move_to_end(crn)
+        return entry
+
+    def _release(self, now):
+        """Move every due pending change into the digest, as a change from what the user was told."""
+        for crn in sorted(self.pending_crns):
+            entry = self.entries[crn]
+            change = entry.pending
+            if is_opening(change):
+                if now - entry.opened_at < self.cooldown:
+                    continue
+                entry.opened_at = now
+            elif now - entry.pending_since < self.hysteresis or now - entry.told_at < self.cooldown:
+                continue
+            if change.kind == 'status' and entry.told is not None:
+                change = change._replace(old_value=entry.told)
+            self.digest.append(change)
+            entry.told, entry.told_at, entry.pending = change.new_status, now, None
+            entry.updated_at = now
+            self.pending_crns.discard(crn)
+            yield crn
+
+    def process(self, changes, now=None):
+        """Feed one poll's changes (possibly none). Returns the changes to alert now, if any."""
+        now = now if now is not None else time.time()
+        with self.lock:
+            dirty, evicted = set(), []
+            digest_size = len(self.digest)
+            for change in changes:
+                if change.kind in ('instructor', 'campus'):
+                    self.digest.append(change)
+                    continue
+                entry = self._entry(change.crn, evicted)
+                if entry.told is None:
+                    entry.told = change.old_status
+                if change.new_status == entry.told:
+                    if entry.pending is not None:
+                        # Flapped back before the user heard about it
+                        logger.debug(f"Dropped {change.crn} flapping back to {change.new_status}")
+                        self.suppressed += 1
+                        METRICS.alerts_suppressed.inc()
+                    entry.pending = None
+                    self.pending_crns.discard(change.crn)
+                else:
+                    if entry.pending is None:
+                        entry.pending_since = now
+                    entry.pending = change
+                    self.pending_crns.add(change.crn)
+                entry.updated_at = now
+                dirty.add(change.crn)
+            dirty.update(self._release(now))
+            # Released changes are saved with the entries that now count them as told
+            self._save(dirty, evicted, self.digest[digest_size:], now)
+
+            if not self.digest:
+                return []
+            if self.digest_since is None:
+                self.digest_since = now
+            if any(is_opening(change) for change in self.digest) or now - self.digest_since >= self.digest_window:
+                return self._drain()
+            return []
+
+    def drain(self):
+        """Return and clear the digest, e.g. on shutdown. Held changes stay persisted."""
+        with self.lock:
+            return self._drain()
+
+    def _drain(self):
+        digest, self.digest, self.digest_since = self.digest, [], None
+        if digest and self.conn is not None:
+            # The caller hands the digest straight to the durable outbox
+            with self.conn:
+                self.conn.execute("DELETE FROM alert_digest WHERE scope = ?", (self.scope,))
+        return digest
+
+    def _save(self, dirty, evicted, digested=(), now=None):
+        if self.conn is None or not (dirty or evicted or digested):
+            return
+        rows = []
+        for crn in dirty:
+            entry = self.entries.get(crn)
+            if entry is None:
+                continue
+            pending = entry.pending and encode_change(entry.pending)
+            rows.append((self.scope, crn, entry.told, entry.told_at, entry.opened_at, pending,
+                         entry.pending_since, entry.updated_at))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO alert_state (scope, crn, told, told_at, opened_at, pending, pending_since, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.conn.executemany(
+                "DELETE FROM alert_state WHERE scope = ? AND crn = ?", [(self.scope, crn) for crn in evicted]
+            )
+            self.conn.executemany(
+                "INSERT INTO alert_digest (scope, change, added_at) VALUES (?, ?, ?)",
+                [(self.scope, encode_change(change), now) for change in digested]
+            )
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def simulate(sequence, gate, poll_interval=60):
+    """
+    Replay per-poll statuses through `gate` and through ungated alerting.
+
+    `sequence` maps CRN -> list of statuses, one per poll (e.g. a seat flapping Full/Available).
+    Returns messages sent and sections alerted for both, plus how many flips the gate dropped.
+    """
+    polls = max(len(statuses) for statuses in sequence.values())
+    courses = {crn: Course.create('COMP', '10279', 'Simulated', crn, statuses[0], '', '', '')
+               for crn, statuses in sequence.items()}
+    ungated = {'messages': 0, 'alerted': 0}
+    gated = {'messages': 0, 'alerted': 0}
+    now = time.time()
+    for poll in range(1, polls + 1):
+        changes = []
+        for crn, statuses in sequence.items():
+            if poll < len(statuses) and statuses[poll] != statuses[poll - 1]:
+                courses[crn] = courses[crn]._replace(status=statuses[poll])
+                changes.append(ChangeEvent('status', courses[crn], statuses[poll - 1], statuses[poll]))
+        if changes:
+            ungated['messages'] += 1
+            ungated['alerted'] += len(changes)
+        alerts = gate.process(changes, now + poll * poll_interval)
+        if alerts:
+            gated['messages'] += 1
+            gated['alerted'] += len(alerts)
+    leftover = gate.drain()
+    if leftover:
+        gated['messages'] += 1
+        gated['alerted'] += len(leftover)
+    return {'ungated': ungated, 'gated': gated, 'suppressed': gate.suppressed}
@@ -0,0 +1,165 @@
+from datetime import datetime
+
+SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_status_history_time ON status_history (observed_at);
+CREATE TABLE IF NOT EXISTS crn_stats (
+    crn TEXT PRIMARY KEY,
+    subject TEXT,
+    course_num TEXT,
+    transitions INTEGER NOT NULL DEFAULT 0,
+    openings INTEGER NOT NULL DEFAULT 0,
+    available_seconds REAL NOT NULL DEFAULT 0,
+    available_spells INTEGER NOT NULL DEFAULT 0,
+    available_since REAL
+);
+CREATE INDEX IF NOT EXISTS idx_crn_stats_course ON crn_stats (subject, course_num);
+CREATE TABLE IF NOT EXISTS openings_by_hour (
+    crn TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    openings INTEGER NOT NULL,
+    PRIMARY KEY (crn, hour)
+);
+"""
+
+STAT_FIELDS = ('transitions', 'openings', 'available_seconds', 'available_spells', 'available_since')
+
+
+class AnalyticsStore:
+    """
+    Rollups over status_history, kept up to date as transitions are recorded.
+
+    Per CRN it tracks transitions, openings (a move to Available) and how long each Available
+    spell lasted, plus openings per local hour of day, so queries never scan the raw history.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _apply(stats, old_status, new_status, observed_at):
+        """Fold one transition into a CRN's [transitions, openings, seconds, spells, since]."""
+        if old_status is None:
+            # First sighting: no transition was observed, and an Available spell's start is unknown
+            stats[4] = None
+            return False
+        stats[0] += 1
+        opened = new_status == 'Available' and old_status != 'Available'
+        if opened:
+            stats[1] += 1
+            stats[4] = observed_at
+        elif old_status == 'Available':
+            if stats[4] is not None:
+                stats[2] += observed_at - stats[4]
+                stats[3] += 1
+            stats[4] = None
+        return opened
+
+    def record(self, transitions):
+        """Update the rollups for [(course, old_status, new_status, observed_at), ...]. No commit."""
+        for course, old_status, new_status, observed_at in transitions:
+            row = self.conn.execute(
+                f"SELECT {', '.join(STAT_FIELDS)} FROM crn_stats WHERE crn = ?", (course.crn,)
+            ).fetchone()
+            stats = list(row) if row else [0, 0, 0.0, 0, None]
+            opened = self._apply(stats, old_status, new_status, observed_at)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO crn_stats (crn, subject, course_num, {', '.join(STAT_FIELDS)}) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (course.crn, course.subject, course.course_num, *stats)
+            )
+            if opened:
+                self.conn.execute(
+                    "INSERT INTO openings_by_hour (crn, hour, openings) VALUES (?, ?, 1) "
+                    "ON CONFLICT (crn, hour) DO UPDATE SET openings = openings + 1",
+                    (course.crn, datetime.fromtimestamp(observed_at).hour)
+                )
+
+    def rebuild(self):
+        """Recompute every rollup from the raw history, e.g. for a database that predates them."""
+        courses = dict(
+            (crn, (subject, course_num))
+            for crn, subject, course_num in self.conn.execute("SELECT crn, subject, course_num FROM courses")
+        )
+        stats, hours = {}, {}
+        rows = self.conn.execute(
+            "SELECT crn, old_status, new_status, observed_at FROM status_history ORDER BY observed_at, id"
+        )
+        for crn, old_status, new_status, observed_at in rows:
+            crn_stats = stats.setdefault(crn, [0, 0, 0.0, 0, None])
+            if self._apply(crn_stats, old_status, new_status, observed_at):
+                key = (crn, datetime.fromtimestamp(observed_at).hour)
+                hours[key] = hours.get(key, 0) + 1
+
+        with self.conn:
+            self.conn.execute("DELETE FROM crn_stats")
+            self.conn.execute("DELETE FROM openings_by_hour")
+            self.conn.executemany(
+                f"INSERT INTO crn_stats (crn, subject, course_num, {', '.join(STAT_FIELDS)}) "
+                f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(crn, *courses.get(crn, ('', '')), *values) for crn, values in stats.items()]
+            )
+            self.conn.executemany(
+                "INSERT INTO openings_by_hour (crn, hour, openings) VALUES (?, ?, ?)",
+                [(crn, hour, count) for (crn, hour), count in hours.items()]
+            )
+        return len(stats)
+
+    @staticmethod
+    def _filter(crn=None, subject=None, course_num=None):
+        clauses, params = [], []
+        for column, value in (('crn', crn), ('subject', subject), ('course_num', course_num)):
+            if value:
+                clauses.append(f"s.{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def openings_by_hour(self, crn=None, subject=None, course_num=None):
+        """Return {hour: openings} for the matching sections, all 24 hours included."""
+        where, params = self._filter(crn, subject, course_num)
+        rows = self.conn.execute(
+            "SELECT h.hour, SUM(h.openings) FROM openings_by_hour h JOIN crn_stats s ON s.crn = h.crn"
+            f"{where} GROUP BY h.hour", params
+        ).fetchall()
+        result = dict.fromkeys(range(24), 0)
+        result.update(rows)
+        return result
+
+    def availability(self, crn=None, subject=None, course_num=None, limit=20):
+        """Return [(crn, subject, course_num, openings, mean seconds Available), ...], shortest first."""
+        where, params = self._filter(crn, subject, course_num)
+        where += (" AND" if where else " WHERE") + " s.available_spells > 0"
+        return self.conn.execute(
+            "SELECT s.crn, s.subject, s.course_num, s.openings, s.available_seconds / s.available_spells "
+            f"FROM crn_stats s{where} ORDER BY 5 LIMIT ?", params + [limit]
+        ).fetchall()
+
+    def churn(self, subject=None, limit=20):
+        """Return [(subject, course_num, sections, transitions, openings), ...], busiest first."""
+        where, params = self._filter(subject=subject)
+        return self.conn.execute(
+            "SELECT s.subject, s.course_num, COUNT(*), SUM(s.transitions), SUM(s.openings) "
+            f"FROM crn_stats s{where} GROUP BY s.subject, s.course_num ORDER BY 4 DESC LIMIT ?",
+            params + [limit]
+        ).fetchall()
+
+    def suggest_windows(self, fast_interval=120, slow_interval=1800, busy_factor=1.5):
+        """
+        Suggest a POLL_WINDOWS value: poll fast in hours with well above average openings and
+        slowly in hours that never had one. Contiguous hours with the same interval are merged.
+        """
+        hours = self.openings_by_hour()
+        mean = sum(hours.values()) / 24
+        if not mean:
+            return ""
+        intervals = [
+            fast_interval if hours[hour] >= busy_factor * mean else slow_interval if not hours[hour] else None
+            for hour in range(24)
+        ]
+        windows, start = [], 0
+        for hour in range(1, 25):
+            if hour == 24 or intervals[hour] != intervals[start]:
+                if intervals[start] is not None:
+                    windows.append(f"{start:02d}:00-{hour:02d}:00={intervals[start]}")
+                start = hour
+        return ",".join(windows)
@@ -0,0 +1,50 @@
+import json
+import os
+from src.models.account import MonitorTarget
+
+DEFAULT_ACCOUNTS_FILE = "accounts.json"
+
+
+def load_accounts(path=DEFAULT_ACCOUNTS_FILE):
+    """
+    Load the accounts × terms watch configuration.
+
+    Expected format:
+    {
+        "pool_size": 2,
+        "interval": 600,
+        "accounts": [
+            {"name": "alice", "email": "...", "password_env": "ALICE_PASSWORD",
+             "terms": ["559", "561"], "telegram_chat_id": "...", "watchlist": ["27446", "COMP 10279"]}
+        ]
+    }
+    Passwords may be given inline as "password" or read from the variable named by "password_env".
+    """
+    with open(path, 'r') as f:
+        config = json.load(f)
+
+    targets = []
+    for account in config.get('accounts', []):
+        name = account['name']
+        password = account.get('password')
+        if password is None and account.get('password_env'):
+            password = os.environ.get(account['password_env'])
+        if not password:
+            raise ValueError(f"No password configured for account '{name}'")
+
+        for term in account.get('terms', ['559']):
+            targets.append(MonitorTarget(
+                account=name,
+                email=account['email'],
+                password=password,
+                term=str(term),
+                telegram_chat_id=account.get('telegram_chat_id'),
+                telegram_token=account.get('telegram_token'),
+                watchlist=account.get('watchlist', [])
+            ))
+
+    return {
+        'pool_size': int(config.get('pool_size', 1)),
+        'interval': int(config.get('interval', 600)),
+        'targets': targets
+    }
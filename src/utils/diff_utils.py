@@ -0,0 +1,47 @@
+from src.models.change import ChangeEvent
+
+# Fields that raise their own change event, in reporting order
+WATCHED_FIELDS = ('status', 'instructor', 'campus')
+
+
+class ChangeDetector:
+    """Diffs CRN-keyed Course snapshots in one batched pass over the rows."""
+
+    def __init__(self, watchlist=None):
+        self.watchlist = watchlist
+
+    def watched(self, states):
+        """Return the watched part of `states` (all of it for an empty watchlist)."""
+        if not self.watchlist:
+            return states
+        matches = self.watchlist.matches
+        return {crn: course for crn, course in states.items() if matches(crn, course.subject, course.course_num)}
+
+    def diff(self, previous_states, current_states):
+        """Return ChangeEvents for added, removed and status/instructor/campus changes of watched CRNs."""
+        # Sections stored before the watchlist narrowed must not come back as 'removed'
+        previous_states = self.watched(previous_states)
+        previous_keys = previous_states.keys()
+        current_keys = current_states.keys()
+
+        events = []
+        for crn in sorted(current_keys - previous_keys):
+            course = current_states[crn]
+            events.append(ChangeEvent('added', course, '', course.status))
+
+        for crn in sorted(previous_keys - current_keys):
+            course = previous_states[crn]
+            events.append(ChangeEvent('removed', course, course.status, ''))
+
+        # Course fields are interned, so identical rows compare by identity at C speed and only
+        # rows that actually moved get a field-by-field look
+        previous_get = previous_states.get
+        changed = [crn for crn, course in current_states.items() if previous_get(crn, course) != course]
+        for crn in changed:
+            previous, current = previous_states[crn], current_states[crn]
+            for field in WATCHED_FIELDS:
+                old_value, new_value = getattr(previous, field), getattr(current, field)
+                if old_value != new_value:
+                    events.append(ChangeEvent(field, current, old_value, new_value))
+
+        return events
@@ -0,0 +1,115 @@
+import os
+
+# Markers that show the portal bounced us to a login page instead of the timetable
+LOGIN_MARKERS = ('login.microsoftonline.com', 'loginfmt', 'twbkwbis.P_WWWLogin')
+
+# Reads the term form that the CONTINUE button submits, so it can be replayed over HTTP
+CAPTURE_FORM_SCRIPT = """
+var button = arguments[0];
+var form = button.form;
+var data = [];
+for (var i = 0; i < form.elements.length; i++) {
+    var el = form.elements[i];
+    if (!el.name || el.disabled || el.type === 'submit') continue;
+    if ((el.type === 'radio' || el.type === 'checkbox') && !el.checked) continue;
+    data.push([el.name, el.value]);
+}
+if (button.name) data.push([button.name, button.value]);
+return {action: form.action, method: (form.method || 'get').toUpperCase(), data: data};
+"""
+
+
+class SessionExpired(Exception):
+    """Raised when the portal no longer accepts the exported session cookies."""
+
+
+class HttpPoller:
+    """Fetches the registration results page with the browser's cookies over a pooled session."""
+
+    def __init__(self, url, method='GET', form_data=None, cookies=None, user_agent=None, timeout=30):
+        self.url = url
+        self.method = method
+        self.form_data = form_data or []
+        self.user_agent = user_agent
+        self.timeout = timeout
+
+        # Deferred so monitors that never poll over HTTP do not pay for importing requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Keep-alive connection pool; requests negotiates gzip/deflate by default
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+        for cookie in cookies or []:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+
+    @classmethod
+    def from_driver(cls, driver, form=None, **kwargs):
+        """Build a poller from an authenticated WebDriver and the captured term form."""
+        user_agent = driver.execute_script("return navigator.userAgent")
+        if form:
+            return cls(form['action'], method=form['method'], form_data=form['data'],
+                       cookies=driver.get_cookies(), user_agent=user_agent, **kwargs)
+        return cls(driver.current_url, cookies=driver.get_cookies(), user_agent=user_agent, **kwargs)
+
+    @classmethod
+    def from_session(cls, session, **kwargs):
+        """Build a poller from a session saved by SessionStore."""
+        return cls(session['url'], method=session['method'], form_data=session['form_data'],
+                   cookies=session['cookies'], user_agent=session.get('user_agent'), **kwargs)
+
+    def export_cookies(self):
+        """Return the session cookies in WebDriver's add_cookie format."""
+        return [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+            for c in self.session.cookies
+        ]
+
+    def fetch(self):
+        """Fetch the results page and return its raw bytes, raising SessionExpired on a login bounce."""
+        if self.method == 'POST':
+            response = self.session.post(self.url, data=self.form_data, timeout=self.timeout)
+        else:
+            response = self.session.get(self.url, params=self.form_data or None, timeout=self.timeout)
+
+        if response.status_code in (401, 403):
+            raise SessionExpired(f"Portal returned HTTP {response.status_code}")
+        response.raise_for_status()
+
+        if any(marker in response.url for marker in LOGIN_MARKERS) or \
+                any(marker.encode() in response.content for marker in LOGIN_MARKERS):
+            raise SessionExpired("Portal redirected to the login page")
+        return response.content
+
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+
+class RecordingPoller:
+    """Wraps a poller and saves every fetched page, so a live session can be replayed later."""
+
+    def __init__(self, poller, directory):
+        self.poller = poller
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.count = len([name for name in os.listdir(directory) if name.endswith('.html')])
+
+    def __getattr__(self, name):
+        return getattr(self.poller, name)
+
+    def fetch(self):
+        page = self.poller.fetch()
+        self.count += 1
+        with open(os.path.join(self.directory, f"page_{self.count:06d}.html"), 'wb') as f:
+            f.write(page)
+        return page
@@ -0,0 +1,46 @@
+import json
+import logging
+import os
+import sys
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields passed to the log call."""
+
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in self.RESERVED})
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level=None, fmt=None):
+    """
+    Configure the bot's loggers from LOG_LEVEL (DEBUG, INFO, WARNING, ..., OFF) and LOG_FORMAT
+    (text or json). Per-course dumps are logged at DEBUG, so the default INFO level skips them.
+    """
+    level = (level or os.environ.get('LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.environ.get('LOG_FORMAT', 'text')).lower()
+
+    handler = logging.StreamHandler(sys.stdout)
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s", "%Y-%m-%d %H:%M:%S"))
+
+    logger = logging.getLogger('mohawk')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.CRITICAL + 1 if level == 'OFF' else level)
+    return logger
+
+
+def get_logger(name):
+    """Return a child of the bot's logger, e.g. get_logger('monitor') -> 'mohawk.monitor'."""
+    return logging.getLogger(f"mohawk.{name}")
@@ -0,0 +1,213 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers a sub-millisecond diff up to a two-minute login
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{str(value)}"'.replace('\n', ' ') for name, value in sorted(labels))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, key, value) for key, value in self.values.items()]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition layout."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}  # label key -> [bucket counts..., sum, count]
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels):
+        series = self.series.get(tuple(sorted(labels.items())))
+        return series[-1] if series else 0
+
+    def total(self, **labels):
+        series = self.series.get(tuple(sorted(labels.items())))
+        return series[-2] if series else 0.0
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, series in self.series.items():
+                for bound, count in zip(self.buckets, series):
+                    samples.append((f"{self.name}_bucket", key + (('le', repr(float(bound))),), count))
+                samples.append((f"{self.name}_bucket", key + (('le', '+Inf'),), series[-1]))
+                samples.append((f"{self.name}_sum", key, series[-2]))
+                samples.append((f"{self.name}_count", key, series[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    """Holds the monitor's metrics and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = []
+        self.textfile = None
+        self.server = None
+        self.routes = {}  # Extra endpoints served next to /metrics: path -> () -> (status, body)
+
+        self.stage_seconds = self.histogram(
+            'mohawk_stage_duration_seconds',
+            'Time spent in each monitor stage (login, navigation, fetch, parse, diff, notify, persist)'
+        )
+        self.rows_parsed = self.counter('mohawk_rows_parsed_total', 'Course rows parsed')
+        self.changes_detected = self.counter('mohawk_changes_detected_total', 'Section changes detected, by kind')
+        self.alerts_sent = self.counter('mohawk_alerts_sent_total', 'Telegram messages delivered')
+        self.alerts_suppressed = self.counter('mohawk_alerts_suppressed_total', 'Flapping changes dropped before alerting')
+        self.timeouts = self.counter('mohawk_timeouts_total', 'Timeouts, by stage')
+        self.polls = self.counter('mohawk_polls_total', 'Polls of the registration page')
+        self.recovery_seconds = self.histogram(
+            'mohawk_recovery_seconds', 'Time from the first failed poll to the next successful one',
+            buckets=(1, 5, 15, 60, 300, 900, 1800, 3600, 7200)
+        )
+        self.restarts = self.counter('mohawk_restarts_total', 'Supervisor recoveries, by action')
+        self.page_cache = self.counter(
+            'mohawk_page_cache_total', 'Incremental parser cache lookups, by level (page, row) and result (hit, miss)'
+        )
+        self.parse_seconds_saved = self.counter(
+            'mohawk_parse_seconds_saved_total', 'Parse time skipped by reusing unchanged pages and rows'
+        )
+        self.navigations = self.counter(
+            'mohawk_navigations_total', 'Results-page loads, by how they were reached (http, refresh, full, login)'
+        )
+        self.round_trips_saved = self.counter(
+            'mohawk_navigation_round_trips_saved_total', 'Page loads avoided by not re-running the full click chain'
+        )
+
+    def counter(self, name, help_text):
+        metric = Counter(name, help_text)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    @contextmanager
+    def time(self, stage, **labels):
+        """Observe the duration of the wrapped block in the stage histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds.observe(time.perf_counter() - started, stage=stage, **labels)
+
+    def timed(self, stage):
+        """Decorator form of time()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path=None):
+        """Atomically write the metrics for node_exporter's textfile collector."""
+        path = path or self.textfile
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host='127.0.0.1'):
+        """Serve /metrics, and any registered routes, from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                if path == '/metrics':
+                    status, body = 200, registry.render()
+                elif path in registry.routes:
+                    status, body = registry.routes[path]()
+                else:
+                    self.send_error(404)
+                    return
+                body = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes would otherwise log a line each
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server
+
+    def configure_from_env(self):
+        """Start the /metrics endpoint (METRICS_PORT) and/or textfile export (METRICS_TEXTFILE)."""
+        port = os.environ.get('METRICS_PORT')
+        if port and self.server is None:
+            self.serve(int(port), os.environ.get('METRICS_HOST', '127.0.0.1'))
+        self.textfile = os.environ.get('METRICS_TEXTFILE') or self.textfile
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Process-wide registry shared by every monitor and notifier
+METRICS = MetricsRegistry()
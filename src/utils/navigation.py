@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+# Per-step timeouts in seconds, instead of one blanket 120 second wait
+STEP_TIMEOUTS = {
+    'page': 30,        # A full page navigation
+    'field': 10,       # An element on a page that has already loaded
+    'transition': 20,  # Moving between login steps after a submit
+    'optional': 5,     # Prompts that may legitimately never appear
+    'new_tab': 15
+}
+
+# Page loads in a full Home -> Registration -> timetable tab -> Submit to Confirm -> term -> CONTINUE chain
+FULL_NAVIGATION_ROUND_TRIPS = 6
+
+# Re-submits a form captured with CAPTURE_FORM_SCRIPT, reloading the results page in place
+SUBMIT_FORM_SCRIPT = """
+var captured = arguments[0];
+var form = document.createElement('form');
+form.action = captured.action;
+form.method = captured.method;
+form.style.display = 'none';
+captured.data.forEach(function (pair) {
+    var input = document.createElement('input');
+    input.type = 'hidden';
+    input.name = pair[0];
+    input.value = pair[1];
+    form.appendChild(input);
+});
+document.body.appendChild(form);
+HTMLFormElement.prototype.submit.call(form);
+"""
+
+
+def wait_until(driver, condition, timeout, poll_frequency=0.1):
+    """Wait for a single condition, polling faster than WebDriverWait's 0.5s default."""
+    from selenium.webdriver.support.ui import WebDriverWait  # Deferred: pulls in all of WebDriver
+    return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(condition)
+
+
+def race(driver, outcomes, timeout, poll_frequency=0.1):
+    """
+    Wait for whichever of several outcomes happens first.
+
+    `outcomes` maps a name to an expected condition. Returns (name, result) for the first one that
+    is satisfied, checking them in order on every poll; raises TimeoutException if none is.
+    """
+    def first_ready(driver):
+        for name, condition in outcomes.items():
+            try:
+                result = condition(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+            if result:
+                return name, result
+        return False
+
+    return wait_until(driver, first_ready, timeout, poll_frequency)
+
+
+def close_extra_windows(driver, keep):
+    """Close every window except `keep` and switch back to it. Returns how many were closed."""
+    closed = 0
+    for handle in driver.window_handles:
+        if handle != keep:
+            driver.switch_to.window(handle)
+            driver.close()
+            closed += 1
+    driver.switch_to.window(keep)
+    return closed
+
+
+class StepTimer:
+    """Records how long each named navigation step takes."""
+
+    def __init__(self):
+        self.timings = []
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, time.perf_counter() - started))
+
+    def summary(self):
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings)
+
+    def reset(self):
+        self.timings = []
@@ -0,0 +1,158 @@
+import os
+import random
+import statistics
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from src.models.change import ChangeEvent
+from src.models.course import Course
+
+
+def parse_windows(spec):
+    """
+    Parse time-of-day polling windows like "08:00-18:00=120,18:00-23:00=300".
+
+    Returns a list of (start_minute, end_minute, interval_seconds). Windows may wrap past midnight.
+    """
+    windows = []
+    for part in filter(None, (p.strip() for p in (spec or "").split(','))):
+        span, interval = part.split('=')
+        start, end = span.split('-')
+        windows.append((_to_minutes(start), _to_minutes(end), int(interval)))
+    return windows
+
+
+def _to_minutes(clock):
+    hours, minutes = clock.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class AdaptivePollingPolicy:
+    """Chooses the delay before the next poll from per-CRN change history, time windows and timeouts."""
+
+    def __init__(self, base_interval=600, min_interval=60, max_interval=3600, windows=None,
+                 history_window=3600, half_life=300, jitter=0.1, watched_crns=None):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.windows = windows or []
+        self.history_window = history_window
+        self.half_life = half_life
+        self.jitter = jitter
+        self.watched_crns = set(watched_crns) if watched_crns else None
+        self.history = defaultdict(deque)  # CRN -> timestamps of recent status changes
+        self.consecutive_timeouts = 0
+        self.last_change = None
+
+    @classmethod
+    def from_env(cls, base_interval=600):
+        """Build a policy from POLL_MIN_INTERVAL, POLL_MAX_INTERVAL and POLL_WINDOWS."""
+        return cls(
+            base_interval=base_interval,
+            min_interval=int(os.environ.get('POLL_MIN_INTERVAL', 60)),
+            max_interval=int(os.environ.get('POLL_MAX_INTERVAL', 3600)),
+            windows=parse_windows(os.environ.get('POLL_WINDOWS'))
+        )
+
+    def record_changes(self, changes, now=None):
+        """Remember when each CRN last changed status."""
+        now = now if now is not None else time.time()
+        for change in changes:
+            if change.kind != 'status':
+                continue
+            self.history[change.crn].append(now)
+            self.last_change = now
+        self.consecutive_timeouts = 0
+
+    def seed_history(self, changes):
+        """Prime the change history from stored (crn, timestamp) transitions."""
+        for crn, timestamp in changes:
+            self.history[crn].append(timestamp)
+            self.last_change = max(self.last_change or 0, timestamp)
+
+    def record_timeout(self):
+        """Back off after a timed-out poll."""
+        self.consecutive_timeouts += 1
+
+    def _prune(self, now):
+        for crn in list(self.history):
+            timestamps = self.history[crn]
+            while timestamps and timestamps[0] < now - self.history_window:
+                timestamps.popleft()
+            if not timestamps:
+                del self.history[crn]
+
+    def window_interval(self, now):
+        """Return the interval of the time-of-day window containing `now`, if any."""
+        moment = datetime.fromtimestamp(now)
+        minute = moment.hour * 60 + moment.minute
+        for start, end, interval in self.windows:
+            inside = start <= minute < end if start <= end else minute >= start or minute < end
+            if inside:
+                return interval
+        return None
+
+    def crn_interval(self, crn, now):
+        """Poll a CRN faster the more often, and the more recently, it changed."""
+        activity = sum(0.5 ** ((now - t) / self.half_life) for t in self.history.get(crn, ()))
+        return max(self.min_interval, self.base_interval / (1 + 4 * activity))
+
+    def quiet_interval(self, now):
+        """Stretch the interval the longer nothing has changed at all."""
+        if self.last_change is None:
+            return self.base_interval
+        quiet_for = now - self.last_change
+        return min(self.max_interval, self.base_interval * (1 + quiet_for / self.history_window))
+
+    def next_interval(self, now=None):
+        """Seconds to wait before the next poll."""
+        now = now if now is not None else time.time()
+        self._prune(now)
+
+        crns = self.history.keys() if self.watched_crns is None else self.watched_crns
+        interval = min([self.crn_interval(crn, now) for crn in crns] + [self.quiet_interval(now)])
+
+        window = self.window_interval(now)
+        if window is not None:
+            interval = min(interval, window) if self.history else window
+
+        if self.consecutive_timeouts:
+            interval *= 2 ** min(self.consecutive_timeouts, 6)
+
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+def simulate(change_log, policy, start=None, end=None, fixed_interval=600):
+    """
+    Replay a recorded change log against a polling policy and fixed-interval polling.
+
+    `change_log` is a time-ordered list of (timestamp, crn, status). A change counts as alerted at
+    the first poll after it happens. Returns page loads and median time-to-alert for both strategies.
+    """
+    if not change_log:
+        return {}
+    start = start if start is not None else change_log[0][0]
+    end = end if end is not None else change_log[-1][0] + fixed_interval
+
+    def replay(next_delay, on_changes):
+        polls, latencies, index, now = 0, [], 0, start
+        while now <= end:
+            polls += 1
+            detected = []
+            while index < len(change_log) and change_log[index][0] <= now:
+                timestamp, crn, status = change_log[index]
+                latencies.append(now - timestamp)
+                detected.append(ChangeEvent('status', Course.create('', '', '', crn, status, '', '', ''), '', status))
+                index += 1
+            on_changes(detected, now)
+            now += next_delay(now)
+        return {
+            'page_loads': polls,
+            'median_time_to_alert': statistics.median(latencies) if latencies else None
+        }
+
+    return {
+        'adaptive': replay(policy.next_interval, policy.record_changes),
+        'fixed': replay(lambda now: fixed_interval, lambda changes, now: None)
+    }
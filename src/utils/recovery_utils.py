@@ -0,0 +1,113 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from src.utils.log_utils import get_logger
+
+logger = get_logger('recovery')
+
+
+class Backoff:
+    """Exponential backoff with full jitter: a random delay up to base * 2**attempt, capped."""
+
+    def __init__(self, base=5, cap=600):
+        self.base = base
+        self.cap = cap
+
+    def delay(self, attempt):
+        ceiling = min(self.cap, self.base * 2 ** min(attempt, 20))
+        return random.uniform(self.base, max(self.base, ceiling))
+
+
+class CircuitBreaker:
+    """
+    Stops hammering the portal after `failure_threshold` consecutive failures.
+
+    While open, attempts are refused for `reset_timeout` seconds; then a single half-open attempt
+    is let through. A success closes the circuit, another failure re-opens it for twice as long
+    (up to `max_reset_timeout`).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=900, max_reset_timeout=4 * 3600):
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self.state = 'closed'
+        self.opened_at = None
+
+    def allow(self, now=None):
+        """Return 0 if an attempt may run now, otherwise the seconds until it may."""
+        if self.state != 'open':
+            return 0
+        now = now if now is not None else time.time()
+        remaining = self.opened_at + self.reset_timeout - now
+        if remaining > 0:
+            return remaining
+        self.state = 'half_open'
+        return 0
+
+    def record_success(self):
+        self.failures = 0
+        self.state = 'closed'
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self, now=None):
+        """Count a failure. Returns True when this failure opened the circuit."""
+        now = now if now is not None else time.time()
+        self.failures += 1
+        if self.state == 'half_open':
+            self.reset_timeout = min(self.max_reset_timeout, self.reset_timeout * 2)
+        elif self.failures < self.failure_threshold:
+            return False
+        self.state = 'open'
+        self.opened_at = now
+        return True
+
+
+class Watchdog:
+    """Calls `on_hang` from a background thread when a watched block runs longer than `timeout`."""
+
+    def __init__(self, timeout, on_hang, check_every=5):
+        self.timeout = timeout
+        self.on_hang = on_hang
+        self.check_every = check_every
+        self.busy_since = None
+        self.fired = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def start(self):
+        self.fired = False
+        self.busy_since = time.monotonic()
+
+    def finish(self):
+        self.busy_since = None
+
+    @contextmanager
+    def paused(self):
+        """Stop the clock for an interactive step (e.g. a 2FA prompt); it restarts afterwards."""
+        busy = self.busy_since is not None
+        self.busy_since = None
+        try:
+            yield
+        finally:
+            if busy:
+                self.busy_since = time.monotonic()
+
+    def busy_for(self):
+        return time.monotonic() - self.busy_since if self.busy_since is not None else 0
+
+    def _run(self):
+        while not self.stopped.wait(self.check_every):
+            if not self.fired and self.busy_for() > self.timeout:
+                self.fired = True
+                try:
+                    self.on_hang()
+                except Exception as e:
+                    logger.error(f"Watchdog action failed: {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,79 @@
+import json
+import os
+import time
+from src.utils.log_utils import get_logger
+
+logger = get_logger('session')
+
+# How long a saved session is trusted when the cookies carry no expiry of their own
+DEFAULT_SESSION_TTL = 8 * 60 * 60
+
+
+class SessionStore:
+    """Owner-only on-disk cache of the authenticated portal session."""
+
+    def __init__(self, path="session_cache.json", ttl=None):
+        self.path = path
+        self.ttl = ttl if ttl is not None else int(os.environ.get('SESSION_TTL', DEFAULT_SESSION_TTL))
+
+    def save(self, cookies, url, method='GET', form_data=None, user_agent=None):
+        """Persist the session atomically with 0600 permissions."""
+        expires_at = time.time() + self.ttl
+        cookie_expiries = [c['expiry'] for c in cookies if c.get('expiry')]
+        if cookie_expiries:
+            expires_at = min(expires_at, min(cookie_expiries))
+
+        session = {
+            'cookies': cookies,
+            'url': url,
+            'method': method,
+            'form_data': form_data or [],
+            'user_agent': user_agent,
+            'expires_at': expires_at
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+            logger.info(f"Saved session to {self.path} (valid for {int(expires_at - time.time())} seconds).")
+        except Exception as e:
+            logger.error(f"Error saving session cache: {e}")
+
+    def load(self):
+        """Return the saved session if it exists and has not expired, otherwise None."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            if os.stat(self.path).st_mode & 0o077:
+                logger.warning(f"Ignoring {self.path}: permissions are too open.")
+                return None
+            with open(self.path, 'r') as f:
+                session = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Error reading session cache: {e}")
+            return None
+
+        if session.get('expires_at', 0) <= time.time():
+            logger.info("Saved session has expired.")
+            self.clear()
+            return None
+        return session
+
+    def remaining(self):
+        """Seconds the saved session is still valid for (<= 0 if expired), or None if there is none."""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('expires_at', 0) - time.time()
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def clear(self):
+        """Delete the saved session."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Mapping
+from src.models.course import Course
+from src.utils.analytics_store import AnalyticsStore
+from src.utils.log_utils import get_logger
+
+logger = get_logger('state_store')
+
+COURSE_FIELDS = Course._fields
+INSERT_COURSE = f"INSERT OR REPLACE INTO courses ({', '.join(COURSE_FIELDS)}, updated_at) VALUES ({', '.join('?' * (len(COURSE_FIELDS) + 1))})"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    crn TEXT PRIMARY KEY,
+    subject TEXT,
+    course_num TEXT,
+    title TEXT,
+    status TEXT,
+    instructor TEXT,
+    campus TEXT,
+    dates TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS status_history (
+    id INTEGER PRIMARY KEY,
+    crn TEXT NOT NULL,
+    old_status TEXT,
+    new_status TEXT NOT NULL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_status_history_crn_time ON status_history (crn, observed_at);
+"""
+
+
+class PersistedStates(Mapping):
+    """Read-only view of the stored CRN -> Course records, loaded from SQLite on first access."""
+
+    def __init__(self, store):
+        self._store = store
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            self._data = self._store.load_all()
+        return self._data
+
+    def __getitem__(self, crn):
+        return self._load()[crn]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def keys(self):
+        return self._load().keys()
+
+    def get(self, crn, default=None):
+        return self._load().get(crn, default)
+
+
+class StateStore:
+    """SQLite (WAL) course state store that only writes the CRNs that changed."""
+
+    def __init__(self, path="course_states.db", legacy_json=None):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.analytics = AnalyticsStore(self.conn)
+        self.saved_states = None  # Last persisted snapshot, loaded on first use
+        if legacy_json:
+            self.import_json(legacy_json)
+        if (not self.conn.execute("SELECT 1 FROM crn_stats LIMIT 1").fetchone()
+                and self.conn.execute("SELECT 1 FROM status_history LIMIT 1").fetchone()):
+            self.analytics.rebuild()  # History recorded before the rollups existed
+
+    def import_json(self, json_file):
+        """One-time migration of a course_states.json file into an empty store."""
+        if not os.path.exists(json_file):
+            return 0
+        if self.conn.execute("SELECT 1 FROM courses LIMIT 1").fetchone():
+            return 0
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding {json_file}, skipping migration.")
+            return 0
+
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                INSERT_COURSE,
+                [Course.from_dict(course) + (now,) for course in data.values()]
+            )
+        logger.info(f"Migrated {len(data)} courses from {json_file} to {self.path}.")
+        return len(data)
+
+    def states(self):
+        """Return a lazily loaded mapping of CRN -> Course."""
+        return PersistedStates(self)
+
+    def load_all(self):
+        """Return the last saved snapshot as CRN -> Course, reading it from disk once."""
+        if self.saved_states is None:
+            rows = self.conn.execute(f"SELECT {', '.join(COURSE_FIELDS)} FROM courses").fetchall()
+            self.saved_states = {course.crn: course for course in (Course.create(*row) for row in rows)}
+        return self.saved_states
+
+    def save(self, current_states):
+        """
+        Persist `current_states` in one transaction, touching only CRNs that differ from the last
+        saved snapshot. Status changes are appended to the history table and folded into the
+        analytics rollups. Returns rows written.
+        """
+        previous_states = self.load_all()
+        now = time.time()
+
+        upserts, history, transitions = [], [], []
+        for crn, current in current_states.items():
+            previous = previous_states.get(crn)
+            if previous == current:
+                continue
+            upserts.append(current + (now,))
+            old_status = previous.status if previous else None
+            if old_status != current.status:
+                history.append((crn, old_status, current.status, now))
+                transitions.append((current, old_status, current.status, now))
+        removed = [(crn,) for crn in previous_states if crn not in current_states]
+
+        if not (upserts or history or removed):
+            self.saved_states = current_states
+            return 0
+        with self.conn:
+            self.conn.executemany(INSERT_COURSE, upserts)
+            self.conn.executemany("DELETE FROM courses WHERE crn = ?", removed)
+            self.conn.executemany(
+                "INSERT INTO status_history (crn, old_status, new_status, observed_at) VALUES (?, ?, ?, ?)",
+                history
+            )
+            self.analytics.record(transitions)
+        self.saved_states = current_states
+        return len(upserts) + len(removed)
+
+    def prune(self, watchlist):
+        """Delete stored sections the watchlist no longer covers, in SQL. Returns rows deleted."""
+        if not watchlist:
+            return 0
+        # Same rules as Watchlist.matches, so the snapshot never has to be loaded to prune it
+        subject = "UPPER(COALESCE(subject, ''))"
+        clauses, params = [], []
+        for expression, values in (("crn", watchlist.crns), (subject, watchlist.subjects),
+                                   (f"{subject} || ' ' || COALESCE(course_num, '')", watchlist.courses)):
+            if values:
+                clauses.append(f"{expression} IN ({', '.join('?' * len(values))})")
+                params.extend(sorted(values))
+        with self.conn:
+            deleted = self.conn.execute(f"DELETE FROM courses WHERE NOT ({' OR '.join(clauses)})", params).rowcount
+        if deleted and self.saved_states is not None:
+            self.saved_states = {crn: course for crn, course in self.saved_states.items()
+                                 if watchlist.matches(crn, course.subject, course.course_num)}
+        return deleted
+
+    def history(self, crn, since=None):
+        """Return [(old_status, new_status, observed_at), ...] for a CRN, oldest first."""
+        return self.conn.execute(
+            "SELECT old_status, new_status, observed_at FROM status_history "
+            "WHERE crn = ? AND observed_at >= ? ORDER BY observed_at",
+            (crn, since or 0)
+        ).fetchall()
+
+    def recent_changes(self, since):
+        """Return [(crn, observed_at), ...] for status transitions of tracked CRNs since `since`."""
+        return self.conn.execute(
+            "SELECT crn, observed_at FROM status_history "
+            "WHERE observed_at >= ? AND old_status IS NOT NULL ORDER BY observed_at",
+            (since,)
+        ).fetchall()
+
+    def close(self):
+        self.conn.close()
@@ -1,53 +1,316 @@
-import requests
+import asyncio
 import os
+import queue
+import sqlite3
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.alert_utils import AlertGate
+from src.utils.log_utils import get_logger
+from src.utils.metrics import METRICS
+
+logger = get_logger('telegram')
+
+# Telegram rejects messages longer than this many characters
+TELEGRAM_MAX_LENGTH = 4096
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# (outbox file, chat) pairs already replayed in this process, so two notifiers never double-send
+_replayed_outboxes = set()
+_replayed_lock = threading.Lock()
+
+
+def split_message(message, limit=TELEGRAM_MAX_LENGTH):
+    """Split a message into chunks under `limit`, preferring blank-line boundaries between alerts."""
+    chunks, current = [], ""
+    for block in message.split("\n\n"):
+        candidate = f"{current}\n\n{block}" if current else block
+        if len(candidate) <= limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        while len(block) > limit:
+            chunks.append(block[:limit])
+            block = block[limit:]
+        current = block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def coalesce_messages(messages, limit=TELEGRAM_MAX_LENGTH):
+    """Group queued (id, text) messages into as few sends as possible, each under `limit`."""
+    batches, texts, ids = [], [], []
+    for message_id, text in messages:
+        merged = "\n\n".join(texts + [text])
+        if texts and len(merged) > limit:
+            batches.append((ids, "\n\n".join(texts)))
+            texts, ids = [], []
+        texts.append(text)
+        ids.append(message_id)
+    if texts:
+        batches.append((ids, "\n\n".join(texts)))
+    return batches
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` sends per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate=1.0, capacity=3):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class Outbox:
+    """SQLite-backed queue of undelivered messages so alerts survive restarts."""
+
+    def __init__(self, path="telegram_outbox.db"):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY, chat_id TEXT, text TEXT, created_at REAL)"
+        )
+
+    def add(self, chat_id, text):
+        with self.lock, self.conn:
+            return self.conn.execute(
+                "INSERT INTO outbox (chat_id, text, created_at) VALUES (?, ?, ?)", (chat_id, text, time.time())
+            ).lastrowid
+
+    def pending(self, chat_id):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, text FROM outbox WHERE chat_id = ? ORDER BY id", (chat_id,)
+            ).fetchall()
+
+    def remove(self, ids):
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+
 
 class TelegramNotifier:
-    def __init__(self, token=None, chat_id=None):
+    """
+    Queues messages in a durable outbox and delivers them from a background thread.
+
+    Bursts are coalesced into as few messages as fit Telegram's length limit, sends are paced by
+    a token bucket, 429 responses are retried after Telegram's `retry_after`, and one pooled
+    HTTP session is reused for every request. Course changes pass through an AlertGate first, so
+    flapping seats and busy periods produce one digest instead of a burst per poll.
+    """
+
+    def __init__(self, token=None, chat_id=None, outbox_file="telegram_outbox.db", rate=1.0, burst=3,
+                 coalesce_window=1.0, api_url=None, timeout=30, gate=None, retry_delay=60, scope=None):
         self.telegram_token = token or os.environ.get('TELEGRAM_TOKEN')
         self.telegram_chat_id = chat_id or os.environ.get('TELEGRAM_CHAT_ID')
+        self.api_url = api_url or os.environ.get('TELEGRAM_API_URL', TELEGRAM_API_URL)
+        self.coalesce_window = coalesce_window
+        self.timeout = timeout
+        self.retry_delay = retry_delay  # Longest back-off between failed sends
+
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        self.bucket = TokenBucket(rate, burst)
+        self.outbox = Outbox(outbox_file)
+        # Alert state is per chat and per monitored target (`scope`, e.g. account_term), so targets that
+        # share a chat never release or clear each other's held changes
+        gate_scope = f"{self.telegram_chat_id}:{scope}" if scope else str(self.telegram_chat_id)
+        self.gate = gate or AlertGate.from_env(outbox_file, scope=gate_scope)
+        self.queue = queue.Queue()
+        self.sent_count = 0
+        self.request_count = 0
+
+        # Messages left over from a previous run go out first
+        with _replayed_lock:
+            replay = (os.path.abspath(outbox_file), str(self.telegram_chat_id)) not in _replayed_outboxes
+            _replayed_outboxes.add((os.path.abspath(outbox_file), str(self.telegram_chat_id)))
+        if replay:
+            for message_id, text in self.outbox.pending(str(self.telegram_chat_id)):
+                self.queue.put((message_id, text))
+
+        self.worker = threading.Thread(target=self._run, name="telegram-sender", daemon=True)
+        self.worker.start()
 
     def send_message(self, message):
-        """Send message via Telegram bot"""
-        try:
-            telegram_api_url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
+        """Queue a message for delivery via Telegram bot"""
+        # One outbox row per chunk, so a failed chunk never re-sends the ones already delivered
+        for chunk in split_message(message):
+            message_id = self.outbox.add(str(self.telegram_chat_id), chunk)
+            self.queue.put((message_id, chunk))
+
+    def flush(self, timeout=30):
+        """Wait until queued messages are delivered. Returns False if some are still pending."""
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self.queue.unfinished_tasks
+
+    def close(self, timeout=30):
+        """Deliver what can be delivered within `timeout`; the rest stays in the outbox"""
+        digest = self.gate.drain()
+        if digest:
+            self.send_message(self.format_changes(digest))
+        self.flush(timeout)
+        self.session.close()
+        self.gate.close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Collect whatever else arrives within the coalescing window
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            failed = []
+            for ids, text in coalesce_messages(batch):
+                if self._deliver(text):
+                    self.outbox.remove(ids)
+                    self.sent_count += len(ids)
+                else:
+                    failed.extend(item for item in batch if item[0] in ids)
+            if failed:
+                # Telegram is unreachable: back off, then try the same messages again
+                time.sleep(self.retry_delay)
+                for item in failed:
+                    self.queue.put(item)
+            for _ in batch:
+                self.queue.task_done()
+
+    def _deliver(self, message, max_attempts=5):
+        """Send one message, honouring rate limits and retry_after. Oversized rows from older outboxes are split."""
+        telegram_api_url = f"{self.api_url}/bot{self.telegram_token}/sendMessage"
+        for chunk in split_message(message):
             params = {
                 "chat_id": self.telegram_chat_id,
-                "text": message,
+                "text": chunk,
                 "parse_mode": "HTML"
             }
-            response = requests.post(telegram_api_url, params=params)
-            if not response.json().get("ok"):
-                print(f"Failed to send Telegram message: {response.json()}")
-        except Exception as e:
-            print(f"Error sending Telegram message: {str(e)}")
+            for attempt in range(max_attempts):
+                self.bucket.acquire()
+                try:
+                    self.request_count += 1
+                    response = self.session.post(telegram_api_url, data=params, timeout=self.timeout)
+                    result = response.json()
+                except Exception as e:
+                    logger.error(f"Error sending Telegram message: {str(e)}")
+                    time.sleep(min(self.retry_delay, 2 ** attempt))
+                    continue
 
-    def alert_changes(self, changes):
-        """Alert user of any changes via console and Telegram"""
-        if not changes:
-            return
+                if result.get("ok"):
+                    METRICS.alerts_sent.inc()
+                    break
+                retry_after = result.get("parameters", {}).get("retry_after")
+                if response.status_code == 429 and retry_after:
+                    logger.warning(f"Telegram rate limit hit, retrying in {retry_after} seconds...")
+                    time.sleep(retry_after)
+                elif response.status_code >= 500:
+                    time.sleep(min(self.retry_delay, 2 ** attempt))
+                else:
+                    # Malformed request: retrying will not help
+                    logger.warning(f"Failed to send Telegram message: {result}")
+                    return True
+            else:
+                logger.warning("Telegram message not delivered, it stays in the outbox.")
+                return False
+        return True
 
-        print("\n=== Changes Detected! ===")
-        telegram_message = "🔔 <b>Course Changes Detected!</b>\n\n"
+    @staticmethod
+    def format_changes(changes):
+        """Print changes to the console and build the Telegram alert message"""
+        opened = False
+        blocks = ["🔔 <b>Course Changes Detected!</b>"]
 
         for change in changes:
-            course_info = f"{change['subject']} {change['course_num']} - {change['title']}"
+            course_info = f"{change.subject} {change.course_num} - {change.title}"
+            if change.kind in ('instructor', 'campus'):
+                detail = f"{change.kind.capitalize()}: {change.old_value} → {change.new_value}"
+            else:
+                detail = f"Status: {change.old_status} → {change.new_status}"
 
             # Console output
-            print(f"\nCourse: {course_info}")
-            print(f"Instructor: {change['instructor']}")
-            print(f"CRN: {change['crn']}")
-            print(f"Status Change: {change['old_status']} → {change['new_status']}")
+            logger.info(f"Change detected: {course_info} | Instructor: {change.instructor} | "
+                        f"CRN: {change.crn} | {detail}")
 
             # Telegram message
-            telegram_message += f"📚 <b>{course_info}</b>\n"
-            telegram_message += f"Instructor: {change['instructor']}\n"
-            telegram_message += f"CRN: {change['crn']}\n"
-            telegram_message += f"Status: {change['old_status']} → {change['new_status']}\n\n"
+            blocks.append(
+                f"📚 <b>{course_info}</b>\n"
+                f"Instructor: {change.instructor}\n"
+                f"CRN: {change.crn}\n"
+                f"{detail}"
+            )
+
+            if change.new_status == 'Available' and change.old_status in ['Full', 'Closed', 'Not tracked']:
+                opened = True
 
-            if change['new_status'] == 'Available' and change['old_status'] in ['Full', 'Closed', 'Not tracked']:
-                print('\a')  # System beep
-                telegram_message = "🚨 COURSE AVAILABLE! 🚨\n\n" + telegram_message
+        if opened:
+            if os.environ.get('ALERT_BELL') == '1':
+                print('\a', end='', flush=True)  # Opt-in terminal bell for attended runs
+            blocks.insert(0, "🚨 COURSE AVAILABLE! 🚨")
+        return "\n\n".join(blocks)
 
-        self.send_message(telegram_message)
+    def alert_changes(self, changes):
+        """Alert user of any changes via console and Telegram, once the gate lets them through"""
+        changes = self.gate.process(changes)
+        if not changes:
+            return
+
+        self.send_message(self.format_changes(changes))
+
+
+class AsyncTelegramNotifier:
+    """
+    Telegram notifier for the asyncio monitor.
+
+    Sends go through a TelegramNotifier, so the pipeline gets the same durable outbox, rate limit,
+    coalescing and retries; its sender thread does the HTTP work, so the event loop never waits on it.
+    """
+
+    def __init__(self, token=None, chat_id=None, gate=None, notifier=None, **options):
+        self.owns_notifier = notifier is None
+        self.notifier = notifier or TelegramNotifier(token, chat_id, gate=gate, **options)
+        self.gate = gate if gate is not None else self.notifier.gate  # Shared, so held changes carry over
+
+    async def send_message(self, message):
+        """Queue a message in the outbox for delivery"""
+        await asyncio.get_running_loop().run_in_executor(None, self.notifier.send_message, message)
+
+    async def alert_changes(self, changes):
+        """Alert user of any changes via console and Telegram, once the gate lets them through"""
+        changes = self.gate.process(changes)
+        if not changes:
+            return
 
+        await self.send_message(TelegramNotifier.format_changes(changes))
 
+    async def close(self, timeout=30):
+        """Queue the pending digest and wait for the outbox to drain; undelivered messages stay in it"""
+        digest = self.gate.drain()
+        if digest:
+            await self.send_message(TelegramNotifier.format_changes(digest))
+        loop = asyncio.get_running_loop()
+        if self.owns_notifier:
+            await loop.run_in_executor(None, self.notifier.close, timeout)
+        else:
+            await loop.run_in_executor(None, self.notifier.flush, timeout)
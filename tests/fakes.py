@@ -0,0 +1,215 @@
+"""Test doubles that stand in for Chrome, the Banner portal and the Telegram Bot API, so those paths run offline."""
+import time
+from selenium.common.exceptions import NoSuchElementException
+from src.parsing.course_table import ROW_CLASS, build_tree, decode_page
+
+
+# What Chrome shows for the fixture header row and for a course row, cell by cell
+HEADER_TEXTS = ['Select', 'Status', 'CRN', 'Subj', 'Crse', 'Title', 'Campus', 'Dates', 'Instructor']
+CELL_FIELDS = ['status', 'crn', 'subject', 'course_num', 'title', 'campus', 'dates', 'instructor']
+
+
+def rendered_texts(rows, header_every=25):
+    """
+    Return the visible cell texts of a build_registration_page page from its build_registration_rows
+    values, header rows included, so the fake driver's text never comes from the parser under test.
+    """
+    texts = []
+    for i, row in enumerate(rows):
+        if header_every and i % header_every == 0:
+            texts.append(list(HEADER_TEXTS))
+        texts.append([''] + [row[field] for field in CELL_FIELDS])
+    return texts
+
+
+class FakeWebElement:
+    """WebElement over an offline Element; every call counts as one chromedriver round trip."""
+
+    def __init__(self, element, driver, texts):
+        self.element = element
+        self.driver = driver
+        self.texts = texts  # Cell texts for a row, the rendered string for a cell
+
+    def _cell(self, index):
+        cells = self.element.cells()
+        if index > len(cells):
+            raise NoSuchElementException(f"./td[{index}]")
+        return cells[index - 1]
+
+    def find_element(self, by, xpath):
+        # Only the lookups browser_utils makes: ./td[i] and ./td[i]//a
+        self.driver.round_trip()
+        index = int(xpath.split('[', 1)[1].split(']', 1)[0])
+        cell = self._cell(index)
+        if xpath.endswith('//a'):
+            cell = cell.find('a')
+            if cell is None:
+                raise NoSuchElementException(xpath)
+        return FakeWebElement(cell, self.driver, self.texts[index - 1])
+
+    def find_elements(self, by, xpath):
+        # .//input[@type='checkbox']
+        self.driver.round_trip()
+        return [FakeWebElement(node, self.driver, '') for node in self.element.iter('input')
+                if node.attrs.get('type') == 'checkbox']
+
+    def get_attribute(self, name):
+        self.driver.round_trip()
+        if name == 'checked':
+            return 'true' if 'checked' in self.element.attrs else None
+        return self.element.attrs.get(name)
+
+    @property
+    def text(self):
+        self.driver.round_trip()
+        return ' '.join(self.texts) if isinstance(self.texts, list) else self.texts
+
+
+class FakeWebDriver:
+    """
+    Serves a saved page to code written against selenium's driver, with a simulated latency per call.
+
+    Element structure comes from the page, but element text comes from `row_texts` (one list of cell
+    strings per course or header row, e.g. from rendered_texts), like Chrome's own rendering would.
+    """
+
+    def __init__(self, page, row_texts, latency=0.0):
+        self.page = decode_page(page)
+        self.root = build_tree(self.page)
+        self.rows = [row for row in self.root.iter('tr') if ROW_CLASS in row.attrs.get('class', '')]
+        if len(self.rows) != len(row_texts):
+            raise ValueError(f"{len(self.rows)} rows on the page, {len(row_texts)} given texts")
+        self.row_texts = row_texts
+        self.latency = latency
+        self.round_trips = 0
+
+    def round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def page_source(self):
+        self.round_trip()
+        return self.page
+
+    def find_elements(self, by, xpath):
+        # //tr[contains(@class, 'RegPageHeader') or ...]
+        self.round_trip()
+        return [FakeWebElement(row, self, texts) for row, texts in zip(self.rows, self.row_texts)]
+
+
+class FakeTelegramAPI:
+    """
+    Local HTTP server answering sendMessage like the Bot API.
+
+    `fail(text_prefix, times)` makes the next `times` sends of a chunk starting with `text_prefix`
+    answer 500, or 429 with `retry_after` when that is given. Every successfully delivered text is kept in `delivered`, in order.
+    """
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs
+
+        api = self
+        self.delivered = []
+        self.failures = {}
+        self.lock = threading.Lock()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                form = parse_qs(self.rfile.read(int(self.headers['Content-Length'])).decode())
+                text = form.get('text', [''])[0]
+                with api.lock:
+                    prefix = next((p for p, (left, _) in api.failures.items() if left and text.startswith(p)), None)
+                    if prefix is not None:
+                        left, retry_after = api.failures[prefix]
+                        api.failures[prefix] = (left - 1, retry_after)
+                        if retry_after is None:
+                            status, body = 500, b'{"ok": false, "description": "Internal Server Error"}'
+                        else:
+                            status = 429
+                            body = ('{"ok": false, "error_code": 429, "parameters": {"retry_after": %d}}'
+                                    % retry_after).encode()
+                    else:
+                        api.delivered.append(text)
+                        status, body = 200, b'{"ok": true, "result": {}}'
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def fail(self, text_prefix, times, retry_after=None):
+        with self.lock:
+            self.failures[text_prefix] = (times, retry_after)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakePortal:
+    """
+    Local stand-in for the Banner results page that records every request it answers.
+
+    `requests` holds (method, path, query, body, cookie header) per request. Set `login_redirect`
+    to bounce requests to the portal login, or `status` to answer with that HTTP status.
+    """
+
+    def __init__(self, page):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import urlparse
+
+        portal = self
+        self.page = page
+        self.requests = []
+        self.login_redirect = False
+        self.status = 200
+
+        class Handler(BaseHTTPRequestHandler):
+            def serve(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode() if length else ''
+                url = urlparse(self.path)
+                portal.requests.append((self.command, url.path, url.query, body, self.headers.get('Cookie')))
+                if url.path == '/twbkwbis.P_WWWLogin':
+                    self.respond(200, b'<form name="loginform"><input name="loginfmt"></form>')
+                elif portal.login_redirect:
+                    self.send_response(302)
+                    self.send_header('Location', '/twbkwbis.P_WWWLogin')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                else:
+                    self.respond(portal.status, portal.page)
+
+            def respond(self, status, body):
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = serve
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/wwskregs.P_WebRegs"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
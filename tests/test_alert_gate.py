@@ -0,0 +1,186 @@
+"""Per-CRN alert state machine: hysteresis, cooldown, flapping, persistence and release on quiet polls (user-023)."""
+import asyncio
+import time
+from src.async_monitor import AsyncRegistrationMonitor
+from src.models.change import ChangeEvent
+from src.models.course import Course
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.parsing.fixtures import build_registration_page
+from src.replay import ReplayPoller
+from src.utils.alert_utils import AlertGate
+
+T0 = 1_000_000.0
+
+
+def status_change(crn, old_status, new_status):
+    course = Course.create('COMP', '10279', 'Databases', crn, new_status, 'J. Smith', 'Fennell Campus', '')
+    return ChangeEvent('status', course, old_status, new_status)
+
+
+def opening(crn='20001'):
+    return status_change(crn, 'Full', 'Available')
+
+
+def closing(crn='20001'):
+    return status_change(crn, 'Available', 'Full')
+
+
+def test_opening_goes_out_at_once():
+    gate = AlertGate(hysteresis=120, cooldown=600, digest_window=300)
+    assert gate.process([opening()], T0) == [opening()]
+
+
+def test_hysteresis_holds_other_changes():
+    gate = AlertGate(hysteresis=120, cooldown=600, digest_window=300)
+    assert gate.process([closing()], T0) == []
+    assert gate.process([], T0 + 119) == []
+    assert gate.digest == []
+    # Due after the hysteresis, then sent once the digest window closes
+    assert gate.process([], T0 + 120) == []
+    assert gate.digest == [closing()]
+    assert gate.process([], T0 + 420) == [closing()]
+
+
+def test_cooldown_after_an_alert():
+    gate = AlertGate(hysteresis=120, cooldown=600, digest_window=0)
+    assert gate.process([opening()], T0) == [opening()]
+    gate.process([closing()], T0 + 10)
+    # Past the hysteresis but still inside the cooldown of the opening alert
+    assert gate.process([], T0 + 300) == []
+    assert gate.process([], T0 + 600) == [closing()]
+    # The opening cooldown has passed, so the reopening goes straight out
+    assert gate.process([opening()], T0 + 650) == [opening()]
+
+
+def test_flap_back_is_dropped():
+    gate = AlertGate(hysteresis=120, cooldown=600, digest_window=0)
+    gate.process([closing()], T0)
+    assert gate.process([opening()], T0 + 60) == []
+    assert gate.process([], T0 + 3600) == []
+    assert gate.suppressed == 1
+    assert not gate.pending_crns
+
+
+def test_held_changes_and_digest_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'alerts.db')
+    gate = AlertGate(path, scope='42', hysteresis=120, cooldown=600, digest_window=300)
+    gate.process([closing('20001'), closing('20002')], T0)
+    gate.close()
+
+    gate = AlertGate(path, scope='42', hysteresis=120, cooldown=600, digest_window=300)
+    assert gate.pending_crns == {'20001', '20002'}
+    assert gate.process([], T0 + 120) == []
+    gate.close()  # Crash before the digest window closes: 'told' is already saved
+
+    gate = AlertGate(path, scope='42', hysteresis=120, cooldown=600, digest_window=300)
+    assert gate.digest == [closing('20001'), closing('20002')]
+    assert gate.process([], T0 + 420) == [closing('20001'), closing('20002')]
+    gate.close()
+
+    # Once handed off, the digest is gone, and another scope never saw it
+    assert AlertGate(path, scope='42').digest == []
+    assert AlertGate(path, scope='7').entries == {}
+
+
+def test_eviction_cap(tmp_path):
+    gate = AlertGate(str(tmp_path / 'alerts.db'), hysteresis=120, cooldown=600, digest_window=0, max_tracked=3)
+    gate.process([closing('20000')], T0)  # Held, so never evicted
+    for index in range(1, 6):
+        gate.process([opening(str(20000 + index))], T0 + index)
+    assert len(gate.entries) == 3
+    assert list(gate.entries) == ['20000', '20004', '20005']
+    stored = gate.conn.execute("SELECT COUNT(*) FROM alert_state").fetchone()[0]
+    assert stored == 3
+    gate.close()
+
+
+def pages():
+    # 20008 goes Available -> Full (held by the gate), then the page stays the same
+    first = build_registration_page(10, statuses={'20008': 'Available'})
+    second = build_registration_page(10, statuses={'20008': 'Full'})
+    return [(first, set()), (second, {'20008'})] + [(second, set())] * 4
+
+
+class GatedNotifier:
+    def __init__(self, gate):
+        self.gate = gate
+        self.sent = []
+
+    def send_message(self, message):
+        pass
+
+    def alert_changes(self, changes):
+        changes = self.gate.process(changes)
+        if changes:
+            self.sent.append([change.crn for change in changes])
+
+
+class AsyncGatedNotifier(GatedNotifier):
+    async def alert_changes(self, changes):
+        super().alert_changes(changes)
+
+    async def close(self):
+        pass
+
+
+def make_monitor(tmp_path, notifier):
+    return RegistrationMonitor(
+        json_file=None, state_db=str(tmp_path / 'states.db'), session_file=str(tmp_path / 'session.json'),
+        notifier=notifier, watchlist=Watchlist(), poller=ReplayPoller(pages())
+    )
+
+
+def test_unchanged_polls_release_held_changes(tmp_path):
+    notifier = GatedNotifier(AlertGate(hysteresis=0.1, cooldown=0, digest_window=0))
+    monitor = make_monitor(tmp_path, notifier)
+    try:
+        monitor.poll_once()
+        monitor.poll_once()
+        assert notifier.sent == []
+        time.sleep(0.15)
+        assert monitor.poll_once() == []  # Course table unchanged
+        assert notifier.sent == [['20008']]
+    finally:
+        monitor.close()
+
+
+def test_async_unchanged_polls_release_held_changes(tmp_path):
+    gate = AlertGate(hysteresis=0.1, cooldown=0, digest_window=0)
+    notifier = AsyncGatedNotifier(gate)
+    monitor = make_monitor(tmp_path, notifier)
+    try:
+        pipeline = AsyncRegistrationMonitor(monitor, notifier=notifier, interval=0.05)
+        asyncio.run(pipeline.run(max_polls=6))
+    finally:
+        monitor.close()
+    assert notifier.sent == [['20008']]
+
+
+def test_targets_sharing_a_chat_keep_separate_alert_state(tmp_path):
+    from src.utils.telegram_utils import TelegramNotifier
+
+    path = str(tmp_path / 'outbox.db')
+
+    def gates():
+        # Two scheduler targets (account x term) alerting the same chat through the same outbox file
+        return [TelegramNotifier('TOKEN', '42', outbox_file=path, scope=key).gate for key in ('alice_559', 'alice_561')]
+
+    first, second = gates()
+    assert first.scope != second.scope
+    for gate in (first, second):
+        gate.hysteresis, gate.digest_window = 120, 300
+        gate.process([closing('20001')], T0)
+        gate.process([], T0 + 120)
+    # Handing one target's digest off must not clear the other's
+    assert first.drain() == [closing('20001')]
+    first.close()
+    second.close()
+
+    first, second = gates()
+    assert first.digest == []
+    assert second.digest == [closing('20001')]
+    assert first.process([], T0 + 1000) == []
+    assert second.process([], T0 + 1000) == [closing('20001')]
+    first.close()
+    second.close()
@@ -0,0 +1,129 @@
+"""Availability rollups over status_history and the analytics CLI's guard on the live database (user-022)."""
+import sys
+from datetime import datetime
+import pytest
+from src import analytics
+from src.models.course import Course
+from src.utils.state_store import INSERT_COURSE, StateStore
+
+COURSES = {
+    '20001': Course.create('COMP', '10279', 'Databases', '20001', 'Full', 'J. Smith', 'Main', ''),
+    '20002': Course.create('COMP', '10279', 'Databases', '20002', 'Full', 'J. Smith', 'Main', ''),
+    '20003': Course.create('MATH', '10001', 'Calculus', '20003', 'Available', 'Staff', 'Main', ''),
+}
+
+
+def at(hour, minute=0):
+    # Local time, like the hour-of-day rollup
+    return datetime(2026, 1, 5, hour, minute).timestamp()
+
+
+HISTORY = [
+    ('20001', None, 'Full', at(8)),
+    ('20002', None, 'Full', at(8)),
+    ('20003', None, 'Available', at(8)),  # Already Available when first seen: that spell's start is unknown
+    ('20003', 'Available', 'Full', at(8, 30)),
+    ('20001', 'Full', 'Available', at(9, 10)),
+    ('20002', 'Full', 'Available', at(9, 30)),
+    ('20001', 'Available', 'Full', at(9, 40)),  # 30 minutes
+    ('20002', 'Available', 'Full', at(11, 30)),  # 2 hours
+    ('20001', 'Full', 'Available', at(14, 5)),
+    ('20001', 'Available', 'Full', at(14, 15)),  # 10 minutes
+    ('20003', 'Full', 'Available', at(22)),  # Still Available
+]
+
+
+def seed(path, history=HISTORY):
+    store = StateStore(path)
+    with store.conn:
+        store.conn.executemany(INSERT_COURSE, [course + (at(8),) for course in COURSES.values()])
+        store.conn.executemany(
+            "INSERT INTO status_history (crn, old_status, new_status, observed_at) VALUES (?, ?, ?, ?)", history
+        )
+    return store
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = seed(str(tmp_path / 'states.db'))
+    assert store.analytics.rebuild() == 3
+    yield store
+    store.close()
+
+
+def test_openings_by_hour(store):
+    counts = store.analytics.openings_by_hour()
+    assert {hour: count for hour, count in counts.items() if count} == {9: 2, 14: 1, 22: 1}
+    assert len(counts) == 24
+    assert store.analytics.openings_by_hour(subject='COMP')[22] == 0
+    assert store.analytics.openings_by_hour(crn='20003')[22] == 1
+
+
+def test_availability_is_the_mean_closed_spell(store):
+    # 20003 has no closed spell with a known start, so it is left out
+    assert store.analytics.availability() == [
+        ('20001', 'COMP', '10279', 2, 1200.0),
+        ('20002', 'COMP', '10279', 1, 7200.0),
+    ]
+    assert store.analytics.availability(crn='20002') == [('20002', 'COMP', '10279', 1, 7200.0)]
+    assert store.analytics.availability(limit=1) == [('20001', 'COMP', '10279', 2, 1200.0)]
+
+
+def test_churn_groups_sections_by_course(store):
+    assert store.analytics.churn() == [('COMP', '10279', 2, 6, 3), ('MATH', '10001', 1, 2, 1)]
+    assert store.analytics.churn(subject='MATH') == [('MATH', '10001', 1, 2, 1)]
+
+
+def test_suggested_windows(store):
+    assert store.analytics.suggest_windows(fast_interval=120, slow_interval=1800) == (
+        "00:00-09:00=1800,09:00-10:00=120,10:00-14:00=1800,14:00-15:00=120,"
+        "15:00-22:00=1800,22:00-23:00=120,23:00-24:00=1800"
+    )
+
+
+def test_recorded_transitions_match_a_rebuild(tmp_path, store):
+    incremental = seed(str(tmp_path / 'incremental.db'), history=[])
+    try:
+        incremental.analytics.record([
+            (COURSES[crn], old_status, new_status, observed_at)
+            for crn, old_status, new_status, observed_at in HISTORY
+        ])
+        query = "SELECT * FROM crn_stats ORDER BY crn"
+        assert incremental.conn.execute(query).fetchall() == store.conn.execute(query).fetchall()
+        assert incremental.analytics.openings_by_hour() == store.analytics.openings_by_hour()
+    finally:
+        incremental.close()
+
+
+def run_cli(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['analytics', *args])
+    analytics.main()
+
+
+def test_synthetic_needs_an_explicit_db(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, 'synthetic', '--sections', '4', '--days', '1')
+    assert not (tmp_path / 'course_states.db').exists()
+
+
+def test_synthetic_refuses_a_db_with_course_data(tmp_path, monkeypatch, store):
+    counts = "SELECT (SELECT COUNT(*) FROM courses), (SELECT COUNT(*) FROM status_history)"
+    before = store.conn.execute(counts).fetchone()
+    with pytest.raises(SystemExit):
+        run_cli(monkeypatch, '--db', str(tmp_path / 'states.db'), 'synthetic', '--sections', '4', '--days', '1')
+    assert store.conn.execute(counts).fetchone() == before
+
+
+def test_synthetic_fills_a_new_db_for_queries(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'synthetic.db')
+    run_cli(monkeypatch, '--db', path, 'synthetic', '--sections', '8', '--days', '7')
+    assert 'transitions to' in capsys.readouterr().out
+
+    run_cli(monkeypatch, '--db', path, 'churn', '--limit', '1')
+    assert 'transitions' in capsys.readouterr().out
+    synthetic = StateStore(path)
+    try:
+        assert synthetic.conn.execute("SELECT COUNT(*) FROM crn_stats").fetchone()[0] == 8
+    finally:
+        synthetic.close()
@@ -0,0 +1,115 @@
+"""A slow notifier must not delay polls or lose alerts in the asyncio pipeline (user-006)."""
+import asyncio
+import time
+from src.async_monitor import AsyncRegistrationMonitor
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.parsing.fixtures import build_page_sequence
+from src.replay import ReplayPoller
+
+POLLS = 12
+INTERVAL = 0.05
+NOTIFY_SECONDS = 0.4  # Eight poll intervals per alert
+
+
+class SlowNotifier:
+    """Async notifier stub whose every alert takes NOTIFY_SECONDS."""
+
+    def __init__(self):
+        self.batches = []
+
+    async def alert_changes(self, changes):
+        if changes:
+            await asyncio.sleep(NOTIFY_SECONDS)
+            self.batches.append(changes)
+
+    async def close(self):
+        pass
+
+
+class TimedPoller(ReplayPoller):
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.fetched_at = []
+
+    def fetch(self):
+        self.fetched_at.append(time.monotonic())
+        return super().fetch()
+
+
+class QuietNotifier:
+    def send_message(self, message):
+        pass
+
+
+def test_slow_notifier_does_not_delay_polls_or_drop_alerts(tmp_path):
+    # Every poll flips at least one section, so every poll after the first produces changes
+    pages = [(page, changed) for page, changed in build_page_sequence(POLLS * 3, row_count=40, flips_per_poll=2, seed=1)
+             if changed][:POLLS]
+    poller = TimedPoller(pages)
+    monitor = RegistrationMonitor(
+        json_file=None, state_db=str(tmp_path / "states.db"), session_file=str(tmp_path / "session.json"),
+        notifier=QuietNotifier(), watchlist=Watchlist(), poller=poller
+    )
+    notifier = SlowNotifier()
+    pipeline = AsyncRegistrationMonitor(monitor, notifier=notifier, interval=INTERVAL, queue_size=2)
+    detected = []
+    check_for_changes = monitor.check_for_changes
+
+    def record_changes(current_states):
+        changes = check_for_changes(current_states)
+        detected.extend(changes)
+        return changes
+
+    monitor.check_for_changes = record_changes
+
+    started = time.monotonic()
+    try:
+        asyncio.run(pipeline.run(max_polls=POLLS))
+    finally:
+        monitor.close()
+
+    gaps = [b - a for a, b in zip(poller.fetched_at, poller.fetched_at[1:])]
+    assert len(poller.fetched_at) == POLLS
+    # Polls keep their cadence although alerting takes eight intervals each
+    assert max(gaps) < INTERVAL + 0.1
+    assert poller.fetched_at[-1] - started < POLLS * INTERVAL + 0.5
+    # Backed-up change lists were merged, not dropped
+    assert len(notifier.batches) < POLLS - 1
+    assert [change for batch in notifier.batches for change in batch] == detected
+
+
+
+class QuietAsyncNotifier:
+    async def alert_changes(self, changes):
+        pass
+
+    async def close(self):
+        pass
+
+
+def test_pipeline_fetches_shards(tmp_path):
+    from src.sharding import SubjectStandInServer
+    from src.utils.http_utils import HttpPoller
+
+    from src.utils.metrics import METRICS
+
+    subjects = ['COMP', 'MATH']
+    http_loads = METRICS.navigations.value(kind='http')
+    server = SubjectStandInServer(subjects, rows_per_subject=30, latency=0)
+    monitor = RegistrationMonitor(
+        json_file=None, state_db=str(tmp_path / "states.db"), session_file=str(tmp_path / "session.json"),
+        notifier=QuietNotifier(), watchlist=Watchlist(), shards=subjects, shard_workers=2,
+        poller=HttpPoller(server.url, method='POST', form_data=[['term_in', '559']])
+    )
+    try:
+        pipeline = AsyncRegistrationMonitor(monitor, notifier=QuietAsyncNotifier(), interval=INTERVAL)
+        asyncio.run(pipeline.run(max_polls=3))
+        # The unsharded search would have been answered 404; both subject pages were parsed instead
+        assert {name: len(courses) for name, courses in monitor.shard_pool.snapshots.items()} == {'COMP': 30, 'MATH': 30}
+        assert len(monitor.previous_states) == 30  # Stand-in pages reuse the same CRNs
+        assert monitor.navigation_counts['http'] == 3
+        assert METRICS.navigations.value(kind='http') - http_loads == 3
+    finally:
+        monitor.close()
+        server.close()
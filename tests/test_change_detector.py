@@ -0,0 +1,119 @@
+"""CRN-keyed change detection: watchlist scoping and cost against the old dict diff (user-012)."""
+import random
+import pytest
+from src.models.course import Course
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.replay import ReplayPoller
+from src.utils.diff_utils import ChangeDetector
+from src.utils.state_store import StateStore
+
+SECTIONS = 10000
+CHANGES_PER_POLL = 5
+
+
+def catalogue(count):
+    return {
+        str(20000 + i): Course.create('COMP', str(10000 + i // 4), f'Course {i // 4}', str(20000 + i),
+                                      'Full', 'J. Smith', 'Fennell Campus', 'Jan 06-Apr 20')
+        for i in range(count)
+    }
+
+
+def legacy_check_for_changes(previous_states, current_states):
+    """RegistrationMonitor.check_for_changes before ChangeDetector, kept as the benchmark baseline."""
+    changes = []
+    for crn, current in current_states.items():
+        if crn in previous_states:
+            previous = previous_states[crn]
+            if current.status != previous.status:
+                changes.append({
+                    'crn': crn,
+                    'subject': current.subject,
+                    'course_num': current.course_num,
+                    'title': current.title,
+                    'instructor': current.instructor,
+                    'old_status': previous.status,
+                    'new_status': current.status
+                })
+        else:
+            changes.append({
+                'crn': crn,
+                'subject': current.subject,
+                'course_num': current.course_num,
+                'title': current.title,
+                'instructor': current.instructor,
+                'old_status': 'Not tracked',
+                'new_status': current.status
+            })
+    return changes
+
+
+class QuietNotifier:
+    def send_message(self, message):
+        pass
+
+
+def test_reports_added_removed_and_field_changes():
+    previous = catalogue(4)
+    current = dict(previous)
+    del current['20000']
+    current['20001'] = current['20001']._replace(status='Available', campus='Online')
+    current['20009'] = Course.create('MATH', '10001', 'Calculus', '20009', 'Full', 'TBA', 'Online', '')
+    changes = ChangeDetector().diff(previous, current)
+    assert [(change.kind, change.crn) for change in changes] == [
+        ('added', '20009'), ('removed', '20000'), ('status', '20001'), ('campus', '20001')
+    ]
+
+
+def test_unwatched_stored_sections_are_not_removed(tmp_path):
+    path = str(tmp_path / 'states.db')
+    store = StateStore(path)
+    stored = catalogue(50)
+    store.save(stored)
+    store.close()
+
+    watchlist = Watchlist(['20001', '20002'])
+    monitor = RegistrationMonitor(
+        json_file=None, state_db=path, session_file=str(tmp_path / 'session.json'),
+        notifier=QuietNotifier(), watchlist=watchlist, poller=ReplayPoller([])
+    )
+    try:
+        current = {crn: stored[crn] for crn in ('20001', '20002')}
+        current['20002'] = current['20002']._replace(status='Available')
+        changes = monitor.check_for_changes(current)
+        assert [(change.kind, change.crn) for change in changes] == [('status', '20002')]
+        # The 48 unwatched rows were dropped from the store, not just hidden from the diff
+        assert sorted(monitor.state_store.load_all()) == ['20001', '20002']
+        assert monitor.state_store.conn.execute("SELECT COUNT(*) FROM courses").fetchone()[0] == 2
+    finally:
+        monitor.close()
+
+
+def test_watchlist_filters_previous_states_before_diffing():
+    previous = catalogue(50)
+    current = {crn: previous[crn] for crn in ('20001', '20002')}
+    detector = ChangeDetector(Watchlist(['20001', '20002']))
+    assert detector.diff(previous, current) == []
+    assert len(ChangeDetector().diff(previous, current)) == 48
+
+
+def flipped(states, rng):
+    states = dict(states)
+    for crn in rng.sample(sorted(states), CHANGES_PER_POLL):
+        course = states[crn]
+        states[crn] = course._replace(status='Available' if course.status == 'Full' else 'Full')
+    return states
+
+
+@pytest.mark.benchmark(group='diff-10k')
+@pytest.mark.parametrize('implementation', ['legacy', 'detector'])
+def test_benchmark_diff(benchmark, implementation):
+    previous = catalogue(SECTIONS)
+    current = flipped(previous, random.Random(0))
+    if implementation == 'legacy':
+        diff = legacy_check_for_changes
+    else:
+        diff = ChangeDetector().diff
+    changes = benchmark.pedantic(diff, args=(previous, current), rounds=20, iterations=1, warmup_rounds=1)
+    assert len(changes) == CHANGES_PER_POLL
@@ -0,0 +1,88 @@
+"""Per-row memory of the 10k-section catalogue, before and after compact Course records (user-010)."""
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass
+import pytest
+from src.models.course import Course
+from src.parsing.fixtures import CAMPUSES, DATES, INSTRUCTORS, SUBJECTS
+
+SECTIONS = 10000
+
+
+@dataclass
+class DataclassCourse:
+    """The record type parsing used before: a plain dataclass, copied into a dict per row."""
+    subject: str
+    course_num: str
+    title: str
+    crn: str
+    status: str
+    instructor: str
+    campus: str
+    dates: str
+
+
+def fresh(text):
+    """A new string object with the same value, like each one the HTML parser produces."""
+    return (text + ' ')[:-1]
+
+
+def parsed_rows(count=SECTIONS, seed=0):
+    rng = random.Random(seed)
+    return [
+        (fresh(SUBJECTS[i % len(SUBJECTS)]), fresh(str(10000 + (i * 7) % 900)), fresh(f'Course Title {i % 300}'),
+         str(20000 + i), fresh(rng.choice(['Available', 'Full', 'Registered'])), fresh(rng.choice(INSTRUCTORS)),
+         fresh(rng.choice(CAMPUSES)), fresh(rng.choice(DATES)))
+        for i in range(count)
+    ]
+
+
+def build_before(rows):
+    """Dataclass per row, then the 8-key dict copy that was kept as previous_states."""
+    states = {}
+    for fields in rows:
+        course = DataclassCourse(*fields)
+        states[course.crn] = {
+            'status': course.status, 'crn': course.crn, 'subject': course.subject,
+            'course_num': course.course_num, 'title': course.title, 'campus': course.campus,
+            'dates': course.dates, 'instructor': course.instructor
+        }
+    return states
+
+
+def build_after(rows):
+    return {course.crn: course for course in (Course.create(*fields) for fields in rows)}
+
+
+def retained_bytes(build):
+    """Bytes still allocated after building the catalogue, field strings included."""
+    gc.collect()
+    tracemalloc.start()
+    rows = parsed_rows()
+    states = build(rows)
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(states) == SECTIONS
+    return retained
+
+
+def test_compact_records_use_less_than_half_the_memory():
+    before, after = retained_bytes(build_before), retained_bytes(build_after)
+    assert after < before / 2, (before / SECTIONS, after / SECTIONS)
+
+
+def test_compact_records_are_interned():
+    states = build_after(parsed_rows(10))
+    campuses = {id(course.campus) for course in states.values() if course.campus == CAMPUSES[0]}
+    assert len(campuses) <= 1
+
+
+@pytest.mark.benchmark(group='catalogue-10k')
+@pytest.mark.parametrize('build', [build_before, build_after], ids=['dataclass+dict', 'interned-tuple'])
+def test_benchmark_catalogue(benchmark, build):
+    rows = parsed_rows()
+    benchmark.extra_info['bytes_per_row'] = round(retained_bytes(build) / SECTIONS)
+    benchmark(build, rows)
@@ -0,0 +1,156 @@
+"""Regression tests and benchmarks for the offline registration page parser (user-002)."""
+import tracemalloc
+from collections import Counter
+from types import SimpleNamespace
+import pytest
+from src.parsing.course_table import IncrementalPageParser, parse_course_rows, parse_registration_page
+from src.parsing.fixtures import FIXTURE_SIZES, SUBJECTS, build_fixture_corpus
+
+CORPUS = build_fixture_corpus()
+
+# Parsed output of the 10-row fixture (seed 0), one tuple per Course
+GOLDEN_10 = [
+    ('COMP', '10000', 'Course Title 0', '20000', 'Registered', 'M. Nguyen', 'IAHS Campus', 'Jan 06-Apr 20'),
+    ('MATH', '10007', 'Course Title 1', '20001', 'Registered', 'TBA', 'IAHS Campus', 'Mar 03-Apr 20'),
+    ('COMM', '10014', 'Course Title 2', '20002', 'Full', 'M. Nguyen', 'Online', 'Jan 06-Feb 28'),
+    ('ELEC', '10021', 'Course Title 3', '20003', 'Full', 'R. Brown', 'Fennell Campus', 'Mar 03-Apr 20'),
+    ('NURS', '10028', 'Course Title 4', '20004', 'Full', 'J. Smith', 'Stoney Creek Campus', 'Jan 06-Apr 20'),
+    ('BUSN', '10035', 'Course Title 5', '20005', 'Full', 'M. Nguyen', 'IAHS Campus', 'Jan 06-Apr 20'),
+    ('MECH', '10042', 'Course Title 6', '20006', 'Registered', 'R. Brown', 'Stoney Creek Campus', 'Jan 06-Feb 28'),
+    ('PHYS', '10049', 'Course Title 7', '20007', 'Registered', 'J. Smith', 'IAHS Campus', 'Mar 03-Apr 20'),
+    ('COMP', '10056', 'Course Title 8', '20008', 'Available', 'J. Smith', 'Fennell Campus', 'May 05-Aug 15'),
+    ('MATH', '10063', 'Course Title 9', '20009', 'Registered', 'M. Nguyen', 'Stoney Creek Campus', 'Jan 06-Feb 28'),
+]
+
+# Status mix of the larger fixtures, so a parser change that misreads checkboxes or links shows up
+STATUS_COUNTS = {
+    500: {'Full': 243, 'Available': 134, 'Registered': 123},
+    10000: {'Full': 5105, 'Available': 2448, 'Registered': 2447},
+}
+
+
+def test_ten_row_fixture():
+    assert [tuple(course) for course in parse_registration_page(CORPUS[10])] == GOLDEN_10
+
+
+@pytest.mark.parametrize('size', FIXTURE_SIZES)
+def test_fixture_rows_and_headers(size):
+    courses = parse_registration_page(CORPUS[size])
+    # Header rows (repeated every 25 courses) are skipped, every course row is kept in order
+    assert [course.crn for course in courses] == [str(20000 + i) for i in range(size)]
+    assert [course.subject for course in courses[:16]] == (SUBJECTS * 2)[:min(size, 16)]
+
+
+@pytest.mark.parametrize('size', sorted(STATUS_COUNTS))
+def test_fixture_status_mix(size):
+    assert Counter(course.status for course in parse_registration_page(CORPUS[size])) == STATUS_COUNTS[size]
+
+
+def test_accepts_str_and_bytes():
+    assert parse_registration_page(CORPUS[10].decode()) == parse_registration_page(CORPUS[10])
+
+
+def test_stats_counters():
+    stats = {}
+    parse_registration_page(CORPUS[500], stats=stats)
+    assert stats == {'rows': 520, 'skipped': 0, 'parsed': 500}
+
+
+NESTED_ROW_PAGE = (
+    '<table><tr class="RegPageHeader"><td></td><td><a>Full</a></td><td>20001</td><td>COMP</td><td>10279</td>'
+    '<td><a>Databases</a><table><tr><td>Lab required</td></tr></table></td><td><a>Fennell</a></td>'
+    '<td><a>Jan</a></td><td>Smith</td></tr>'
+    '<tr class="RegPageHeader"><td></td><td><a>Available</a></td><td>20002</td><td>COMP</td><td>10280</td>'
+    '<td><a>Networks</a></td><td><a>Online</a></td><td><a>Feb</a></td><td>Lee</td></tr></table>'
+)
+
+
+def test_incremental_parser_keeps_nested_tables_in_their_row():
+    courses = IncrementalPageParser().parse(NESTED_ROW_PAGE)
+    assert courses == parse_course_rows(NESTED_ROW_PAGE)
+    assert (courses[0].campus, courses[0].dates, courses[0].instructor) == ('Fennell', 'Jan', 'Smith')
+
+
+def course_row(crn, status='Full'):
+    return (f'<tr class="RegPageHeader"><td></td><td><a>{status}</a></td><td>{crn}</td><td>COMP</td><td>10279</td>'
+            f'<td><a>Databases</a></td><td><a>Fennell</a></td><td><a>Jan</a></td><td>Smith</td></tr>')
+
+
+# Banner can render one course table per search part; rows after the first table must not be lost
+TWO_TABLE_PAGE = (
+    f'<table>{course_row("20001")}{course_row("20002")}</table>'
+    f'<p>More results</p><table><tr><th>CRN</th></tr>{course_row("20003", "Available")}</table>'
+)
+
+
+def test_incremental_parser_reads_every_course_table():
+    courses = IncrementalPageParser().parse(TWO_TABLE_PAGE)
+    assert courses == parse_course_rows(TWO_TABLE_PAGE)
+    assert [course.crn for course in courses] == ['20001', '20002', '20003']
+
+
+def test_crn_watchlist_finds_rows_in_a_later_table():
+    from src.models.watchlist import Watchlist
+    stats = {}
+    courses = parse_course_rows(TWO_TABLE_PAGE, Watchlist(['20003']), stats)
+    assert [(course.crn, course.status) for course in courses] == [('20003', 'Available')]
+    assert stats == {'rows': 3, 'skipped': 2, 'parsed': 1}
+
+
+def test_incremental_parser_counts_reused_rows():
+    parser = IncrementalPageParser()
+    page = CORPUS[500].decode()
+    parser.parse(page)
+    stats = {}
+    # Flip one row so the page misses but every other row is reused
+    assert parser.parse(page.replace('>20007<', '>29999<', 1), stats) is not None
+    assert stats == {'rows': 520, 'skipped': 0, 'parsed': 500}
+    assert parser.stats['row_hits'] == 519
+
+
+def test_incremental_parser_does_not_cache_an_empty_page():
+    parser = IncrementalPageParser()
+    page = '<html><body>Session timed out</body></html>'
+    assert parser.parse(page) == []
+    assert parser.parse(page) == []
+    assert parser.stats['page_hits'] == 0
+
+
+@pytest.mark.benchmark(group='parser')
+@pytest.mark.parametrize('size', FIXTURE_SIZES)
+def test_benchmark_parser(benchmark, size):
+    page = CORPUS[size]
+    tracemalloc.start()
+    parse_registration_page(page)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    rounds = 3 if size >= 10000 else 10
+    courses = benchmark.pedantic(parse_registration_page, args=(page,), rounds=rounds, iterations=1)
+    assert len(courses) == size
+    if benchmark.stats:
+        benchmark.extra_info['rows_per_second'] = round(size / benchmark.stats.stats.mean)
+    benchmark.extra_info['peak_memory_mb'] = round(peak / 2 ** 20, 2)
+
+
+def test_page_cache_is_exported_through_metrics(tmp_path):
+    from src.models.watchlist import Watchlist
+    from src.monitor import RegistrationMonitor
+    from src.replay import ReplayPoller
+    from src.utils.metrics import METRICS
+
+    monitor = RegistrationMonitor(
+        json_file=None, state_db=str(tmp_path / 'states.db'), session_file=str(tmp_path / 'session.json'),
+        notifier=SimpleNamespace(send_message=print), watchlist=Watchlist(), poller=ReplayPoller([])
+    )
+    hits_before = METRICS.page_cache.value(level='page', result='hit')
+    rows_before = METRICS.page_cache.value(level='row', result='miss')
+    saved_before = METRICS.parse_seconds_saved.value()
+    try:
+        assert len(monitor.parse_course_info(CORPUS[500])) == 500
+        assert monitor.parse_course_info(CORPUS[500]) is None
+    finally:
+        monitor.close()
+    assert METRICS.page_cache.value(level='page', result='hit') == hits_before + 1
+    assert METRICS.page_cache.value(level='row', result='miss') == rows_before + 520
+    assert METRICS.parse_seconds_saved.value() > saved_before
@@ -0,0 +1,108 @@
+"""HTTP polling with the browser's session: cookies, form replay, login detection and recording (user-003)."""
+from types import SimpleNamespace
+import pytest
+from fakes import FakePortal
+from src.parsing.course_table import parse_registration_page
+from src.parsing.fixtures import build_registration_page
+from src.replay import ReplayPoller, StandInServer, load_recorded_pages
+from src.utils.http_utils import HttpPoller, RecordingPoller, SessionExpired
+
+PAGE = build_registration_page(10)
+FORM = {'data': [['term_in', '559'], ['sel_subj', 'dummy'], ['sel_subj', 'COMP']], 'method': 'POST'}
+
+
+@pytest.fixture
+def portal():
+    portal = FakePortal(PAGE)
+    yield portal
+    portal.close()
+
+
+def fake_driver(url):
+    cookies = [{'name': 'SESSID', 'value': 'abc123', 'domain': '127.0.0.1', 'path': '/'},
+               {'name': 'IDMSESSID', 'value': 'xyz', 'domain': '127.0.0.1', 'path': '/'}]
+    return SimpleNamespace(current_url=url, get_cookies=lambda: cookies,
+                           execute_script=lambda script: 'Mozilla/5.0 (Test)')
+
+
+def test_browser_cookies_and_user_agent_are_sent(portal):
+    poller = HttpPoller.from_driver(fake_driver(portal.url))
+    try:
+        assert poller.fetch() == PAGE
+        method, path, query, body, cookie = portal.requests[-1]
+        assert (method, path) == ('GET', '/wwskregs.P_WebRegs')
+        assert sorted(cookie.split('; ')) == ['IDMSESSID=xyz', 'SESSID=abc123']
+        assert {c['name']: c['value'] for c in poller.export_cookies()} == {'SESSID': 'abc123', 'IDMSESSID': 'xyz'}
+        assert poller.session.headers['User-Agent'] == 'Mozilla/5.0 (Test)'
+    finally:
+        poller.close()
+
+
+def test_captured_form_is_replayed(portal):
+    poller = HttpPoller.from_driver(fake_driver(portal.url), dict(FORM, action=portal.url))
+    try:
+        poller.fetch()
+        method, _, _, body, _ = portal.requests[-1]
+        # Repeated names keep their order, as the browser submitted them
+        assert (method, body) == ('POST', 'term_in=559&sel_subj=dummy&sel_subj=COMP')
+    finally:
+        poller.close()
+
+    poller = HttpPoller(portal.url, form_data=FORM['data'])
+    try:
+        poller.fetch()
+        method, _, query, body, _ = portal.requests[-1]
+        assert (method, query, body) == ('GET', 'term_in=559&sel_subj=dummy&sel_subj=COMP', '')
+    finally:
+        poller.close()
+
+
+def test_login_redirect_raises_session_expired(portal):
+    poller = HttpPoller(portal.url)
+    portal.login_redirect = True
+    try:
+        with pytest.raises(SessionExpired, match='login page'):
+            poller.fetch()
+    finally:
+        poller.close()
+
+
+def test_login_marker_in_page_raises_session_expired(portal):
+    portal.page = b'<html><a href="https://login.microsoftonline.com/common">Sign in</a></html>'
+    poller = HttpPoller(portal.url)
+    try:
+        with pytest.raises(SessionExpired):
+            poller.fetch()
+    finally:
+        poller.close()
+
+
+@pytest.mark.parametrize('status', [401, 403])
+def test_rejected_session_raises_session_expired(portal, status):
+    portal.status = status
+    poller = HttpPoller(portal.url)
+    try:
+        with pytest.raises(SessionExpired, match=str(status)):
+            poller.fetch()
+    finally:
+        poller.close()
+
+
+def test_recorded_pages_replay_byte_for_byte(tmp_path):
+    pages = [build_registration_page(10, statuses={'20008': status}) for status in ('Full', 'Available', 'Full')]
+    server = StandInServer(ReplayPoller([(page, set()) for page in pages]))
+    poller = RecordingPoller(HttpPoller(server.url, method='POST', form_data=[['term_in', '559']]), str(tmp_path))
+    try:
+        fetched = [poller.fetch() for _ in pages]
+        assert poller.url == server.url  # Everything but fetch goes to the wrapped poller
+    finally:
+        poller.close()
+        server.close()
+
+    assert fetched == pages
+    recorded = load_recorded_pages(str(tmp_path))
+    assert [page for page, _ in recorded] == pages
+    replay = ReplayPoller(recorded)
+    assert [parse_registration_page(replay.fetch()) for _ in pages] == [parse_registration_page(p) for p in pages]
+    # A new recorder in the same directory continues the numbering instead of overwriting
+    assert RecordingPoller(replay, str(tmp_path)).count == 3
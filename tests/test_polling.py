@@ -0,0 +1,97 @@
+"""Adaptive polling: tightening on changes, backing off when quiet, timeouts and clamps (user-007)."""
+import pytest
+from src.models.change import ChangeEvent
+from src.models.course import Course
+from src.utils.polling_utils import AdaptivePollingPolicy, parse_windows, simulate
+
+T0 = 1_000_000.0
+
+
+def status_change(crn='20001', new_status='Available'):
+    course = Course.create('COMP', '10279', 'Databases', crn, new_status, 'J. Smith', 'Fennell Campus', '')
+    return ChangeEvent('status', course, 'Full', new_status)
+
+
+def make_policy(**options):
+    # No jitter, so every interval is exact
+    options.setdefault('jitter', 0)
+    return AdaptivePollingPolicy(base_interval=600, min_interval=60, max_interval=3600,
+                                 history_window=3600, half_life=300, **options)
+
+
+def test_base_interval_without_history():
+    assert make_policy().next_interval(T0) == 600
+
+
+def test_tightens_after_a_change_and_relaxes_with_its_half_life():
+    policy = make_policy()
+    policy.record_changes([status_change()], now=T0)
+    assert policy.next_interval(T0) == 120  # 600 / (1 + 4 * 1)
+    assert policy.next_interval(T0 + 300) == 200  # One half-life later: 600 / (1 + 4 * 0.5)
+
+
+def test_only_status_changes_count():
+    policy = make_policy()
+    course = status_change().course
+    policy.record_changes([ChangeEvent('instructor', course, 'TBA', 'J. Smith')], now=T0)
+    assert not policy.history
+    assert policy.next_interval(T0) == 600
+
+
+def test_busy_crn_is_clamped_to_min_interval():
+    policy = make_policy()
+    policy.record_changes([status_change()] * 5, now=T0)
+    assert policy.next_interval(T0) == 60
+
+
+def test_backs_off_when_quiet_up_to_max_interval():
+    policy = make_policy()
+    policy.record_changes([status_change()], now=T0)
+    # The change has left the history window; only the quiet stretch is left
+    assert policy.next_interval(T0 + 7200) == 1800  # 600 * (1 + 7200 / 3600)
+    assert not policy.history
+    assert policy.next_interval(T0 + 36000) == 3600
+
+
+def test_timeouts_double_the_interval_until_a_change():
+    policy = make_policy()
+    policy.record_timeout()
+    assert policy.next_interval(T0) == 1200
+    policy.record_timeout()
+    assert policy.next_interval(T0) == 2400
+    policy.record_timeout()
+    assert policy.next_interval(T0) == 3600  # 4800, clamped
+    policy.record_changes([], now=T0)
+    assert policy.consecutive_timeouts == 0
+    assert policy.next_interval(T0) == 600
+
+
+def test_window_interval_is_clamped_too():
+    assert make_policy(windows=parse_windows("00:00-23:59=90")).next_interval(T0) == 90
+    assert make_policy(windows=parse_windows("00:00-23:59=10")).next_interval(T0) == 60
+    assert make_policy(windows=parse_windows("00:00-23:59=9000")).next_interval(T0) == 3600
+
+
+def test_watched_crns_limit_which_changes_tighten():
+    policy = make_policy(watched_crns=['20002'])
+    policy.record_changes([status_change('20001')], now=T0)
+    assert policy.next_interval(T0) == 600
+
+
+def test_jitter_stays_within_bounds():
+    policy = make_policy(jitter=0.1)
+    intervals = [policy.next_interval(T0) for _ in range(200)]
+    assert all(540 <= interval <= 660 for interval in intervals)
+
+
+def test_simulate_alerts_bursts_sooner_than_fixed_polling():
+    # A burst of openings and closings on one CRN, five minutes apart
+    log = [(T0 + 300 * i + 1, '20001', 'Available' if i % 2 == 0 else 'Full') for i in range(12)]
+    result = simulate(log, make_policy(), fixed_interval=600)
+    assert result['fixed']['page_loads'] == 7
+    assert result['fixed']['median_time_to_alert'] == 150  # Every other change waits a full 300 s
+    assert result['adaptive']['median_time_to_alert'] < result['fixed']['median_time_to_alert']
+
+
+def test_simulate_empty_log():
+    assert simulate([], make_policy()) == {}
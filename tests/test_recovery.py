@@ -0,0 +1,71 @@
+"""Backoff bounds and the circuit breaker's closed -> open -> half-open cycle (user-019)."""
+import random
+from src.utils.recovery_utils import Backoff, CircuitBreaker
+
+T0 = 1_000_000.0
+
+
+def test_backoff_stays_between_base_and_the_doubling_ceiling(monkeypatch):
+    backoff = Backoff(base=5, cap=600)
+    monkeypatch.setattr(random, 'uniform', lambda low, high: (low, high))
+    assert backoff.delay(0) == (5, 5)
+    assert backoff.delay(1) == (5, 10)
+    assert backoff.delay(3) == (5, 40)
+    assert backoff.delay(7) == (5, 600)  # 640, capped
+    assert backoff.delay(10_000) == (5, 600)
+
+
+def test_backoff_delays_are_jittered_within_bounds():
+    backoff = Backoff(base=5, cap=600)
+    delays = [backoff.delay(attempt) for attempt in range(12) for _ in range(50)]
+    assert all(5 <= delay <= 600 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_breaker_opens_at_the_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=900)
+    assert breaker.record_failure(T0) is False
+    assert breaker.record_failure(T0) is False
+    assert breaker.allow(T0) == 0
+    assert breaker.record_failure(T0) is True
+    assert breaker.state == 'open'
+    assert breaker.allow(T0 + 100) == 800
+
+
+def test_breaker_lets_one_attempt_through_when_half_open():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=900)
+    breaker.record_failure(T0)
+    assert breaker.allow(T0 + 899) == 1
+    assert breaker.allow(T0 + 900) == 0
+    assert breaker.state == 'half_open'
+
+
+def test_failed_half_open_attempt_doubles_the_timeout_up_to_the_max():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=900, max_reset_timeout=3000)
+    now = T0
+    breaker.record_failure(now)
+    timeouts = []
+    for _ in range(4):
+        now += breaker.reset_timeout
+        assert breaker.allow(now) == 0
+        assert breaker.record_failure(now) is True
+        assert breaker.state == 'open'
+        timeouts.append(breaker.reset_timeout)
+    assert timeouts == [1800, 3000, 3000, 3000]
+    assert breaker.allow(now + 2999) == 1
+
+
+def test_success_closes_the_breaker_and_resets_the_timeout():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=900)
+    breaker.record_failure(T0)
+    breaker.record_failure(T0)
+    breaker.allow(T0 + 900)
+    breaker.record_failure(T0 + 900)
+    assert breaker.reset_timeout == 1800
+
+    breaker.allow(T0 + 2700)
+    breaker.record_success()
+    assert (breaker.state, breaker.failures, breaker.reset_timeout) == ('closed', 0, 900)
+    # The count starts over, so a single failure no longer opens it
+    assert breaker.record_failure(T0 + 2800) is False
+    assert breaker.allow(T0 + 2800) == 0
@@ -0,0 +1,61 @@
+"""Scheduler targets share one login lock for every 2FA prompt and keep their own outboxes (user-005)."""
+import os
+import threading
+import time
+from types import SimpleNamespace
+from src.models.account import MonitorTarget
+from src.scheduler import MonitorScheduler
+
+LOGIN_SECONDS = 0.2
+
+
+def make_scheduler(tmp_path):
+    targets = [MonitorTarget('alice', 'alice@example.com', 'secret', term, telegram_chat_id='42',
+                             telegram_token='TOKEN') for term in ('559', '561')]
+    return MonitorScheduler(targets, pool_size=2, state_dir=str(tmp_path)), targets
+
+
+def test_each_target_has_its_own_outbox(tmp_path):
+    scheduler, targets = make_scheduler(tmp_path)
+    try:
+        outboxes = {scheduler.get_notifier(target).outbox.conn.execute("PRAGMA database_list").fetchone()[2]
+                    for target in targets}
+        assert outboxes == {os.path.join(str(tmp_path), f"telegram_outbox_alice_{term}.db") for term in ('559', '561')}
+    finally:
+        scheduler.close()
+
+
+def test_session_recovery_logins_never_overlap(tmp_path):
+    scheduler, targets = make_scheduler(tmp_path)
+    active, overlaps = [], []
+
+    def prompt_for_2fa():
+        # Stands in for the blocking unified_input prompt
+        active.append(1)
+        overlaps.append(len(active))
+        time.sleep(LOGIN_SECONDS)
+        active.pop()
+        return True
+
+    monitors = []
+    for target in targets:
+        monitor = scheduler.create_monitor(target)
+        monitor.start_browser = lambda monitor=monitor: setattr(monitor, 'driver', SimpleNamespace(quit=lambda: None))
+        monitor.start_login_process = prompt_for_2fa
+        monitor.navigate_to_registration = lambda: True
+        monitor.start_http_polling = lambda: None
+        scheduler.monitors[target.key] = monitor
+        monitors.append(monitor)
+
+    try:
+        assert all(monitor.login_lock is scheduler.login_lock for monitor in monitors)
+        # One target logs in for the first time while the other re-logs in after its session expired
+        threads = [threading.Thread(target=monitors[0].initialize),
+                   threading.Thread(target=monitors[1].recover_browser_session)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert overlaps == [1, 1]
+    finally:
+        scheduler.close()
@@ -0,0 +1,74 @@
+"""Owner-only session cache: TTL, cookie expiry, remaining() and the atomic 0600 save (user-004)."""
+import json
+import os
+import stat
+import time
+import pytest
+from src.utils.session_store import SessionStore
+
+COOKIES = [{'name': 'SESSID', 'value': 'abc123', 'domain': 'example.edu', 'path': '/'}]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / 'session.json'), ttl=3600)
+
+
+def test_save_is_owner_only_and_round_trips(store):
+    store.save(COOKIES, 'https://example.edu/results', 'POST', [['term_in', '559']], 'Mozilla/5.0')
+    assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+    assert not os.path.exists(f"{store.path}.tmp")
+    session = store.load()
+    assert (session['cookies'], session['url'], session['method'], session['form_data'], session['user_agent']) == (
+        COOKIES, 'https://example.edu/results', 'POST', [['term_in', '559']], 'Mozilla/5.0')
+
+
+def test_save_replaces_the_file_atomically(store):
+    store.save(COOKIES, 'https://example.edu/old')
+    inode = os.stat(store.path).st_ino
+    store.save(COOKIES, 'https://example.edu/new')
+    # os.replace swaps in a new file, so a reader never sees a half-written one
+    assert os.stat(store.path).st_ino != inode
+    assert store.load()['url'] == 'https://example.edu/new'
+
+
+def test_ttl_and_cookie_expiry_bound_the_session(store):
+    store.save(COOKIES, 'https://example.edu/results')
+    assert 3590 < store.remaining() <= 3600
+
+    expiring = [dict(COOKIES[0], expiry=int(time.time()) + 60)]
+    store.save(expiring, 'https://example.edu/results')
+    assert 50 < store.remaining() <= 60
+
+
+def test_expired_session_is_dropped(store):
+    store.save([dict(COOKIES[0], expiry=int(time.time()) - 1)], 'https://example.edu/results')
+    assert store.remaining() <= 0
+    assert store.load() is None
+    assert not os.path.exists(store.path)
+    assert store.remaining() is None
+
+
+def test_group_or_world_readable_file_is_ignored(store):
+    store.save(COOKIES, 'https://example.edu/results')
+    os.chmod(store.path, 0o644)
+    assert store.load() is None
+
+
+def test_missing_or_corrupt_file(store):
+    assert store.load() is None and store.remaining() is None
+    fd = os.open(store.path, os.O_WRONLY | os.O_CREAT, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write('{not json')
+    assert store.load() is None
+    store.clear()
+    store.clear()  # Clearing twice is fine
+    assert not os.path.exists(store.path)
+
+
+def test_ttl_defaults_to_session_ttl_env(tmp_path, monkeypatch):
+    monkeypatch.setenv('SESSION_TTL', '120')
+    store = SessionStore(str(tmp_path / 'session.json'))
+    store.save(COOKIES, 'https://example.edu/results')
+    with open(store.path) as f:
+        assert 110 < json.load(f)['expires_at'] - time.time() <= 120
@@ -0,0 +1,62 @@
+"""Sharded fetches: a shard that returns an error page must not erase its subject (user-020)."""
+from concurrent.futures import Future
+from types import SimpleNamespace
+import pytest
+from src.models.course import Course
+from src.sharding import ShardPool
+
+
+def course(crn, subject, status='Full'):
+    # Workers send plain tuples back across the process boundary
+    return tuple(Course.create(subject, '10279', 'Databases', crn, status, 'J. Smith', 'Fennell Campus', ''))
+
+
+class ScriptedExecutor:
+    """Stands in for the process pool, answering each shard from `results[name]`."""
+
+    def __init__(self):
+        self.results = {}
+
+    def submit(self, fn, spec, known_digest):
+        future = Future()
+        future.set_result(self.results[spec.name])
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def pool():
+    pool = ShardPool(['COMP', 'MATH'], workers=1)
+    pool.executor.shutdown()
+    pool.executor = ScriptedExecutor()
+    pool.specs = [SimpleNamespace(name=name) for name in pool.subjects]
+    yield pool
+    pool.close()
+
+
+def test_error_page_in_one_shard_keeps_its_snapshot(pool):
+    pool.executor.results = {
+        'COMP': ('COMP', b'c1', [course('20001', 'COMP')], {'rows': 1}, 0.0),
+        'MATH': ('MATH', b'm1', [course('20002', 'MATH')], {'rows': 1}, 0.0),
+    }
+    assert [c.crn for c in pool.fetch_all()] == ['20001', '20002']
+
+    # MATH answers with a login/error page: no course rows at all
+    pool.executor.results['COMP'] = ('COMP', b'c2', [course('20001', 'COMP', 'Available')],
+                                     {'rows': 1}, 0.0)
+    pool.executor.results['MATH'] = ('MATH', b'm-error', [], {'rows': 0, 'skipped': 0, 'parsed': 0}, 0.0)
+    with pytest.raises(Exception, match='MATH'):
+        pool.fetch_all()
+    assert pool.digests == {'COMP': b'c1', 'MATH': b'm1'}
+    assert [c.crn for c in pool.snapshots['MATH']] == ['20002']
+
+
+def test_shard_without_watched_rows_is_not_a_failure(pool):
+    pool.executor.results = {
+        'COMP': ('COMP', b'c1', [course('20001', 'COMP')], {'rows': 1}, 0.0),
+        'MATH': ('MATH', b'm1', [], {'rows': 40, 'skipped': 40, 'parsed': 0}, 0.0),
+    }
+    assert [c.crn for c in pool.fetch_all()] == ['20001']
+    assert pool.digests['MATH'] == b'm1'
@@ -0,0 +1,103 @@
+"""The page_source snapshot parser must match the cell-by-cell WebDriver path (user-001)."""
+import os
+from types import SimpleNamespace
+import pytest
+from fakes import FakeWebDriver, rendered_texts
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.parsing.course_table import build_tree, parse_course_rows, parse_registration_page
+from src.parsing.fixtures import build_registration_page, build_registration_rows
+
+# Typical chromedriver round trip on localhost; override to model a slower machine
+ROUND_TRIP_SECONDS = float(os.environ.get('BENCH_WEBDRIVER_RTT_MS', 1.0)) / 1000
+
+
+def fixture(rows, seed=0):
+    """Return a synthetic page and, built separately from the same rows, the text Chrome would show."""
+    return build_registration_page(rows, seed=seed), rendered_texts(build_registration_rows(rows, seed))
+
+
+def parse_live(page, row_texts, watchlist=None, latency=0.0):
+    """Run RegistrationMonitor.parse_course_rows_live against a fake driver serving `page`."""
+    driver = FakeWebDriver(page, row_texts, latency)
+    monitor = SimpleNamespace(driver=driver, watchlist=watchlist)
+    return RegistrationMonitor.parse_course_rows_live(monitor), driver
+
+
+def cell_text(html):
+    return build_tree(f'<table><tr><td>{html}</td></tr></table>').find('td').text
+
+
+@pytest.mark.parametrize('html, expected', [
+    ('A<br>B', 'A\nB'),
+    ('J. Smith,<br/>A. Patel', 'J. Smith,\nA. Patel'),
+    ('<div>X</div><div>Y</div>', 'X\nY'),
+    ('<p> spaced \n  out </p>', 'spaced out'),
+    ('Lab<script>var x = 1;</script>', 'Lab'),
+    ('&nbsp;TBA&nbsp;', 'TBA'),
+])
+def test_text_matches_webelement_text(html, expected):
+    assert cell_text(html) == expected
+
+
+def test_row_text_separates_cells():
+    row = build_tree('<table><tr><td>CRN</td><td>Subj</td></tr></table>').find('tr')
+    assert row.text == 'CRN Subj'
+
+
+@pytest.mark.parametrize('rows', [10, 200])
+def test_snapshot_matches_live_path(rows):
+    page, texts = fixture(rows, seed=rows)
+    live, _ = parse_live(page, texts)
+    assert parse_registration_page(page) == live
+    expected = [(row['crn'], row['status'], row['title'], row['instructor'])
+                for row in build_registration_rows(rows, seed=rows)]
+    assert [(c.crn, c.status, c.title, c.instructor) for c in live] == expected
+
+
+def test_live_path_reads_the_rendered_text():
+    page, texts = fixture(3)
+    texts[1][5] = 'Renamed In Chrome'  # Row 0 after the header, Title cell
+    live, _ = parse_live(page, texts)
+    assert live[0].title == 'Renamed In Chrome'
+    assert parse_registration_page(page) != live
+
+
+def test_snapshot_matches_live_path_with_watchlist():
+    page, texts = fixture(200, seed=3)
+    watchlist = Watchlist.from_string('20001,20150,MATH')
+    live, _ = parse_live(page, texts, watchlist)
+    assert parse_registration_page(page, watchlist) == live
+    assert live
+
+
+def test_multi_line_instructor_cell():
+    page, texts = fixture(3)
+    html = page.decode().replace('</td></tr>', '<br>Second Instructor</td></tr>')
+    for row in texts:
+        row[-1] += '\nSecond Instructor'
+    live, _ = parse_live(html.encode(), texts)
+    assert [c.instructor.split('\n')[1] for c in live] == ['Second Instructor'] * 3
+    assert [c.instructor.split('\n')[1] for c in parse_course_rows(html)] == ['Second Instructor'] * 3
+    assert parse_course_rows(html) == live
+
+
+@pytest.mark.benchmark(group='page-parse-200-rows')
+def test_benchmark_live_path(benchmark):
+    page, texts = fixture(200)
+    courses, driver = benchmark.pedantic(parse_live, args=(page, texts, None, ROUND_TRIP_SECONDS), rounds=1, iterations=1)
+    benchmark.extra_info['round_trips'] = driver.round_trips
+    assert len(courses) == 200
+
+
+@pytest.mark.benchmark(group='page-parse-200-rows')
+def test_benchmark_snapshot_path(benchmark):
+    page, texts = fixture(200)
+    driver = FakeWebDriver(page, texts, ROUND_TRIP_SECONDS)
+
+    def snapshot():
+        return parse_registration_page(driver.page_source)
+
+    courses = benchmark(snapshot)
+    benchmark.extra_info['round_trips'] = 1
+    assert len(courses) == 200
@@ -0,0 +1,125 @@
+"""SQLite state store: incremental writes, history, migration and write cost per poll (user-009)."""
+import json
+import random
+import pytest
+from src.models.course import Course
+from src.utils.state_store import StateStore
+
+SECTIONS = 10000
+CHANGES_PER_POLL = 5
+
+
+def catalogue(count=SECTIONS):
+    return {
+        str(20000 + i): Course.create('COMP', str(10000 + i // 4), f'Course {i // 4}', str(20000 + i),
+                                      'Full', 'J. Smith', 'Fennell Campus', 'Jan 06-Apr 20')
+        for i in range(count)
+    }
+
+
+def flip(states, rng, count=CHANGES_PER_POLL):
+    """Return a copy of `states` with `count` random sections flipped between Full and Available."""
+    states = dict(states)
+    for crn in rng.sample(sorted(states), count):
+        course = states[crn]
+        states[crn] = course._replace(status='Available' if course.status == 'Full' else 'Full')
+    return states
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(str(tmp_path / 'states.db'))
+    yield store
+    store.close()
+
+
+def test_only_changed_sections_are_written(store):
+    states = catalogue(100)
+    assert store.save(states) == 100
+    assert store.save(dict(states)) == 0
+    changed = flip(states, random.Random(0), 3)
+    assert store.save(changed) == 3
+    # Each poll hands over a new snapshot; the store keeps a reference to the last one
+    removed = dict(changed)
+    del removed['20000']
+    assert store.save(removed) == 1
+
+
+def test_reload_and_history(tmp_path):
+    path = str(tmp_path / 'states.db')
+    store = StateStore(path)
+    states = catalogue(10)
+    store.save(states)
+    states = dict(states, **{'20003': states['20003']._replace(status='Available')})
+    store.save(states)
+    store.close()
+
+    reopened = StateStore(path)
+    assert dict(reopened.states()) == states
+    assert [(old, new) for old, new, _ in reopened.history('20003')] == [(None, 'Full'), ('Full', 'Available')]
+    assert [crn for crn, _ in reopened.recent_changes(0)] == ['20003']
+    reopened.close()
+
+
+def test_json_migration(tmp_path):
+    legacy = tmp_path / 'course_states.json'
+    legacy.write_text(json.dumps({crn: course._asdict() for crn, course in catalogue(5).items()}))
+    store = StateStore(str(tmp_path / 'states.db'), legacy_json=str(legacy))
+    assert dict(store.states()) == catalogue(5)
+    # The import only runs into an empty store
+    assert store.import_json(str(legacy)) == 0
+    store.close()
+
+
+def test_prune_deletes_unwatched_sections_without_loading_them(tmp_path):
+    from src.models.watchlist import Watchlist
+
+    path = str(tmp_path / 'states.db')
+    states = catalogue(12)  # COMP 10000-10002, four sections each
+    states['30000'] = Course.create('math', '20000', 'Calculus', '30000', 'Full', 'TBA', 'Online', '')
+    store = StateStore(path)
+    store.save(dict(states))
+    store.close()
+
+    store = StateStore(path)
+    assert store.prune(Watchlist(['20000', 'comp 10002', 'MATH'])) == 7
+    assert store.saved_states is None
+    assert sorted(store.load_all()) == ['20000', '20008', '20009', '20010', '20011', '30000']
+    assert store.prune(Watchlist(['20000'])) == 5
+    assert sorted(store.saved_states) == ['20000']
+    assert store.prune(Watchlist()) == 0
+    store.close()
+
+
+@pytest.mark.benchmark(group='state-write-per-poll-10k')
+def test_benchmark_sqlite_write_per_poll(benchmark, store):
+    rng = random.Random(0)
+    states = catalogue()
+    store.save(states)
+
+    def next_poll():
+        nonlocal states
+        states = flip(states, rng)
+        return (states,), {}
+
+    written = benchmark.pedantic(store.save, setup=next_poll, rounds=50, iterations=1)
+    assert written == CHANGES_PER_POLL
+
+
+@pytest.mark.benchmark(group='state-write-per-poll-10k')
+def test_benchmark_json_rewrite_per_poll(benchmark, tmp_path):
+    """The previous backend: rewrite the whole indented course_states.json every poll."""
+    rng = random.Random(0)
+    states = catalogue()
+    path = tmp_path / 'course_states.json'
+
+    def next_poll():
+        nonlocal states
+        states = flip(states, rng)
+        return ({crn: course._asdict() for crn, course in states.items()},), {}
+
+    def rewrite(data):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    benchmark.pedantic(rewrite, setup=next_poll, rounds=20, iterations=1)
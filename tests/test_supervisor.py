@@ -0,0 +1,65 @@
+"""The supervisor's watchdog must not kill Chrome while an expired session logs in again (user-019)."""
+import time
+from types import SimpleNamespace
+from src.models.watchlist import Watchlist
+from src.monitor import RegistrationMonitor
+from src.parsing.fixtures import build_registration_page
+from src.replay import ReplayPoller
+from src.supervisor import MonitorSupervisor
+from src.utils.http_utils import SessionExpired
+from src.utils.recovery_utils import Watchdog
+
+HANG_TIMEOUT = 0.2
+LOGIN_SECONDS = 0.6  # Three watchdog timeouts spent waiting on the 2FA prompt
+
+
+class ExpiredPoller(ReplayPoller):
+    def fetch(self):
+        raise SessionExpired("login page returned")
+
+
+def test_watchdog_paused_block_does_not_fire():
+    fired = []
+    watchdog = Watchdog(HANG_TIMEOUT, lambda: fired.append(True), check_every=0.02)
+    try:
+        watchdog.start()
+        with watchdog.paused():
+            time.sleep(LOGIN_SECONDS)
+        assert not fired and watchdog.busy_for() < HANG_TIMEOUT
+        time.sleep(LOGIN_SECONDS)
+        assert fired
+    finally:
+        watchdog.stop()
+
+
+def test_session_recovery_login_is_not_a_hang(tmp_path):
+    quiet = SimpleNamespace(send_message=lambda message: None, alert_changes=lambda changes: None)
+    page = build_registration_page(10)
+
+    def make_monitor():
+        monitor = RegistrationMonitor(
+            json_file=None, state_db=str(tmp_path / 'states.db'), session_file=str(tmp_path / 'session.json'),
+            notifier=quiet, watchlist=Watchlist(), poller=ExpiredPoller([])
+        )
+
+        # Stand-ins for Chrome and the user typing a 2FA code
+        def start_http_polling():
+            monitor.poller = ReplayPoller([(page, set())])
+
+        monitor.start_browser = lambda: setattr(monitor, 'driver', SimpleNamespace(quit=lambda: None))
+        monitor.start_login_process = lambda: time.sleep(LOGIN_SECONDS) or True
+        monitor.navigate_to_registration = lambda: True
+        monitor.start_http_polling = start_http_polling
+        return monitor
+
+    supervisor = MonitorSupervisor(make_monitor, quiet, interval=1, hang_timeout=HANG_TIMEOUT)
+    supervisor.watchdog.stop()
+    supervisor.watchdog = Watchdog(HANG_TIMEOUT, supervisor.on_hang, check_every=0.02)
+    try:
+        supervisor.ensure_ready()
+        assert supervisor.poll() == 1
+        assert not supervisor.watchdog.fired
+        assert supervisor.monitor.navigation_counts['login'] == 1
+        assert len(supervisor.monitor.previous_states) == 10
+    finally:
+        supervisor.close()
@@ -0,0 +1,92 @@
+"""Outbox delivery against a local fake Bot API: failed chunks must not resend delivered ones (user-013)."""
+import pytest
+from fakes import FakeTelegramAPI
+from src.utils.alert_utils import AlertGate
+from src.utils.telegram_utils import TELEGRAM_MAX_LENGTH, TelegramNotifier, split_message
+
+
+@pytest.fixture
+def api():
+    api = FakeTelegramAPI()
+    yield api
+    api.close()
+
+
+def make_notifier(api, tmp_path):
+    return TelegramNotifier(
+        token='TOKEN', chat_id='42', outbox_file=str(tmp_path / 'outbox.db'), rate=100, burst=100,
+        coalesce_window=0, api_url=api.url, timeout=5, gate=AlertGate(), retry_delay=0
+    )
+
+
+def long_message(parts=3):
+    # Each block fills most of a Telegram message, so the message needs `parts` sends
+    return "\n\n".join(f"part {i} " + "x" * (TELEGRAM_MAX_LENGTH - 100) for i in range(parts))
+
+
+def test_failed_chunk_does_not_resend_delivered_chunks(api, tmp_path):
+    message = long_message()
+    chunks = split_message(message)
+    assert len(chunks) == 3
+    # The middle chunk exhausts every attempt of its first delivery, then goes through on retry
+    api.fail('part 1 ', 5)
+
+    notifier = make_notifier(api, tmp_path)
+    try:
+        notifier.send_message(message)
+        assert notifier.flush(timeout=20)
+        assert sorted(api.delivered) == sorted(chunks)
+        assert notifier.outbox.pending('42') == []
+    finally:
+        notifier.close(timeout=1)
+
+
+def test_undelivered_chunk_stays_in_outbox(api, tmp_path):
+    api.fail('part 2 ', 10 ** 6)
+    notifier = make_notifier(api, tmp_path)
+    try:
+        notifier.send_message(long_message())
+        notifier.flush(timeout=2)
+        assert [text[:7] for text in api.delivered] == ['part 0 ', 'part 1 ']
+        assert [text[:7] for _, text in notifier.outbox.pending('42')] == ['part 2 ']
+    finally:
+        api.failures.clear()
+        notifier.close(timeout=5)
+
+
+def test_async_notifier_retries_a_rate_limited_alert(api, tmp_path):
+    import asyncio
+    from src.models.change import ChangeEvent
+    from src.models.course import Course
+    from src.utils.telegram_utils import AsyncTelegramNotifier
+
+    course = Course.create('COMP', '10279', 'Databases', '20001', 'Available', 'J. Smith', 'Fennell Campus', '')
+    # The opening alert is rate limited once, then accepted after retry_after
+    api.fail('🚨', 1, retry_after=1)
+    notifier = AsyncTelegramNotifier(notifier=make_notifier(api, tmp_path))
+
+    async def alert():
+        await notifier.alert_changes([ChangeEvent('status', course, 'Full', 'Available')])
+        await notifier.close(timeout=10)
+
+    try:
+        asyncio.run(alert())
+        assert len(api.delivered) == 1 and 'CRN: 20001' in api.delivered[0]
+        assert notifier.notifier.request_count == 2
+        assert notifier.notifier.outbox.pending('42') == []
+    finally:
+        notifier.notifier.close(timeout=1)
+
+
+def test_terminal_bell_is_opt_in(monkeypatch, capsys):
+    from src.models.change import ChangeEvent
+    from src.models.course import Course
+
+    course = Course.create('COMP', '10279', 'Databases', '20001', 'Available', 'J. Smith', 'Fennell Campus', '')
+    changes = [ChangeEvent('status', course, 'Full', 'Available')]
+    monkeypatch.delenv('ALERT_BELL', raising=False)
+    assert TelegramNotifier.format_changes(changes).startswith('🚨')
+    assert capsys.readouterr().out == ''
+    monkeypatch.setenv('ALERT_BELL', '1')
+    TelegramNotifier.format_changes(changes)
+    assert capsys.readouterr().out == '\a'